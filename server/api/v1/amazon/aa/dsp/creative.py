@@ -27,6 +27,7 @@ from server.dependencies import (
     read,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -39,6 +40,7 @@ from server.utilities.list_utility import partition_list
 
 klass = AAUtility().creative_interface_klass()
 interface = Interface(dsp_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.CREATIVES_PREFIX,
@@ -76,7 +78,8 @@ async def index(
     )
 
     creatives = await interface.index(
-        advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
         request=request,
         response=response,
     )
@@ -88,7 +91,8 @@ async def index(
     partitions = partition_list(creative_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.dsp_model(
+        es_data = await executor_manager.es(
+            source.dsp_model,
             Constants.DSP,
             Constants.CREATIVE,
             partition,
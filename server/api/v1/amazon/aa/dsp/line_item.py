@@ -27,6 +27,7 @@ from server.dependencies import (
     read,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -42,6 +43,7 @@ from server.utilities.list_utility import partition_list
 
 klass = AAUtility().line_item_interface_klass()
 interface = Interface(dsp_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.LINE_ITEMS_PREFIX,
@@ -80,7 +82,8 @@ async def index(
     )
 
     line_items = await interface.index(
-        advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
         request=request,
         response=response,
     )
@@ -92,7 +95,8 @@ async def index(
     partitions = partition_list(line_item_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.dsp_model(
+        es_data = await executor_manager.es(
+            source.dsp_model,
             Constants.DSP,
             'line_item',
             partition,
@@ -220,30 +224,18 @@ async def update(
         request=request,
     )
 
-    line_items = []
     line_item_ids = [line_item.get('lineItemId') for line_item in response]
 
-    request = Request(
-        scope={
-            'headers': [],
-            'method': 'GET',
-            'scheme': 'http',
-            'server': ('getvisibly.com', 443,),
-            'path': '/api/v1/amazon/aa/dsp/line_items',
-            'query_string': b'',
-            'type': 'http',
-        }
+    # Listing the updated line items updates their cache with one request
+    # per batch of line items
+    line_items = await interface.refresh(
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        id_filter='lineItemIdFilter',
+        ids=line_item_ids,
+        paths=['/api/v1/amazon/aa/dsp/line_items'],
+        count=Constants.REFRESH_BATCH_SIZE,
     )
-
-    for line_item_id in line_item_ids:
-        # GETting the line item without a Response object will update
-        # the object's cache
-        line_item = await interface.show(
-            advertiser_id=brand.amazon.aa.dsp.advertiser_id,
-            key=line_item_id,
-            request=request,
-        )
-        line_items.append(line_item)
     
     log.info(
         f'Updated DSP line items',
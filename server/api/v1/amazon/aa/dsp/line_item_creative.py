@@ -78,7 +78,8 @@ async def index(
     )
 
     response = await interface.index(
-        advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
         request=request,
         response=response,
     )
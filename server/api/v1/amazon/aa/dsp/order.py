@@ -31,6 +31,7 @@ from server.dependencies import (
     read,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -46,6 +47,7 @@ from server.utilities.list_utility import partition_list
 
 klass = AAUtility().order_interface_klass()
 interface = Interface(dsp_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.ORDERS_PREFIX,
@@ -85,7 +87,8 @@ async def index(
     )
 
     orders = await interface.index(
-        advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
         request=request,
         response=response,
     )
@@ -97,7 +100,8 @@ async def index(
     partitions = partition_list(order_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.dsp_model(
+        es_data = await executor_manager.es(
+            source.dsp_model,
             Constants.DSP,
             Constants.ORDER,
             partition,
@@ -240,7 +244,7 @@ async def update(
 
     log.info(response)
 
-    orders, order_ids = [], []
+    order_ids = []
     try:
         order_ids = [order.get('orderId') for order in response]
     except AttributeError as e:
@@ -250,28 +254,16 @@ async def update(
             detail=str(response),
         )
 
-    request = Request(
-        scope={
-            'headers': [],
-            'method': 'GET',
-            'scheme': 'http',
-            'server': ('getvisibly.com', 443,),
-            'path': '/api/v1/amazon/aa/dsp/orders',
-            'query_string': b'',
-            'type': 'http',
-        }
+    # Listing the updated orders updates their cache with one request
+    # per batch of orders
+    orders = await interface.refresh(
+        advertiser_id=brand.amazon.aa.dsp.entity_id,
+        dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
+        id_filter='orderIdFilter',
+        ids=order_ids,
+        paths=['/api/v1/amazon/aa/dsp/orders'],
+        count=Constants.REFRESH_BATCH_SIZE,
     )
-
-    for order_id in order_ids:
-        # GETting the order without a Response object will update
-        # the object's cache
-        order = await interface.show(
-            advertiser_id=brand.amazon.aa.dsp.entity_id,
-            dsp_advertiser_id=brand.amazon.aa.dsp.advertiser_id,
-            key=order_id,
-            request=request,
-        )
-        orders.append(order)
     
     log.info(
         f'Updated DSP orders',
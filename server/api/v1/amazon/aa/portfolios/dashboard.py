@@ -23,6 +23,7 @@ from server.dependencies import (
     sb_client,
     sp_client,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.resources.types.data_types import (
     IntervalType,
     ObjectiveType,
@@ -46,6 +47,7 @@ sp_klass = aa_utility.campaign_interface_klass(
 )
 sp_interface = Interface(sp_client, sp_klass)
 aws_service = AWSService()
+executor_manager = ExecutorManager()
 log = aws_service.log_service
 router = APIRouter(
     prefix=f'{Constants.PORTFOLIOS_PREFIX}{Constants.GRAPHS_PREFIX}',
@@ -107,7 +109,8 @@ async def index(
         campaign_ids.extend(sb_campaign_ids)
         campaign_ids.extend(sp_campaign_ids)
         
-    response = source.portfolios_dashboard(
+    response = await executor_manager.es(
+        source.portfolios_dashboard,
         from_date,
         to_date,
         campaign_ids,
@@ -4,6 +4,7 @@ from typing import (
     List,
 )
 
+import asyncio
 import json
 import re
 
@@ -15,20 +16,20 @@ from fastapi import (
 from fastapi.params import (
     Depends,
 )
-
-import pymongo
+from motor.motor_asyncio import AsyncIOMotorClient
 
 from server.core.constants import Constants
 from server.delegates.aa_delegate import AADelegate
 from server.dependencies import (
+    async_docdb,
     advertising_data,
     brand,
-    docdb,
     Interface,
     read,
     portfolios_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.models.daypart import Daypart
 from server.resources.schema.amazon_api import (
@@ -48,6 +49,7 @@ from server.utilities.list_utility import partition_list
 klass = AAUtility().portfolio_interface_klass()
 interface = Interface(portfolios_client, klass)
 aws_service = AWSService()
+executor_manager = ExecutorManager()
 log = aws_service.log_service
 router = APIRouter(
     prefix=Constants.PORTFOLIOS_PREFIX,
@@ -69,8 +71,8 @@ async def index(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     interface: Interface = Depends(
         interface,
@@ -130,10 +132,10 @@ async def index(
             ]
 
         
-        campaigns = database[brand.amazon.aa.sa.advertiser_id].find(
+        campaigns = await database[brand.amazon.aa.sa.advertiser_id].find(
             query,
             { 'campaignId': 1, '_id': 0 },
-        )
+        ).to_list(None)
         
         campaign_ids = [int(campaign.get('campaignId')) for campaign in campaigns]
         
@@ -141,7 +143,8 @@ async def index(
         partitions = partition_list(campaign_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
         for partition in partitions:
-            es_data = source.sa_model(
+            es_data = await executor_manager.es(
+                source.sa_model,
                 None,
                 Constants.PORTFOLIO,
                 partition,
@@ -196,8 +199,8 @@ async def index(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     interface: Interface = Depends(
         interface,
@@ -358,17 +361,11 @@ async def index(
                 '$in': stateFilter.split(Constants.COMMA),
             }
 
-        sb_campaigns = list(database[brand.amazon.aa.sa.advertiser_id].find(
-            sb_query,
-        ))
-        
-        sd_campaigns = list(database[brand.amazon.aa.sa.advertiser_id].find(
-            sd_query,
-        ))
-        
-        sp_campaigns = list(database[brand.amazon.aa.sa.advertiser_id].find(
-            sp_query,
-        ))
+        sb_campaigns, sd_campaigns, sp_campaigns = await asyncio.gather(
+            database[brand.amazon.aa.sa.advertiser_id].find(sb_query).to_list(None),
+            database[brand.amazon.aa.sa.advertiser_id].find(sd_query).to_list(None),
+            database[brand.amazon.aa.sa.advertiser_id].find(sp_query).to_list(None),
+        )
         
         sb_campaign_ids = [int(campaign.get('campaignId')) for campaign in sb_campaigns]
         sb_total = len(sb_campaign_ids)
@@ -384,7 +381,8 @@ async def index(
         )
 
         for partition in partitions:
-            es_data = source.sa_model(
+            es_data = await executor_manager.es(
+                source.sa_model,
                 None,
                 Constants.CAMPAIGN,
                 partition,
@@ -511,35 +509,20 @@ async def update(
         request=Request,
     )
 
-    portfolios = []
     portfolio_ids = [portfolio.get('portfolioId') for portfolio in response]
 
-    for path in [
-        '/api/v1/amazon/aa/portfolios',
-        '/api/v1/amazon/aa/portfolios/list',
-        '/api/v1/amazon/aa/portfolios/graphs/index',
-    ]:
-        request = Request(
-            scope={
-                'headers': [],
-                'method': 'GET',
-                'scheme': 'http',
-                'server': ('getvisibly.com', 443,),
-                'path': path,
-                'query_string': b'',
-                'type': 'http',
-            }
-        )
-
-        for portfolio_id in portfolio_ids:
-            # GETting the campaign without a Response object will update
-            # the object's cache
-            portfolio = await interface.show(
-                advertiser_id=brand.amazon.aa.sa.advertiser_id,
-                key=portfolio_id,
-                request=request,
-            )
-            portfolios.append(portfolio)
+    # Listing the updated portfolios once updates their cache for every
+    # path that caches them
+    portfolios = await interface.refresh(
+        advertiser_id=brand.amazon.aa.sa.advertiser_id,
+        id_filter='portfolioIdFilter',
+        ids=portfolio_ids,
+        paths=[
+            '/api/v1/amazon/aa/portfolios',
+            '/api/v1/amazon/aa/portfolios/list',
+            '/api/v1/amazon/aa/portfolios/graphs/index',
+        ],
+    )
 
     log.info(
         f'Updated portfolios',
@@ -25,6 +25,7 @@ from server.dependencies import (
     sb_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -40,6 +41,7 @@ klass = AAUtility().ad_group_interface_klass(
     Constants.SPONSORED_BRANDS,
 )
 interface = Interface(sb_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.AD_GROUPS_PREFIX,
@@ -89,7 +91,8 @@ async def index(
     partitions = partition_list(ad_group_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_BRANDS,
             'ad_group',
             partition,
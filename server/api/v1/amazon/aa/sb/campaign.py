@@ -14,12 +14,14 @@ from fastapi.params import (
     Depends,
 )
 from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorClient
 
 import pymongo
 
 from server.core.constants import Constants
 from server.delegates.aa_delegate import AADelegate
 from server.dependencies import (
+    async_docdb,
     advertising_data,
     brand,
     docdb,
@@ -28,8 +30,9 @@ from server.dependencies import (
     sb_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
-from server.resources.models.daypart import Daypart
+from server.resources.models.aio.daypart import Daypart
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
     UpdateSBCampaignSchema,
@@ -57,6 +60,7 @@ klass = aa_utility.campaign_interface_klass(
 )
 interface = Interface(sb_client, klass)
 aws_service = AWSService()
+executor_manager = ExecutorManager()
 log = aws_service.log_service
 router = APIRouter(
     prefix=Constants.CAMPAIGNS_PREFIX,
@@ -87,8 +91,8 @@ async def index(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     interface: Interface = Depends(
         interface,
@@ -114,7 +118,8 @@ async def index(
     partitions = partition_list(campaign_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_BRANDS,
             Constants.CAMPAIGN,
             partition,
@@ -123,7 +128,7 @@ async def index(
         )
         data.update(es_data)
 
-    dayparts = Daypart.find_all(
+    dayparts = await Daypart.find_all(
         AdType.SB,
         brand.amazon.aa.sa.advertiser_id,
         campaign_ids,
@@ -259,30 +264,16 @@ async def update(
         request=request,
     )
 
-    campaigns = []
     campaign_ids = [campaign.get('campaignId') for campaign in response]
 
-    request = Request(
-        scope={
-            'headers': [],
-            'method': 'GET',
-            'scheme': 'http',
-            'server': ('getvisibly.com', 443,),
-            'path': '/api/v1/amazon/aa/sb/campaigns',
-            'query_string': b'',
-            'type': 'http',
-        }
+    # Listing the updated campaigns updates their cache with one request
+    # per batch of campaigns
+    campaigns = await interface.refresh(
+        advertiser_id=brand.amazon.aa.sa.advertiser_id,
+        id_filter='campaignIdFilter',
+        ids=campaign_ids,
+        paths=['/api/v1/amazon/aa/sb/campaigns'],
     )
-
-    for campaign_id in campaign_ids:
-        # GETting the campaign without a Response object will update
-        # the object's cache
-        campaign = await interface.show(
-            advertiser_id=brand.amazon.aa.sa.advertiser_id,
-            key=campaign_id,
-            request=request,
-        )
-        campaigns.append(campaign)
     
     log.info(
         f'Updated SB campaigns',
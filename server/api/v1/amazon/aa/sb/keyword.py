@@ -27,6 +27,7 @@ from server.dependencies import (
     sb_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -46,6 +47,7 @@ klass = AAUtility().keyword_interface_klass(
     Constants.SPONSORED_BRANDS,
 )
 interface = Interface(sb_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.KEYWORDS_PREFIX,
@@ -98,7 +100,8 @@ async def index(
     partitions = partition_list(keyword_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_BRANDS,
             Constants.KEYWORD,
             partition,
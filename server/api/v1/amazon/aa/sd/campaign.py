@@ -14,25 +14,25 @@ from fastapi import (
 from fastapi.params import (
     Depends,
 )
+from motor.motor_asyncio import AsyncIOMotorClient
 from starlette.status import (
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
-import pymongo
-
 from server.core.constants import Constants
 from server.delegates.aa_delegate import AADelegate
 from server.dependencies import (
+    async_docdb,
     advertising_data,
     brand,
     Interface,
     read,
     sd_client,
-    docdb,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
-from server.resources.models.daypart import Daypart
+from server.resources.models.aio.daypart import Daypart
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
     UpdateSDCampaignSchema,
@@ -53,6 +53,7 @@ klass = AAUtility().campaign_interface_klass(
     Constants.SPONSORED_DISPLAY,
 )
 interface = Interface(sd_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.CAMPAIGNS_PREFIX,
@@ -80,8 +81,8 @@ async def index(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     interface: Interface = Depends(
         interface,
@@ -107,7 +108,8 @@ async def index(
     partitions = partition_list(campaign_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_DISPLAY,
             Constants.CAMPAIGN,
             partition,
@@ -116,7 +118,7 @@ async def index(
         )
         data.update(es_data)
 
-    dayparts = Daypart.find_all(
+    dayparts = await Daypart.find_all(
         AdType.SD,
         brand.amazon.aa.sa.advertiser_id,
         campaign_ids,
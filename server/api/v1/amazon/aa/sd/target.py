@@ -27,6 +27,7 @@ from server.dependencies import (
     sd_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -42,6 +43,7 @@ klass = AAUtility().target_interface_klass(
     Constants.SPONSORED_DISPLAY,
 )
 interface = Interface(sd_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.TARGETS_PREFIX,
@@ -90,7 +92,8 @@ async def index(
     partitions = partition_list(target_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_DISPLAY,
             Constants.TARGET,
             partition,
@@ -14,25 +14,25 @@ from fastapi import (
 from fastapi.params import (
     Depends,
 )
+from motor.motor_asyncio import AsyncIOMotorClient
 from starlette.status import (
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
-import pymongo
-
 from server.core.constants import Constants
 from server.delegates.aa_delegate import AADelegate
 from server.dependencies import (
+    async_docdb,
     advertising_data,
     brand,
-    docdb,
     Interface,
     read,
     sp_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
-from server.resources.models.daypart import Daypart
+from server.resources.models.aio.daypart import Daypart
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
     UpdateSPCampaignSchema,
@@ -59,6 +59,7 @@ klass = aa_utility.campaign_interface_klass(
     Constants.SPONSORED_PRODUCTS,
 )
 interface = Interface(sp_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.CAMPAIGNS_PREFIX,
@@ -89,8 +90,8 @@ async def index(
     interface: Interface = Depends(
         interface,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     source: DataService = Depends(
         advertising_data,
@@ -113,7 +114,8 @@ async def index(
     partitions = partition_list(campaign_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_PRODUCTS,
             Constants.CAMPAIGN,
             partition,
@@ -122,7 +124,7 @@ async def index(
         )
         data.update(es_data)
 
-    dayparts = Daypart.find_all(
+    dayparts = await Daypart.find_all(
         AdType.SP,
         brand.amazon.aa.sa.advertiser_id,
         campaign_ids,
@@ -255,7 +257,7 @@ async def update(
         request=request,
     )
 
-    campaigns, campaign_ids = [], []
+    campaign_ids = []
     try:
         campaign_ids = [campaign.get('campaignId') for campaign in response]
     except AttributeError as e:
@@ -265,28 +267,15 @@ async def update(
             detail=str(response),
         )
 
-    request = Request(
-        scope={
-            'headers': [],
-            'method': 'GET',
-            'scheme': 'http',
-            'server': ('getvisibly.com', 443,),
-            'path': '/api/v1/amazon/aa/sp/campaigns',
-            'query_string': b'',
-            'type': 'http',
-        }
+    # Listing the updated campaigns updates their cache with one request
+    # per batch of campaigns
+    campaigns = await interface.refresh(
+        advertiser_id=brand.amazon.aa.sa.advertiser_id,
+        id_filter='campaignIdFilter',
+        ids=campaign_ids,
+        paths=['/api/v1/amazon/aa/sp/campaigns'],
     )
 
-    for campaign_id in campaign_ids:
-        # GETting the campaign without a Response object will update
-        # the object's cache
-        campaign = await interface.show(
-            advertiser_id=brand.amazon.aa.sa.advertiser_id,
-            key=campaign_id,
-            request=request,
-        )
-        campaigns.append(campaign)
-
     log.info(
         f'Updated SP campaigns',
     )
@@ -23,6 +23,7 @@ from server.dependencies import (
     sp_client,
     write,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.middleware.aa_middleware import AAMiddleware
 from server.resources.schema.amazon_api import (
     APIIndexSchema,
@@ -38,6 +39,7 @@ klass = AAUtility().product_ad_interface_klass(
     Constants.SPONSORED_PRODUCTS,
 )
 interface = Interface(sp_client, klass)
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 router = APIRouter(
     prefix=Constants.PRODUCT_ADS_PREFIX,
@@ -88,7 +90,8 @@ async def index(
     partitions = partition_list(product_ad_ids, Constants.ES_FILTER_ARRAY_LIMIT)
 
     for partition in partitions:
-        es_data = source.sa_model(
+        es_data = await executor_manager.es(
+            source.sa_model,
             Constants.SPONSORED_PRODUCTS,
             Constants.PRODUCT_AD,
             partition,
@@ -4,16 +4,16 @@ import re
 
 from fastapi import APIRouter
 from fastapi.params import Depends
-
-import pymongo
+from motor.motor_asyncio import AsyncIOMotorClient
 
 from server.core.constants import Constants
 from server.dependencies import (
+    async_docdb,
     brand,
-    docdb,
     read,
     retail_data,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.resources.types.data_types import (
     BrandAnalyticsDistributorType,
     BrandAnalyticsReportType,
@@ -28,6 +28,7 @@ from server.utilities.brand_utility import (
 )
 
 
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 
 
@@ -52,8 +53,8 @@ async def index(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     source: DataService = Depends(
         retail_data,
@@ -69,18 +70,17 @@ async def index(
 
     ba_path_pattern = re.compile('ba')
 
-    with client.start_session() as session:
-        collection = client.amazon[vendor_id]
-        asin_metadata = collection.find(
-            { '_path': ba_path_pattern },
-            {
-                '_id': 0,
-                'asin': 1,
-                'attributes.item_name.value' : 1,
-                'attributes.product_category.value': 1,
-                'attributes.brand.value': 1,
-            },
-        )
+    collection = client.amazon[vendor_id]
+    asin_metadata = await collection.find(
+        { '_path': ba_path_pattern },
+        {
+            '_id': 0,
+            'asin': 1,
+            'attributes.item_name.value' : 1,
+            'attributes.product_category.value': 1,
+            'attributes.brand.value': 1,
+        },
+    ).to_list(None)
 
     asins = {}
     for asin_metadatum in asin_metadata:
@@ -110,7 +110,8 @@ async def index(
             log.exception(e)
             asins[asin] = {}
 
-    data = source.brand_analytics(
+    data = await executor_manager.es(
+        source.brand_analytics,
         asins,
         distributor_view,
         report_type,
@@ -144,8 +145,8 @@ async def index_table(
     brand: Any = Depends(
         brand,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     source: DataService = Depends(
         retail_data,
@@ -161,18 +162,17 @@ async def index_table(
 
     ba_path_pattern = re.compile('ba')
 
-    with client.start_session() as session:
-        collection = client.amazon[vendor_id]
-        asin_metadata = collection.find(
-            { '_path': ba_path_pattern },
-            {
-                '_id': 0,
-                'asin': 1,
-                'attributes.item_name.value' : 1,
-                'attributes.product_category.value': 1,
-                'attributes.brand.value': 1,
-            },
-        )
+    collection = client.amazon[vendor_id]
+    asin_metadata = await collection.find(
+        { '_path': ba_path_pattern },
+        {
+            '_id': 0,
+            'asin': 1,
+            'attributes.item_name.value' : 1,
+            'attributes.product_category.value': 1,
+            'attributes.brand.value': 1,
+        },
+    ).to_list(None)
 
     asins = {}
     for asin_metadatum in asin_metadata:
@@ -202,7 +202,8 @@ async def index_table(
             log.exception(e)
             asins[asin] = {}
 
-    data = source.brand_analytics_statistics(
+    data = await executor_manager.es(
+        source.brand_analytics_statistics,
         asins,
         distributor_view,
         report_type,
@@ -1,24 +1,37 @@
-from fastapi import APIRouter
+import itertools
+
+from fastapi import (
+    APIRouter,
+    Request,
+)
 from fastapi.params import Depends
+from starlette.concurrency import iterate_in_threadpool
+from starlette.responses import StreamingResponse
 
 from server.core.constants import Constants
 from server.dependencies import (
     read,
     retail_data,
 )
+from server.managers.executor_manager import ExecutorManager
 from server.resources.schema.amazon_api import (
     IndexSearchTermsRankingSchema,
+    IndexSearchTermsResponseSchema,
     IndexSearchTermsSchema,
 )
 from server.resources.types.data_types import (
     BrandAnalyticsDistributorType,
     BrandAnalyticsIntervalType,
+    ExportFormatType,
     IntervalType,
 )
 from server.services.aws_service import AWSService
 from server.services.data_service import DataService
+from server.utilities.export_utility import ExportUtility
 
 
+export_utility = ExportUtility()
+executor_manager = ExecutorManager()
 log = AWSService().log_service
 
 
@@ -42,7 +55,7 @@ async def index_periods(
         f'Indexing search terms periods...',
     )
 
-    data = source.search_term_periods()
+    data = await executor_manager.es(source.search_term_periods)
 
     log.info(
         f'Indexed search terms periods',
@@ -68,7 +81,8 @@ async def index_search_terms_filter(
         f'Indexing search terms filter...',
     )
 
-    data = source.search_terms_filter(
+    data = await executor_manager.es(
+        source.search_terms_filter,
         q,
         limit,
     )
@@ -96,7 +110,7 @@ async def index_search_terms(
         f'Indexing search terms...',
     )
     
-    data = source.search_terms(data)
+    data = await executor_manager.es(source.search_terms, data)
 
     log.info(
         f'Indexed search terms',
@@ -121,10 +135,74 @@ async def index_search_terms_rank(
         f'Indexing search terms rank...',
     )
 
-    data = source.search_terms_rank(data)
+    data = await executor_manager.es(source.search_terms_rank, data)
 
     log.info(
         f'Indexed search terms rank',
     )
 
     return data
+
+
+@router.post(
+    Constants.SEARCH_TERMS_EXPORT_PREFIX,
+    dependencies=[
+        Depends(read),
+    ],
+)
+async def export_search_terms(
+    request: Request,
+    data: IndexSearchTermsSchema,
+    format: ExportFormatType = ExportFormatType.NDJSON,
+    source: DataService = Depends(
+        retail_data,
+    ),
+):
+    log.info(
+        f'Exporting search terms as {format.value}...',
+    )
+
+    # The scroll is opened and its first page read before the response
+    # starts, so that errors are returned as such, rather than as a
+    # successful, truncated export
+    search_terms = source.search_terms_stream(data)
+    first_search_term = await executor_manager.es(next, search_terms, None)
+
+    # Rows are serialized as they are read from Elasticsearch
+    rows = (
+        search_term.dict(by_alias=True)
+        for search_term in itertools.chain([first_search_term] if first_search_term else [], search_terms)
+    )
+
+    if format == ExportFormatType.CSV:
+        fields = [
+            field.alias for field in IndexSearchTermsResponseSchema.__fields__.values()
+        ]
+        content = export_utility.to_csv(rows, fields)
+        media_type = Constants.TEXT_CSV
+    else:
+        content = export_utility.to_ndjson(rows)
+        media_type = Constants.APPLICATION_NDJSON
+
+    filename = f'search_terms_{data.report_range}.{format.value}'
+
+    return StreamingResponse(
+        _stream(request, content, search_terms),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+        },
+    )
+
+
+async def _stream(request, content, search_terms):
+    # Reading stops, and the scroll is cleared, as soon as the client
+    # disconnects, rather than once every search term has been read
+    try:
+        async for chunk in iterate_in_threadpool(content):
+            if await request.is_disconnected():
+                break
+
+            yield chunk
+    finally:
+        await executor_manager.es(search_terms.close)
@@ -11,6 +11,7 @@ from fastapi import (
 from fastapi.params import (
     Depends,
 )
+from motor.motor_asyncio import AsyncIOMotorClient
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_401_UNAUTHORIZED
 
@@ -18,13 +19,14 @@ import pymongo
 
 from server.core.constants import Constants
 from server.dependencies import (
+    async_docdb,
     auth_service,
     docdb,
     read,
     ssm_service,
     user,
 )
-from server.resources.models.brand import Brand
+from server.resources.models.aio.brand import Brand
 from server.resources.schema.brand import (
     BrandIndexSchema,
     BrandShowSchema,
@@ -49,8 +51,8 @@ router = APIRouter(
     response_model_by_alias=False,
 )
 async def index(
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     user: Any = Depends(
         user,
@@ -60,7 +62,7 @@ async def index(
         'Indexing brands...',
     )
 
-    brands = Brand.with_user(user._id, client)
+    brands = await Brand.with_user(user._id, client)
     
     log.info(
         'Indexed brands',
@@ -82,8 +84,8 @@ async def show(
     authenticator: AuthService = Depends(
         auth_service,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     user: Any = Depends(
         user,
@@ -93,12 +95,7 @@ async def show(
         f'Showing brand {brand_id}...',
     )
 
-    brand = Brand.find_by_id(
-        ObjectId(brand_id),
-        client,
-    )
-
-    brand = Brand.find_by_id_and_user(
+    brand = await Brand.find_by_id_and_user(
         ObjectId(brand_id),
         user._id,
         client,
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
 from server.core.constants import Constants
+from server.managers.executor_manager import ExecutorManager
+from server.managers.rate_limit_manager import RateLimitManager
 
 
 router = APIRouter(
@@ -13,4 +15,14 @@ router = APIRouter(
 async def status():
     return {
         Constants.STATUS: Constants.ALIVE,
-    }
\ No newline at end of file
+    }
+
+
+@router.get(Constants.EXECUTORS_PREFIX)
+async def executors():
+    return ExecutorManager().metrics()
+
+
+@router.get(Constants.RATE_LIMITS_PREFIX)
+async def rate_limits():
+    return RateLimitManager().metrics()
@@ -3,6 +3,7 @@ from fastapi.params import (
     Cookie,
     Depends,
 )
+from motor.motor_asyncio import AsyncIOMotorClient
 
 from starlette.exceptions import HTTPException
 from starlette.responses import JSONResponse
@@ -11,14 +12,12 @@ from starlette.status import (
     HTTP_403_FORBIDDEN,
 )
 
-import pymongo
-
 from server.core.constants import Constants
 from server.dependencies import (
+    async_docdb,
     user,
-    docdb,
 )
-from server.resources.models.user import User
+from server.resources.models.aio.user import User
 from server.resources.schema.user import (
     UserPasswordUpdateSchema,
 )
@@ -35,8 +34,8 @@ router = APIRouter(
 async def update_password(
     user_id: str,
     data: UserPasswordUpdateSchema,
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
     user: User = Depends(
         user,
@@ -59,12 +58,11 @@ async def update_password(
             encrypted_password = auth_utility.encrypt_password(
                 data.new_password,
             )
-            with client.start_session() as session:
-                collection = client.visibly.users
-                collection.update(
-                    { '_id': user._id },
-                    { '$set': { 'password': encrypted_password } },
-                )
+            await User.update(
+                user._id,
+                { '$set': { 'password': encrypted_password } },
+                client,
+            )
             return
         except Exception as e:
             raise HTTPException(
@@ -1,20 +1,29 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
 import asyncio
 import logging
 import os
 import sys
-import time
 import traceback
 
-from amazon_api.resources.aa.client import Client
 from fastapi import Request
+from pymongo import ReplaceOne
 
 import click
 import requests
 
+from server.core import settings
 from server.core.constants import Constants
-from server.delegates.aa_delegate import AADelegate
 from server.dependencies import Interface
+from server.managers.client_manager import ClientManager
+from server.resources.models.aio.checkpoint import Checkpoint
 from server.services.aws_service import AWSService
+from server.services.pipeline_service import PipelineService
+from server.services.scheduler_service import SchedulerService
+from server.services.sync_report_service import SyncReportService
 from server.utilities.aa_utility import AAUtility
 
 
@@ -25,9 +34,7 @@ DSP_BATCH_SIZE=100
 DSP_TOTAL_RESULTS_LIMIT=100_000
 LINE_ITEM_CREATIVE_ASSOCIATION_MAX_PAGE_SIZE=20
 MAX_PAGE_SIZE=100
-RETRY_AFTER='Retry-After'
-RETRY_DELAY=10
-TOO_MANY_REQUESTS_STATUS_CODE=429
+SA_BATCH_SIZE=100
 
 
 class CacheContext:
@@ -36,6 +43,141 @@ class CacheContext:
         pass
 
 
+class SyncCursor:
+    """Progress of the sync of one entity type of an advertiser.
+
+    Fetchers save the cursor after each page they cache, so `--resume`
+    continues an interrupted sync from the next page. Pages are upserted by
+    their entities' keys, so requesting a page again is harmless.
+
+    Fetchers also mark the cursor incomplete if a listing ends on a page
+    that is not empty, i.e., at a limit or an error, because sweeping
+    would then remove entities Amazon still lists.
+
+    Args:
+        advertiser_id: Amazon profile or DSP advertiser ID
+        entity_type: Path of the entity type, e.g., 'sp/keywords'
+        data: Saved cursor, if resuming
+    """
+
+    def __init__(self, advertiser_id, entity_type, data=None):
+        data = data or {}
+
+        self.advertiser_id = advertiser_id
+        self.entity_type = entity_type
+
+        self.batch = data.get('batch', 0)
+        self.next_token = data.get('next_token')
+        self.since = data.get('since')
+        self.start_index = data.get('start_index', 0)
+        self.synced_at = data.get('synced_at', datetime.utcnow())
+
+        self.is_complete = True
+        self.scope = None
+        self._saves = []
+
+    def batches(self, items):
+        """Skips the batches of parent IDs that are already cached.
+
+        Args:
+            items: Batches, e.g., of order IDs, in a stable order
+
+        Yields:
+            Every batch from the cursor's batch on
+        """
+        for index, item in enumerate(items):
+            if index < self.batch:
+                continue
+
+            if index > self.batch:
+                self.batch = index
+                self.next_token = None
+                self.start_index = 0
+
+            yield item
+
+    async def gather(self, items, func, concurrency):
+        """Runs `func` on batches of parent IDs concurrently.
+
+        The cursor's batch is the first batch that is not cached yet, so a
+        resumed sync requests the batches that were running again.
+
+        Args:
+            items: Batches, e.g., of order IDs, in a stable order
+            func: Coroutine function of a batch's index, the batch and the
+                index of its first page
+            concurrency: Maximum number of batches requested at once
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        first_batch, first_start_index = self.batch, self.start_index
+        done = set()
+
+        async def run(index, item):
+            async with semaphore:
+                start_index = first_start_index if index == first_batch else 0
+                await func(index, item, start_index)
+
+            done.add(index)
+            if index == self.batch:
+                while self.batch in done:
+                    self.batch += 1
+
+                await self.save()
+
+        results = await asyncio.gather(
+            *[
+                run(index, item)
+                for index, item in enumerate(items)
+                if index >= first_batch
+            ],
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def save_page(self, index, start_index):
+        # Only the first batch that is not cached yet records its pages
+        if index == self.batch:
+            await self.save(start_index)
+
+    async def save(self, start_index=0, next_token=None):
+        self.next_token = next_token
+        self.start_index = start_index
+
+        cursor = self.to_dict()
+
+        # Within a pipeline the page may still be queued, so the cursor is
+        # saved once every page up to it is written
+        pipeline = PipelineService.current()
+        if pipeline:
+            self._saves.append((pipeline.seq, cursor))
+
+            cursor = None
+            while self._saves and pipeline.written(self._saves[0][0]):
+                _, cursor = self._saves.pop(0)
+
+            if cursor is None:
+                return
+
+        await Checkpoint.update_cursor(
+            self.advertiser_id,
+            self.entity_type,
+            cursor,
+            documentdb.motor_client,
+        )
+
+    def to_dict(self):
+        return {
+            'batch': self.batch,
+            'next_token': self.next_token,
+            'since': self.since,
+            'start_index': self.start_index,
+            'synced_at': self.synced_at,
+        }
+
+
 @click.group()
 @click.pass_context
 def cache(ctx):
@@ -51,12 +193,43 @@ def cache(ctx):
 @click.argument('region')
 @click.option('--entity_id', '-e', default=None, required=True)
 @click.option('--advertiser_id', '-a', default=None, required=False)
+@click.option('--concurrency', '-c', default=settings.SYNC_CONCURRENCY, type=int)
+@click.option('--profile_concurrency', '-p', default=settings.SYNC_PROFILE_CONCURRENCY, type=int)
+@click.option('--batch_concurrency', '-b', default=settings.SYNC_BATCH_CONCURRENCY, type=int)
+@click.option('--writers', '-w', default=settings.SYNC_WRITERS, type=int)
+@click.option('--full', '-f', default=False, is_flag=True)
+@click.option('--resume', '-r', default=False, is_flag=True)
+@click.option('--archive', default=False, is_flag=True)
+@click.option('--dry_run', '-d', default=False, is_flag=True)
+@click.option('--report_path', '-o', default=None, required=False)
 @click.pass_obj
-def dsp(obj, region, entity_id, advertiser_id):
+def dsp(obj, region, entity_id, advertiser_id, concurrency, profile_concurrency, batch_concurrency, writers, full, resume, archive, dry_run, report_path):
     loop = asyncio.get_event_loop()
     try:
         loop.run_until_complete(
-            _cache_dsp(region, entity_id, advertiser_id),
+            _cache_dsp(
+                region,
+                entity_id,
+                advertiser_id,
+                SchedulerService(concurrency, profile_concurrency),
+                PipelineService(writers),
+                SyncReportService(
+                    'dsp',
+                    {
+                        'region': region,
+                        'entity_id': entity_id,
+                        'advertiser_id': advertiser_id,
+                        'full': full,
+                        'resume': resume,
+                    },
+                    report_path or _report_path('dsp'),
+                ),
+                batch_concurrency,
+                full,
+                resume,
+                archive,
+                dry_run,
+            ),
         )
     finally:
         loop.close()
@@ -70,70 +243,146 @@ def dsp(obj, region, entity_id, advertiser_id):
 )
 @click.argument('region')
 @click.option('--advertiser_id', '-a', default=None, required=False)
+@click.option('--concurrency', '-c', default=settings.SYNC_CONCURRENCY, type=int)
+@click.option('--profile_concurrency', '-p', default=settings.SYNC_PROFILE_CONCURRENCY, type=int)
+@click.option('--writers', '-w', default=settings.SYNC_WRITERS, type=int)
+@click.option('--full', '-f', default=False, is_flag=True)
+@click.option('--resume', '-r', default=False, is_flag=True)
+@click.option('--archive', default=False, is_flag=True)
+@click.option('--dry_run', '-d', default=False, is_flag=True)
+@click.option('--report_path', '-o', default=None, required=False)
 @click.pass_obj
-def sa(obj, region, advertiser_id):
+def sa(obj, region, advertiser_id, concurrency, profile_concurrency, writers, full, resume, archive, dry_run, report_path):
     loop = asyncio.get_event_loop()
     try:
         loop.run_until_complete(
-            _cache_sa(region, advertiser_id),
+            _cache_sa(
+                region,
+                advertiser_id,
+                SchedulerService(concurrency, profile_concurrency),
+                PipelineService(writers),
+                SyncReportService(
+                    'sa',
+                    {
+                        'region': region,
+                        'advertiser_id': advertiser_id,
+                        'full': full,
+                        'resume': resume,
+                    },
+                    report_path or _report_path('sa'),
+                ),
+                full,
+                resume,
+                archive,
+                dry_run,
+            ),
         )
     finally:
         loop.close()
 
 
-async def _cache_dsp(region, entity_id, advertiser_id):
-    database = documentdb.client.amazon
-    start_time = time.time()
-    
+async def _cache_dsp(region, entity_id, advertiser_id, scheduler, pipeline, report, batch_concurrency, is_full=False, is_resumed=False, is_archived=False, is_dry_run=False):
     if advertiser_id == Constants.EMPTY_STRING:
         advertiser_id = None
     
     advertiser_ids = [advertiser_id]
     if advertiser_id is None:
-        advertiser_ids = await _dsp_advertiser_ids(region, entity_id)
+        advertiser_ids = await _dsp_advertiser_ids(entity_id, region)
+
+    options = {
+        'is_archived': is_archived,
+        'is_dry_run': is_dry_run,
+        'is_full': is_full,
+        'is_resumed': is_resumed,
+    }
     
     log.info(f'Caching {len(advertiser_ids)} advertiser in {entity_id}...')
     for advertiser_id in advertiser_ids:
-        log.info(f'Caching {entity_id}/{advertiser_id}...')
-        
-        log.info(f'Caching DSP orders for {entity_id}/{advertiser_id}...')
-        await _orders(entity_id, advertiser_id, region)
-        log.info(f'Cached DSP orders for {entity_id}/{advertiser_id}')
-        
-        log.info(f'Caching DSP line items for {entity_id}/{advertiser_id}...')
-        items = database[entity_id].find(
-            { '_path': '/api/v1/amazon/aa/dsp/orders' },
-            { 'orderId': 1, '_id': 0 },
+        # Every advertiser of an entity is requested with the entity's
+        # profile, so the entity bounds their concurrency
+        orders = scheduler.add(
+            f'dsp/orders/{entity_id}/{advertiser_id}',
+            _sync,
+            advertiser_id,
+            'dsp/orders',
+            _orders,
+            entity_id,
+            advertiser_id,
+            region,
+            profile=entity_id,
+            is_filtered=False,
+            sweep=(
+                entity_id,
+                '/api/v1/amazon/aa/dsp/orders',
+                { 'advertiserId': advertiser_id },
+            ),
+            **options,
         )
-        order_ids = [item.get('orderId') for item in items]
-        await _line_items(entity_id, order_ids, region)
-        log.info(f'Cached DSP line items for {entity_id}/{advertiser_id}')
-        
-        items = database[entity_id].find(
-            { '_path': '/api/v1/amazon/aa/dsp/line_items', },
-            { 'lineItemId': 1, '_id': 0 },
+        line_items = scheduler.add(
+            f'dsp/line_items/{entity_id}/{advertiser_id}',
+            _sync,
+            advertiser_id,
+            'dsp/line_items',
+            _advertiser_line_items,
+            entity_id,
+            advertiser_id,
+            region,
+            batch_concurrency,
+            profile=entity_id,
+            dependencies=[orders],
+            sweep=(
+                entity_id,
+                '/api/v1/amazon/aa/dsp/line_items',
+                { 'advertiserId': advertiser_id },
+            ),
+            **options,
+        )
+        scheduler.add(
+            f'dsp/line_item_creative_associations/{entity_id}/{advertiser_id}',
+            _sync,
+            advertiser_id,
+            'dsp/line_item_creative_associations',
+            _advertiser_line_item_creative_associations,
+            entity_id,
+            advertiser_id,
+            region,
+            batch_concurrency,
+            profile=entity_id,
+            dependencies=[line_items],
+            # Associations have no advertiser, so the fetcher scopes the
+            # sweep to the advertiser's line items
+            sweep=(
+                entity_id,
+                '/api/v1/amazon/aa/dsp/line_item_creative_associations',
+                None,
+            ),
+            **options,
+        )
+        scheduler.add(
+            f'dsp/creatives/{entity_id}/{advertiser_id}',
+            _sync,
+            advertiser_id,
+            'dsp/creatives',
+            _creatives,
+            entity_id,
+            advertiser_id,
+            region,
+            profile=entity_id,
+            is_filtered=False,
+            sweep=(
+                entity_id,
+                '/api/v1/amazon/aa/dsp/creatives',
+                { 'advertiserId': advertiser_id },
+            ),
+            **options,
         )
-        line_item_ids = [item.get('lineItemId') for item in items]
-        log.info(f'Caching DSP line item creative associations for {entity_id}/{advertiser_id}...')
-        await _line_item_creative_associations(entity_id, line_item_ids, region)
-        log.info(f'Cached DSP line item creative associations for {entity_id}/{advertiser_id}')
-        
-        log.info(f'Caching DSP creatives for {entity_id}/{advertiser_id}...')
-        await _creatives(entity_id, advertiser_id, region)
-        log.info(f'Cached DSP creatives for {entity_id}/{advertiser_id}')
-        
-        duration = time.time() - start_time
-
-        log.info(f'{round(duration/60)} minutes | Cached DSP for {entity_id}/{advertiser_id}')
-
-    duration = time.time() - start_time
 
-    log.info(f'{round(duration/60)} minutes | Cached {len(advertiser_ids)} advertisers in {entity_id}')
-    
+    # The report is opened first, so the pipeline's writers report to it
+    async with report, pipeline:
+        await scheduler.run()
     
-async def _cache_sa(region, advertiser_id):
-    start_time = time.time()
     
+async def _cache_sa(region, advertiser_id, scheduler, pipeline, report, is_full=False, is_resumed=False, is_archived=False, is_dry_run=False):
     if advertiser_id == Constants.EMPTY_STRING:
         advertiser_id = None
     
@@ -141,13 +390,6 @@ async def _cache_sa(region, advertiser_id):
     if advertiser_id is None:
         advertiser_ids = await _sa_advertiser_ids(region)
     
-    log.info(f'Caching {len(advertiser_ids)} advertiser')
-    for advertiser_id in advertiser_ids:
-        log.info(f'Caching {advertiser_id}...')
-        log.info(f'Caching portfolios for {advertiser_id}...')
-        await _portfolios(advertiser_id, 'portfolios', region)
-        log.info(f'Cached portfolios for {advertiser_id}')
-    
     apis = [
         # Constants.SPONSORED_BRANDS,
         # Constants.SPONSORED_DISPLAY,
@@ -159,41 +401,291 @@ async def _cache_sa(region, advertiser_id):
             Constants.SPONSORED_PRODUCTS,
         ]
 
+    # Between full syncs, ad groups, keywords and product ads are requested
+    # only for the campaigns that changed since the last sync, so they wait
+    # for the campaigns of their profile
+    fetchers = [
+        ('ad_groups', _ad_groups),
+        ('keywords', _keywords),
+        ('product_ads', _product_ads),
+    ]
+
+    options = {
+        'is_archived': is_archived,
+        'is_dry_run': is_dry_run,
+        'is_full': is_full,
+        'is_resumed': is_resumed,
+    }
+
     log.info(f'Caching {len(advertiser_ids)} advertiser(s)')
     for advertiser_id in advertiser_ids:
-        log.info(f'Caching {advertiser_id}...')
-        # log.info(f'Caching portfolios for {advertiser_id}...')
-        # await _portfolios(advertiser_id, 'portfolios', region)
-        # log.info(f'Cached portfolios for {advertiser_id}')
-        
+        # Portfolios are cached from three endpoints, so they are not swept
+        scheduler.add(
+            f'portfolios/{advertiser_id}',
+            _sync,
+            advertiser_id,
+            'portfolios',
+            _portfolios,
+            advertiser_id,
+            'portfolios',
+            region,
+            profile=advertiser_id,
+            is_filtered=False,
+            **options,
+        )
+
         for api in apis:
-            log.info(f'Caching {api} campaigns for {advertiser_id}...')
-            await _campaigns(advertiser_id, api, region)
-            log.info(f'Cached {api} campaigns for {advertiser_id}')
-            log.info(f'Caching {api} ad groups for {advertiser_id}...')
-            await _ad_groups(advertiser_id, api, region)
-            log.info(f'Cached {api} ad groups for {advertiser_id}')
-            log.info(f'Caching {api} keywords for {advertiser_id}...')
-            await _keywords(advertiser_id, api, region)
-            log.info(f'Cached {api} keywords for {advertiser_id}')
-            log.info(f'Caching {api} product ads for {advertiser_id}...')
-            await _product_ads(advertiser_id, api, region)
-            log.info(f'Cached {api} product ads for {advertiser_id}')
-            log.info(f'Caching {api} targets for {advertiser_id}...')
-            await _targets(advertiser_id, api, region)
-            log.info(f'Cached {api} targets for {advertiser_id}')
-
-            duration = time.time() - start_time
-
-            log.info(f'{round(duration/60)} minutes | Cached {api} for {advertiser_id}')
-        
-        duration = time.time() - start_time
+            campaigns = scheduler.add(
+                f'{api}/campaigns/{advertiser_id}',
+                _sync,
+                advertiser_id,
+                f'{api}/campaigns',
+                _campaigns,
+                advertiser_id,
+                api,
+                region,
+                profile=advertiser_id,
+                is_filtered=False,
+                sweep=(advertiser_id, f'/api/v1/amazon/aa/{api}/campaigns', {}),
+                **options,
+            )
+            # Sponsored Brands targets are not cached
+            targets_sweep = None
+            if api != Constants.SPONSORED_BRANDS:
+                targets_sweep = (advertiser_id, f'/api/v1/amazon/aa/{api}/targets', {})
+
+            scheduler.add(
+                f'{api}/targets/{advertiser_id}',
+                _sync,
+                advertiser_id,
+                f'{api}/targets',
+                _targets,
+                advertiser_id,
+                api,
+                region,
+                profile=advertiser_id,
+                is_filtered=False,
+                sweep=targets_sweep,
+                **options,
+            )
 
-        log.info(f'{round(duration/60)} minutes | Cached {advertiser_id}')
+            for name, fetcher in fetchers:
+                scheduler.add(
+                    f'{api}/{name}/{advertiser_id}',
+                    _sync,
+                    advertiser_id,
+                    f'{api}/{name}',
+                    fetcher,
+                    advertiser_id,
+                    api,
+                    region,
+                    profile=advertiser_id,
+                    dependencies=[campaigns],
+                    sweep=(advertiser_id, f'/api/v1/amazon/aa/{api}/{name}', {}),
+                    **options,
+                )
 
-    duration = time.time() - start_time
+    # The report is opened first, so the pipeline's writers report to it
+    async with report, pipeline:
+        await scheduler.run()
+
+
+async def _sync(
+    advertiser_id,
+    entity_type,
+    fetcher,
+    *args,
+    is_archived=False,
+    is_dry_run=False,
+    is_filtered=True,
+    is_full=False,
+    is_resumed=False,
+    sweep=None,
+):
+    """Syncs one entity type of an advertiser and records its checkpoint.
+
+    Amazon cannot list entities by the time they were updated, so entities
+    are either requested in full or, between full syncs, only for the
+    parent entities (e.g., campaigns or orders) that changed since the
+    last sync, which `fetcher` receives as `since`. A full sync runs once
+    `settings.SYNC_FULL_INTERVAL` seconds have passed since the last one,
+    catching entities that changed without their parent, e.g., a keyword's
+    bid changed in Amazon's console. Such entities stay stale until the next
+    full sync, i.e., for up to a day by default.
+
+    A full sync stamps every entity it lists with its generation (the time
+    it started) and then sweeps the entities of older generations, i.e.,
+    the ones Amazon no longer lists.
+
+    Args:
+        advertiser_id: Amazon profile or DSP advertiser ID
+        entity_type: Path of the entity type, e.g., 'sp/keywords'
+        fetcher: Coroutine function requesting the entities
+        args: Positional arguments of `fetcher`
+        is_archived: Whether swept entities are archived before removal
+        is_dry_run: Whether swept entities are only counted
+        is_filtered: Whether `fetcher` can request only changed entities
+        is_full: Whether the sync is full regardless of the last full sync
+        is_resumed: Whether an interrupted sync continues from its cursor
+        sweep: Collection, `_path` and query of the entities to sweep, or
+            None to keep every entity
+    """
+    SyncReportService.start(advertiser_id, entity_type)
+
+    client = documentdb.motor_client
+    checkpoint = await Checkpoint.find(advertiser_id, entity_type, client)
+
+    if is_resumed and checkpoint and checkpoint.get('cursor'):
+        # The interrupted sync's `since` and `synced_at` are kept, so the
+        # batches of parent IDs, the generation and the next checkpoint are
+        # the same
+        cursor = SyncCursor(advertiser_id, entity_type, checkpoint.cursor)
+        log.info(
+            f'Resuming {entity_type} of {advertiser_id} from batch {cursor.batch} and index {cursor.start_index}...',
+        )
+    else:
+        cursor = SyncCursor(advertiser_id, entity_type)
+        if not is_full:
+            cursor.since = _since(checkpoint, cursor.synced_at)
+
+        await cursor.save()
+
+    if cursor.since is None:
+        log.info(f'Syncing every {entity_type} of {advertiser_id}...')
+        # Only this task's context, i.e., its requests, uses the generation
+        PipelineService.set_generation(cursor.synced_at)
+        await fetcher(*args, cursor=cursor)
+    elif is_filtered:
+        log.info(f'Syncing {entity_type} of {advertiser_id} changed since {cursor.since}...')
+        await fetcher(*args, cursor=cursor, since=cursor.since)
+    else:
+        log.info(f'Syncing {entity_type} of {advertiser_id}...')
+        await fetcher(*args, cursor=cursor)
+
+    # Dependents read the entities from DocumentDB, so they must be written
+    # before the task finishes
+    pipeline = PipelineService.current()
+    if pipeline:
+        await pipeline.wait()
+
+    if cursor.since is None and sweep:
+        collection_name, path, scope = sweep
+        scope = cursor.scope if scope is None else scope
+
+        if not cursor.is_complete:
+            log.info(f'Skipped sweeping {path} of {advertiser_id} because not every page was listed')
+        elif scope is not None:
+            swept = await _sweep(
+                collection_name,
+                path,
+                scope,
+                cursor.synced_at,
+                is_archived,
+                is_dry_run,
+            )
+            SyncReportService.count('swept', swept)
+
+    await Checkpoint.update(
+        advertiser_id,
+        entity_type,
+        cursor.synced_at,
+        client,
+        is_full=cursor.since is None,
+    )
+
+
+async def _sweep(collection_name, path, scope, generation, is_archived, is_dry_run):
+    """Removes the entities of `path` that a full sync did not list.
+
+    Args:
+        collection_name: Name of the advertiser's (or DSP entity's) collection
+        path: `_path` of the entities
+        scope: Query of the entities the sync listed, e.g., of one DSP
+            advertiser
+        generation: Generation of the full sync
+        is_archived: Whether entities are copied to `amazon_archive` first
+        is_dry_run: Whether entities are only counted
+
+    Returns:
+        Number of swept entities
+    """
+    client = documentdb.motor_client
+    collection = client.amazon[collection_name]
+    query = {
+        **scope,
+        '_path': path,
+        '_sync_generation': { '$ne': generation },
+    }
+
+    if is_dry_run:
+        count = await collection.count_documents(query)
+        log.info(f'Would sweep {count} {path} of {collection_name}')
+
+        return count
+
+    if is_archived:
+        items = await collection.find(query).to_list(None)
+        if not items:
+            return 0
+
+        swept_at = datetime.utcnow()
+        for item in items:
+            item['_swept_at'] = swept_at
+
+        # Upserts by `_id` let a sweep that died before deleting run again
+        await client.amazon_archive[collection_name].bulk_write(
+            [ReplaceOne({ '_id': item['_id'] }, item, upsert=True) for item in items],
+            ordered=False,
+        )
+        result = await collection.delete_many(
+            { '_id': { '$in': [item['_id'] for item in items] } },
+        )
+    else:
+        result = await collection.delete_many(query)
+
+    log.info(f'Swept {result.deleted_count} {path} of {collection_name}')
 
-    log.info(f'{round(duration/60)} minutes | Cached {len(advertiser_ids)} advertisers')
+    return result.deleted_count
+
+
+def _report_path(command):
+    return f'sync_report_{command}_{datetime.utcnow().strftime("%Y%m%d%H%M%S")}.json'
+
+
+def _since(checkpoint, synced_at):
+    if checkpoint is None or checkpoint.get('full_synced_at') is None:
+        return None
+
+    interval = timedelta(seconds=settings.SYNC_FULL_INTERVAL)
+    if synced_at - checkpoint.full_synced_at >= interval:
+        return None
+
+    return checkpoint.synced_at
+
+
+async def _campaign_id_filters(advertiser_id, api, since):
+    # Query strings of the changed campaigns in batches, or a single empty
+    # one that requests every entity
+    if since is None:
+        return [Constants.EMPTY_STRING]
+
+    database = documentdb.motor_client.amazon
+    items = await database[advertiser_id].find(
+        {
+            '_path': f'/api/v1/amazon/aa/{api}/campaigns',
+            '_updated_at': { '$gte': since },
+        },
+        { 'campaignId': 1, '_id': 0 },
+    ).to_list(None)
+    # Sorted, so a resumed sync finds the batches in the same order. A
+    # campaign that changed after the interruption may move to a batch
+    # that was already cached, but it is requested by the next sync.
+    campaign_ids = sorted(str(item.get('campaignId')) for item in items)
+
+    return [
+        f'campaignIdFilter={Constants.COMMA.join(campaign_id_batch)}&'
+        for campaign_id_batch in batches(campaign_ids, SA_BATCH_SIZE)
+    ]
 
 
 # DSP
@@ -201,33 +693,11 @@ async def _cache_sa(region, advertiser_id):
 async def _dsp_advertiser_ids(entity_id, region):
     api = Constants.DSP
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.advertiser_interface_klass()
     interface = Interface(client, klass)
 
@@ -251,20 +721,6 @@ async def _dsp_advertiser_ids(entity_id, region):
             request=request,
         )
 
-        while response.status_code == TOO_MANY_REQUESTS_STATUS_CODE:
-            delay = response.headers.get(
-                RETRY_AFTER,
-                RETRY_DELAY,
-            )
-            log.info(
-                f'Requesting advertisers after {delay} seconds...'
-            )
-            time.sleep(int(delay))
-            response = await interface.index(
-                advertiser_id=entity_id,
-                request=request,
-            )
-
         response = response.json()
         log.info(response)
         log.info(f'Requested advertisers {start_index} - {start_index + MAX_PAGE_SIZE}')
@@ -272,41 +728,19 @@ async def _dsp_advertiser_ids(entity_id, region):
         total_results = response.get('totalResults', 0)
 
         
-async def _orders(entity_id, advertiser_id, region):
+async def _orders(entity_id, advertiser_id, region, cursor):
     api = Constants.DSP
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.order_interface_klass()
     interface = Interface(client, klass)
 
     response = {'response': [0]}
-    start_index, totalResults = 0, DSP_TOTAL_RESULTS_LIMIT
+    start_index, totalResults = cursor.start_index, DSP_TOTAL_RESULTS_LIMIT
     while start_index < totalResults and len(response.get('response', [])):
         log.info(f'Requesting orders {start_index} - {start_index + MAX_PAGE_SIZE}...')
         request = Request(
@@ -324,65 +758,32 @@ async def _orders(entity_id, advertiser_id, region):
             advertiser_id=entity_id,
             request=request,
         )
-        
-        while response.status_code == TOO_MANY_REQUESTS_STATUS_CODE:
-            delay = response.headers.get(
-                RETRY_AFTER,
-                RETRY_DELAY,
-            )
-            log.info(
-                f'Requesting orders after {delay} seconds...'
-            )
-            time.sleep(int(delay))
-            response = await interface.index(
-                advertiser_id=entity_id,
-                request=request,
-            )
 
         response = response.json()
         log.info(f'Requested orders {start_index} - {start_index + MAX_PAGE_SIZE}')
         start_index += MAX_PAGE_SIZE
+        await cursor.save(start_index)
         total_results = response.get('totalResults', 0)
 
+    if response.get('response') != []:
+        cursor.is_complete = False
 
-async def _line_items(entity_id, order_ids, region):
+
+async def _line_items(entity_id, order_ids, region, cursor, concurrency):
     api = Constants.DSP
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.line_item_interface_klass()
     interface = Interface(client, klass)
 
-    for order_id_batch in batches(order_ids, DSP_BATCH_SIZE):
-        
+    async def fetch(index, order_id_batch, start_index):
         order_id_filter = Constants.COMMA.join(order_id_batch)
         response = {'response': [0]}
-        start_index, totalResults = 0, DSP_TOTAL_RESULTS_LIMIT
+        totalResults = DSP_TOTAL_RESULTS_LIMIT
     
         while start_index < totalResults and len(response.get('response', [])):
             log.info(f'Requesting line items {start_index} - {start_index + MAX_PAGE_SIZE}...')
@@ -401,65 +802,38 @@ async def _line_items(entity_id, order_ids, region):
                 advertiser_id=entity_id,
                 request=request,
             )
-            
-            while response.status_code == TOO_MANY_REQUESTS_STATUS_CODE:
-                delay = response.headers.get(
-                    RETRY_AFTER,
-                    RETRY_DELAY,
-                )
-                log.info(
-                    f'Requesting line items after {delay} seconds...'
-                )
-                time.sleep(int(delay))
-                response = await interface.index(
-                    advertiser_id=entity_id,
-                    request=request,
-                )
 
             response = response.json()
             log.info(f'Requested line items {start_index} - {start_index + MAX_PAGE_SIZE}')
             start_index += MAX_PAGE_SIZE
+            await cursor.save_page(index, start_index)
             total_results = response.get('totalResults', 0)
 
+        if response.get('response') != []:
+            cursor.is_complete = False
 
-async def _line_item_creative_associations(entity_id, line_item_ids, region):
-    api = Constants.DSP
-    aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
+    await cursor.gather(
+        batches(order_ids, DSP_BATCH_SIZE),
+        fetch,
+        concurrency,
     )
 
-    aa_delegate = AADelegate(
+
+async def _line_item_creative_associations(entity_id, line_item_ids, region, cursor, concurrency):
+    api = Constants.DSP
+    aa_utility = AAUtility()
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.line_item_interface_klass()
     interface = Interface(client, klass)
 
-    for line_item_id_batch in batches(line_item_ids, DSP_BATCH_SIZE):
-        
+    async def fetch(index, line_item_id_batch, start_index):
         line_item_id_filter = Constants.COMMA.join(line_item_id_batch)
         response = {'response': [0]}
-        start_index, totalResults = 0, DSP_TOTAL_RESULTS_LIMIT
+        totalResults = DSP_TOTAL_RESULTS_LIMIT
 
         while start_index < totalResults and len(response.get('response', [])):
             log.info(f'Requesting line item creative assocations {start_index} - {start_index + LINE_ITEM_CREATIVE_ASSOCIATION_MAX_PAGE_SIZE}...')
@@ -478,62 +852,36 @@ async def _line_item_creative_associations(entity_id, line_item_ids, region):
                 advertiser_id=entity_id,
                 request=request,
             )
-            
-            while response.status_code == TOO_MANY_REQUESTS_STATUS_CODE:
-                delay = response.headers.get(
-                    RETRY_AFTER,
-                    RETRY_DELAY,
-                )
-                log.info(
-                    f'Requesting line item creative associations after {delay} seconds...'
-                )
-                time.sleep(int(delay))
-                response = await interface.index_creative_association(
-                    advertiser_id=entity_id,
-                    request=request,
-                )
 
             response = response.json()
             log.info(f'Requested line item creative assocations {start_index} - {start_index + LINE_ITEM_CREATIVE_ASSOCIATION_MAX_PAGE_SIZE}')
             start_index += LINE_ITEM_CREATIVE_ASSOCIATION_MAX_PAGE_SIZE
+            await cursor.save_page(index, start_index)
             total_results = response.get('totalResults', 0)
 
+        if response.get('response') != []:
+            cursor.is_complete = False
 
-async def _creatives(entity_id, advertiser_id, region):
-    api = Constants.DSP
-    aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
+    await cursor.gather(
+        batches(line_item_ids, DSP_BATCH_SIZE),
+        fetch,
+        concurrency,
     )
 
-    aa_delegate = AADelegate(
+
+async def _creatives(entity_id, advertiser_id, region, cursor):
+    api = Constants.DSP
+    aa_utility = AAUtility()
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.creative_interface_klass()
     interface = Interface(client, klass)
 
     response = {'response': [0]}
-    start_index, totalResults = 0, DSP_TOTAL_RESULTS_LIMIT
+    start_index, totalResults = cursor.start_index, DSP_TOTAL_RESULTS_LIMIT
     while start_index < totalResults and len(response.get('response', [])):
         log.info(f'Requesting creatives {start_index} - {start_index + MAX_PAGE_SIZE}...')
         request = Request(
@@ -551,57 +899,64 @@ async def _creatives(entity_id, advertiser_id, region):
             advertiser_id=entity_id,
             request=request,
         )
-        
-        while response.status_code == TOO_MANY_REQUESTS_STATUS_CODE:
-            delay = response.headers.get(
-                RETRY_AFTER,
-                RETRY_DELAY,
-            )
-            log.info(
-                f'Requesting creatives after {delay} seconds...'
-            )
-            time.sleep(int(delay))
-            response = await interface.index(
-                advertiser_id=entity_id,
-                request=request,
-            )
 
         response = response.json()
         log.info(f'Requested creatives {start_index} - {start_index + MAX_PAGE_SIZE}')
         start_index += MAX_PAGE_SIZE
+        await cursor.save(start_index)
         total_results = response.get('totalResults', 0)
 
+    if response.get('response') != []:
+        cursor.is_complete = False
+
+
+
+async def _advertiser_line_items(entity_id, advertiser_id, region, concurrency, cursor, since=None):
+    query = {
+        '_path': '/api/v1/amazon/aa/dsp/orders',
+        'advertiserId': advertiser_id,
+    }
+    if since:
+        query['_updated_at'] = { '$gte': since }
+
+    database = documentdb.motor_client.amazon
+    items = await database[entity_id].find(
+        query,
+        { 'orderId': 1, '_id': 0 },
+    ).to_list(None)
+    order_ids = sorted(item.get('orderId') for item in items)
+
+    await _line_items(entity_id, order_ids, region, cursor, concurrency)
+
+
+async def _advertiser_line_item_creative_associations(entity_id, advertiser_id, region, concurrency, cursor, since=None):
+    query = {
+        '_path': '/api/v1/amazon/aa/dsp/line_items',
+        'advertiserId': advertiser_id,
+    }
+    if since:
+        query['_updated_at'] = { '$gte': since }
+
+    database = documentdb.motor_client.amazon
+    items = await database[entity_id].find(
+        query,
+        { 'lineItemId': 1, '_id': 0 },
+    ).to_list(None)
+    line_item_ids = sorted(item.get('lineItemId') for item in items)
+    cursor.scope = { 'lineItemId': { '$in': line_item_ids } }
+
+    await _line_item_creative_associations(entity_id, line_item_ids, region, cursor, concurrency)
+
 
 # Sponsored Ads
 
 async def _sa_advertiser_ids(region):
     aa_utility = AAUtility()
-    aws_service = AWSService()
-    
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        Constants.PROFILES,
-    )
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         Constants.PROFILES,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.profile_interface_klass()
     interface = Interface(client, klass)
 
@@ -630,101 +985,62 @@ async def _sa_advertiser_ids(region):
     return advertiser_ids
     
 
-async def _ad_groups(advertiser_id, api, region):
+async def _ad_groups(advertiser_id, api, region, cursor, since=None):
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.ad_group_interface_klass(
         api,
     )
     interface = Interface(client, klass)
 
-    response = [0]
-    start_index = 0
-    while start_index < 20000 and len(response) > 0:
-        log.info(f'Requesting {api} ad groups {start_index} - {start_index + MAX_PAGE_SIZE}...')
-        request = Request(
-            scope={
-                'headers': [],
-                'method': 'GET',
-                'scheme': 'http',
-                'server': ('barcelona.getvisibly.com', 443,),
-                'path': f'/api/v1/amazon/aa/{api}/ad_groups',
-                'query_string': f'startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
-                'type': 'http',
-            }
-        )
-        response = await interface.index(
-            advertiser_id=advertiser_id,
-            request=request,
-        )
-
-        response = response.json()
-        log.info(f'Requested {api} ad groups {start_index} - {start_index + MAX_PAGE_SIZE}')
-        start_index += MAX_PAGE_SIZE
+    for id_filter in cursor.batches(await _campaign_id_filters(advertiser_id, api, since)):
+        response = [0]
+        start_index = cursor.start_index
+        while start_index < 20000 and len(response) > 0:
+            log.info(f'Requesting {api} ad groups {start_index} - {start_index + MAX_PAGE_SIZE}...')
+            request = Request(
+                scope={
+                    'headers': [],
+                    'method': 'GET',
+                    'scheme': 'http',
+                    'server': ('barcelona.getvisibly.com', 443,),
+                    'path': f'/api/v1/amazon/aa/{api}/ad_groups',
+                    'query_string': f'{id_filter}startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
+                    'type': 'http',
+                }
+            )
+            response = await interface.index(
+                advertiser_id=advertiser_id,
+                request=request,
+            )
 
+            response = response.json()
+            log.info(f'Requested {api} ad groups {start_index} - {start_index + MAX_PAGE_SIZE}')
+            start_index += MAX_PAGE_SIZE
+            await cursor.save(start_index)
 
-async def _campaigns(advertiser_id, api, region):
-    aa_utility = AAUtility()
-    aws_service = AWSService()
+        if response != []:
+            cursor.is_complete = False
 
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
 
-    aa_delegate = AADelegate(
+async def _campaigns(advertiser_id, api, region, cursor):
+    aa_utility = AAUtility()
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.campaign_interface_klass(
         api,
     )
     interface = Interface(client, klass)
 
     response = [0]
-    start_index = 0
+    start_index = cursor.start_index
     while start_index < 20000 and len(response):
         log.info(f'Requesting {api} campaigns {start_index} - {start_index + MAX_PAGE_SIZE}...')
         request = Request(
@@ -745,98 +1061,63 @@ async def _campaigns(advertiser_id, api, region):
         response = response.json()
         log.info(f'Requested {api} campaigns {start_index} - {start_index + MAX_PAGE_SIZE}')
         start_index += MAX_PAGE_SIZE
+        await cursor.save(start_index)
 
+    if response != []:
+        cursor.is_complete = False
 
-async def _keywords(advertiser_id, api, region):
+
+async def _keywords(advertiser_id, api, region, cursor, since=None):
     if api == Constants.SPONSORED_DISPLAY: return
 
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.keyword_interface_klass(
         api,
     )
     interface = Interface(client, klass)
 
-    response = [0]
-    start_index = 0
-    while start_index < 20000 and len(response) > 0:
-        log.info(f'Requesting {api} keywords {start_index} - {start_index + MAX_PAGE_SIZE}...')
-        request = Request(
-            scope={
-                'headers': [],
-                'method': 'GET',
-                'scheme': 'http',
-                'server': ('barcelona.getvisibly.com', 443,),
-                'path': f'/api/v1/amazon/aa/{api}/keywords',
-                'query_string': f'startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
-                'type': 'http',
-            }
-        )
-        response = await interface.index(
-            advertiser_id=advertiser_id,
-            request=request,
-        )
-
-        response = response.json()
-        log.info(f'Requested {api} keywords {start_index} - {start_index + MAX_PAGE_SIZE}')
-        start_index += MAX_PAGE_SIZE
+    for id_filter in cursor.batches(await _campaign_id_filters(advertiser_id, api, since)):
+        response = [0]
+        start_index = cursor.start_index
+        while start_index < 20000 and len(response) > 0:
+            log.info(f'Requesting {api} keywords {start_index} - {start_index + MAX_PAGE_SIZE}...')
+            request = Request(
+                scope={
+                    'headers': [],
+                    'method': 'GET',
+                    'scheme': 'http',
+                    'server': ('barcelona.getvisibly.com', 443,),
+                    'path': f'/api/v1/amazon/aa/{api}/keywords',
+                    'query_string': f'{id_filter}startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
+                    'type': 'http',
+                }
+            )
+            response = await interface.index(
+                advertiser_id=advertiser_id,
+                request=request,
+            )
 
+            response = response.json()
+            log.info(f'Requested {api} keywords {start_index} - {start_index + MAX_PAGE_SIZE}')
+            start_index += MAX_PAGE_SIZE
+            await cursor.save(start_index)
 
-async def _portfolios(advertiser_id, api, region):
-    aa_utility = AAUtility()
-    aws_service = AWSService()
+        if response != []:
+            cursor.is_complete = False
 
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
 
-    aa_delegate = AADelegate(
+async def _portfolios(advertiser_id, api, region, cursor):
+    aa_utility = AAUtility()
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.portfolio_interface_klass()
     interface = Interface(client, klass)
     
@@ -897,104 +1178,65 @@ async def _portfolios(advertiser_id, api, region):
     log.info(f'Requested portfolios')
 
 
-async def _product_ads(advertiser_id, api, region):
+async def _product_ads(advertiser_id, api, region, cursor, since=None):
     if api == Constants.SPONSORED_BRANDS: return
 
     aa_utility = AAUtility()
-    aws_service = AWSService()
-
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
-
-    aa_delegate = AADelegate(
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.product_ad_interface_klass(
         api,
     )
     interface = Interface(client, klass)
 
-    response = [0]
-    start_index = 0
-    while start_index < 20000 and len(response) > 0:
-        log.info(f'Requesting {api} product ads {start_index} - {start_index + MAX_PAGE_SIZE}...')
-        request = Request(
-            scope={
-                'headers': [],
-                'method': 'GET',
-                'scheme': 'http',
-                'server': ('barcelona.getvisibly.com', 443,),
-                'path': f'/api/v1/amazon/aa/{api}/product_ads',
-                'query_string': f'startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
-                'type': 'http',
-            }
-        )
-        response = await interface.index(
-            advertiser_id=advertiser_id,
-            request=request,
-        )
-
-        response = response.json()
-        log.info(f'Requested {api} product ads {start_index} - {start_index + MAX_PAGE_SIZE}')
-        start_index += MAX_PAGE_SIZE
+    for id_filter in cursor.batches(await _campaign_id_filters(advertiser_id, api, since)):
+        response = [0]
+        start_index = cursor.start_index
+        while start_index < 20000 and len(response) > 0:
+            log.info(f'Requesting {api} product ads {start_index} - {start_index + MAX_PAGE_SIZE}...')
+            request = Request(
+                scope={
+                    'headers': [],
+                    'method': 'GET',
+                    'scheme': 'http',
+                    'server': ('barcelona.getvisibly.com', 443,),
+                    'path': f'/api/v1/amazon/aa/{api}/product_ads',
+                    'query_string': f'{id_filter}startIndex={start_index}&count={MAX_PAGE_SIZE}'.encode(),
+                    'type': 'http',
+                }
+            )
+            response = await interface.index(
+                advertiser_id=advertiser_id,
+                request=request,
+            )
 
+            response = response.json()
+            log.info(f'Requested {api} product ads {start_index} - {start_index + MAX_PAGE_SIZE}')
+            start_index += MAX_PAGE_SIZE
+            await cursor.save(start_index)
 
-async def _targets(advertiser_id, api, region):
-    aa_utility = AAUtility()
-    aws_service = AWSService()
+        if response != []:
+            cursor.is_complete = False
 
-    ssm_service = aws_service.ssm_service
-    sts_service = aws_service.sts_service
-    sts_service.assume_role(
-        ssm_service.shared_parameter_store_role_arn,
-        1*60*60,
-    )
-    aa_ssm_service = AWSService.AASSMService(
-        sts_service,
-        ssm_service.shared_parameter_store_role_arn,
-    )
-    
-    version = aa_utility.version_for_api(
-        api,
-    )
 
-    aa_delegate = AADelegate(
+async def _targets(advertiser_id, api, region, cursor):
+    aa_utility = AAUtility()
+    client = ClientManager().client(
         api,
         region,
-        version,
-        ssm_service,
-        aa_ssm_service,
     )
 
-    client = Client(aa_delegate)
-
     klass = aa_utility.target_interface_klass(
         api,
     )
     interface = Interface(client, klass)
 
     if api == Constants.SPONSORED_BRANDS:
-        first_request = True
-        next_token = None
+        next_token = cursor.next_token
+        first_request = next_token is None
         while next_token is not None or first_request:            
             log.info(f'Requesting {api} targets...')
             request = Request(
@@ -1030,10 +1272,11 @@ async def _targets(advertiser_id, api, region):
             response = response.json()
             next_token = response.get('nextToken')
             first_request = False
+            await cursor.save(next_token=next_token)
             log.info(f'Requested {api} targets')
     else:
         response = [0]
-        start_index = 0
+        start_index = cursor.start_index
     
         while start_index < 20000 and len(response) > 0:
             log.info(f'Requesting {api} targets {start_index} - {start_index + MAX_PAGE_SIZE}...')
@@ -1056,6 +1299,10 @@ async def _targets(advertiser_id, api, region):
             response = response.json()
             log.info(f'Requested {api} targets {start_index} - {start_index + MAX_PAGE_SIZE}')
             start_index += MAX_PAGE_SIZE
+            await cursor.save(start_index)
+
+        if response != []:
+            cursor.is_complete = False
 
 
 def batches(items, n):
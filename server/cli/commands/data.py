@@ -1,15 +1,23 @@
+from datetime import datetime
+
 import json
 import logging
 import os
 import sys
+import time
 import traceback
 
 import click
 import requests
 
 from server.core.constants import Constants
+from server.managers.index_manager import IndexManager
+from server.resources.schema.amazon_api import IndexSearchTermsRankingSchema
+from server.resources.types.data_types import ApiType
 from server.services.aws_service import AWSService
+from server.services.data.es import report_months_aggregation
 from server.services.data_service import DataService
+from server.utilities.index_utility import IndexUtility
 
 
 log = AWSService().log_service
@@ -82,3 +90,439 @@ def tags(obj, method):
         )
 
     print(results)
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('start_date')
+@click.argument('end_date')
+@click.option('--query', '-q', default='a', required=False)
+@click.option('--counts', '-c', default='1,10,50,100,250,500', required=False)
+@click.option('--repeat', '-r', default=3, required=False)
+@click.pass_obj
+def search_terms_rank(obj, start_date, end_date, query, counts, repeat):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_retail_elasticsearch_domain
+
+    data_service = DataService(es_service.es_service)
+
+    counts = [int(count) for count in counts.split(Constants.COMMA)]
+    search_terms = data_service.search_terms_filter(
+        query,
+        max(counts),
+    )
+
+    log.info(f'Sampled {len(search_terms)} search terms matching "{query}"')
+
+    for count in counts:
+        data = IndexSearchTermsRankingSchema(
+            search_terms=search_terms[:count],
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        durations = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            data_service.search_terms_rank(data)
+            durations.append(time.perf_counter() - start_time)
+
+        print(
+            f'{len(data.search_terms):>5} search terms | '
+            f'min {min(durations) * 1000:8.1f} ms | '
+            f'mean {sum(durations) / len(durations) * 1000:8.1f} ms'
+        )
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('api', type=click.Choice([ApiType.DSP.value, ApiType.SA.value]))
+@click.argument('advertiser_id')
+@click.option('--dry_run', '-d', is_flag=True, default=False)
+@click.option('--requests_per_second', '-r', default=Constants.ES_TASK_REQUESTS_PER_SECOND, required=False)
+@click.pass_obj
+def partition(obj, api, advertiser_id, dry_run, requests_per_second):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+    client = es_service.es_service
+
+    index_utility = IndexUtility()
+
+    prefix = Constants.DSP_INDEX if api == ApiType.DSP.value else Constants.SPONSORED_ADS_INDEX
+    alias = f'{prefix}_{advertiser_id}'
+
+    if client.indices.exists_alias(name=alias):
+        log.info(f'{alias} is already partitioned into monthly indices')
+        return
+
+    mappings = client.indices.get(index=alias)[alias]['mappings']
+    template = _monthly_index_template(alias, mappings)
+
+    months = _report_months(client, alias)
+    for month, count in months:
+        log.info(f'{index_utility.monthly_index(alias, month)} | {count} documents')
+
+    if dry_run:
+        log.info(f'Dry run | {alias} would be partitioned into {len(months)} monthly indices')
+        return
+
+    log.info(f'Partitioning {alias} into {len(months)} monthly indices...')
+
+    # The template is created without the alias, because the alias cannot
+    # exist while the unpartitioned index has the same name
+    client.indices.put_template(
+        name=f'{alias}{Constants.DASH}monthly',
+        body=template,
+    )
+
+    # Writes, updates and deletes during the first pass are detected by the
+    # highest sequence number of each of the unpartitioned index's shards
+    seq_nos = _max_seq_nos(client, alias)
+
+    for month, count in months:
+        log.info(f'Reindexing {count} documents into {index_utility.monthly_index(alias, month)}...')
+        _reindex_month(es_service, alias, month, requests_per_second)
+
+    # Writes to the unpartitioned index are blocked while documents written
+    # since the reindex started are caught up, so that none are lost between
+    # the last reindex and the swap
+    client.indices.put_settings(
+        index=alias,
+        body={ 'index.blocks.write': True },
+    )
+
+    if _max_seq_nos(client, alias) != seq_nos:
+        # Every month is copied again, overwriting documents updated while
+        # reindexing, not only adding the missing ones
+        log.info(f'Catching up on documents written to {alias} while reindexing...')
+        for month, _ in _report_months(client, alias):
+            _reindex_month(es_service, alias, month, requests_per_second)
+
+    mismatches = _month_mismatches(client, alias)
+    if mismatches:
+        client.indices.put_settings(
+            index=alias,
+            body={ 'index.blocks.write': False },
+        )
+        raise click.ClickException(
+            f'The monthly indices of {alias} do not match it: {", ".join(mismatches)}. '
+            f'{alias} was not removed. Delete {alias}{Constants.DASH}* before partitioning it again.'
+        )
+
+    # Swaps the unpartitioned index for an alias over its months atomically.
+    # The alias is read-only: none of its indices is a write index, so writes
+    # through it are rejected, rather than landing in a month other than that
+    # of their `report_date`, where queries narrowed to the months of a date
+    # range would miss them. Writers name the month of each document with
+    # `IndexUtility.monthly_index`, as `visibly data ingest` does.
+    client.indices.update_aliases(
+        body={
+            'actions': [
+                { 'remove_index': { 'index': alias } },
+                { 'add': { 'index': f'{alias}{Constants.DASH}*', 'alias': alias, 'is_write_index': False } },
+            ],
+        },
+    )
+
+    # New months join the alias, read-only, as soon as they are created
+    template['aliases'] = { alias: { 'is_write_index': False } }
+    client.indices.put_template(
+        name=f'{alias}{Constants.DASH}monthly',
+        body=template,
+    )
+
+    IndexManager().invalidate(alias)
+
+    log.info(f'Partitioned {alias} into {len(months)} monthly indices')
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.pass_obj
+def tasks(obj):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+
+    running_tasks = es_service.tasks()
+    if not running_tasks:
+        log.info('No delete, update or reindex tasks are running')
+
+    for task_id, task in running_tasks.items():
+        status = task.get('status', {})
+        log.info(
+            f'{task_id} | {task.get("action")} | {task.get("description")} | '
+            f'{status.get("created", 0) + status.get("updated", 0) + status.get("deleted", 0)}/{status.get("total", 0)} documents'
+        )
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('task_id')
+@click.option('--wait', '-w', is_flag=True, default=False)
+@click.pass_obj
+def task(obj, task_id, wait):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+
+    response = es_service.wait_for_task(task_id) if wait else es_service.task(task_id)
+
+    log.info(json.dumps(response.get('task', {}).get('status', {})))
+    if response.get('completed'):
+        _raise_for_task(response)
+        log.info(f'{task_id} completed')
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('task_id')
+@click.pass_obj
+def cancel(obj, task_id):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+
+    es_service.cancel_task(task_id)
+
+    log.info(f'Cancelled {task_id}')
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('index')
+@click.argument('query')
+@click.option('--requests_per_second', '-r', default=Constants.ES_TASK_REQUESTS_PER_SECOND, required=False)
+@click.option('--wait', '-w', is_flag=True, default=False)
+@click.pass_obj
+def delete(obj, index, query, requests_per_second, wait):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+
+    task_id = es_service.delete_by_query(
+        { 'query': json.loads(query) },
+        index,
+        requests_per_second=requests_per_second,
+    )
+    log.info(f'Deleting from {index} as task {task_id}. Run `visibly data cancel {task_id}` to stop it.')
+
+    if wait:
+        response = es_service.wait_for_task(task_id)
+        _raise_for_task(response)
+        log.info(f'Deleted {response.get("response", {}).get("deleted", 0)} documents from {index}')
+
+
+@data.command(
+    context_settings={
+        'allow_extra_args': True,
+        'ignore_unknown_options': True,
+    },
+)
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('index')
+@click.option('--id_field', '-i', default=None, required=False)
+@click.option('--chunk_size', '-c', default=Constants.INGEST_CHUNK_SIZE, required=False)
+@click.option('--max_chunk_bytes', '-b', default=Constants.INGEST_MAX_CHUNK_BYTES, required=False)
+@click.option('--threads', '-t', default=Constants.INGEST_THREAD_COUNT, required=False)
+@click.option('--dead_letter', '-d', default=None, required=False)
+@click.pass_obj
+def ingest(obj, path, index, id_field, chunk_size, max_chunk_bytes, threads, dead_letter):
+    es_service = AWSService().es_service
+    es_service.domain = AWSService().ssm_service.amazon_advertising_elasticsearch_domain
+
+    dead_letter = dead_letter or f'{path}.dead_letter'
+
+    # Documents of advertisers partitioned into monthly indices are written
+    # to the month of their `report_date`
+    is_partitioned = bool(IndexManager().partitions(es_service.es_service, index))
+
+    log.info(f'Ingesting {path} into {index}{" by month" if is_partitioned else ""}...')
+
+    # Without `id_field`, Elasticsearch generates the documents' IDs, so bulk
+    # requests that time out are not retried, as they may have been indexed
+    metrics = es_service.index(
+        _ndjson_actions,
+        path,
+        index,
+        id_field,
+        is_partitioned,
+        chunk_size=chunk_size,
+        dead_letter_path=dead_letter,
+        max_chunk_bytes=max_chunk_bytes,
+        thread_count=threads,
+    )
+
+    log.info(json.dumps(metrics.to_dict()))
+
+    if metrics.failed:
+        raise click.ClickException(
+            f'{metrics.failed} documents failed to be ingested. They were written to {dead_letter}.'
+        )
+
+
+def _max_seq_nos(client, index):
+    response = client.indices.stats(
+        index=index,
+        level='shards',
+    )
+
+    return {
+        (name, shard,): copy['seq_no']['max_seq_no']
+        for name, stats in response['indices'].items()
+        for shard, copies in stats['shards'].items()
+        for copy in copies
+        if copy['routing']['primary']
+    }
+
+
+def _month_mismatches(client, alias):
+    index_utility = IndexUtility()
+
+    mismatches = []
+    for month, expected in _report_months(client, alias):
+        index = index_utility.monthly_index(alias, month)
+        actual = client.count(index=index)['count'] if client.indices.exists(index=index) else 0
+        if expected != actual:
+            mismatches.append(f'{index} holds {actual} of {expected} documents')
+
+    # Documents without a `report_date` belong to no month
+    expected = client.count(index=alias)['count']
+    actual = client.count(index=f'{alias}{Constants.DASH}*')['count']
+    if expected != actual:
+        mismatches.append(f'{alias} holds {expected} documents, but its monthly indices hold {actual}')
+
+    return mismatches
+
+
+def _monthly_index_template(alias, mappings):
+    return {
+        'index_patterns': [
+            f'{alias}{Constants.DASH}*',
+        ],
+        'settings': {
+            'index': {
+                'number_of_shards': Constants.MONTHLY_INDEX_SHARDS,
+                # Sorted segments let range queries on `report_date`
+                # terminate early
+                'sort.field': Constants.MONTHLY_INDEX_SORT_FIELD,
+                'sort.order': 'asc',
+            },
+        },
+        'mappings': mappings,
+    }
+
+
+def _ndjson_actions(path, index, id_field, is_partitioned=False):
+    index_utility = IndexUtility()
+
+    with open(path) as ndjson_file:
+        for line in ndjson_file:
+            if not line.strip():
+                continue
+
+            document = json.loads(line)
+
+            action = {
+                '_index': index,
+                '_source': document,
+            }
+            # Documents of a partitioned index without a `report_date` are
+            # written to its read-only alias, which rejects them
+            report_date = document.get(Constants.MONTHLY_INDEX_SORT_FIELD)
+            if is_partitioned and index_utility.to_date(report_date):
+                action['_index'] = index_utility.monthly_index(index, report_date)
+
+            if id_field:
+                action['_id'] = document[id_field]
+
+            yield action
+
+
+def _next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+
+    return month.replace(month=month.month + 1)
+
+
+def _raise_for_task(response):
+    description = response.get('task', {}).get('description')
+
+    failures = response.get('error') or response.get('response', {}).get('failures')
+    if failures:
+        raise click.ClickException(
+            f'{description} failed: {json.dumps(failures)}'
+        )
+
+    # Tasks stopped with `visibly data cancel` complete without failures
+    canceled = response.get('response', {}).get('canceled') or response.get('task', {}).get('status', {}).get('canceled')
+    if canceled:
+        raise click.ClickException(
+            f'{description} was cancelled: {canceled}'
+        )
+
+
+def _reindex_month(es_service, alias, month, requests_per_second):
+    index = IndexUtility().monthly_index(alias, month)
+    body = {
+        'source': {
+            'index': alias,
+            'query': {
+                'range': {
+                    Constants.MONTHLY_INDEX_SORT_FIELD: {
+                        'gte': month.strftime(Constants.DATE_FORMAT_YYYY_MM_DD),
+                        'lt': _next_month(month).strftime(Constants.DATE_FORMAT_YYYY_MM_DD),
+                    },
+                },
+            },
+        },
+        'dest': {
+            'index': index,
+        },
+    }
+
+    task_id = es_service.reindex(
+        body,
+        requests_per_second=requests_per_second,
+    )
+    log.info(f'Reindexing {index} as task {task_id}. Run `visibly data cancel {task_id}` to stop it.')
+
+    _raise_for_task(es_service.wait_for_task(task_id))
+    es_service.es_service.indices.refresh(index=index)
+    log.info(f'Reindexed {index}')
+
+
+def _report_months(client, index):
+    response = report_months_aggregation(
+        client,
+        index,
+    )
+
+    return [
+        (
+            datetime.utcfromtimestamp(bucket.key / 1000).date(),
+            bucket.doc_count,
+        )
+        for bucket in response.aggregations.months.buckets
+    ]
@@ -74,6 +74,7 @@ class Constants:
     DSP_OBJECTIVES_PREFIX='/objectives/dsp'
     DSP_PREFIX='/dsp'
     ENGAGEMENT_PREFIX='/my_dashboard/engagement'
+    EXECUTORS_PREFIX='/executors'
     GEO_LOCATIONS_PREFIX='/geo_locations'
     GOAL_CONFIGURATIONS_PREFIX='/goal_configurations'
     GRAPHS_PREFIX='/graphs'
@@ -98,6 +99,7 @@ class Constants:
     PRE_BID_TARGETING_DV_CUSTOM_CONTEXTUAL_SEGMENTS_PREFIX='/pre_bid_targeting/double_verify/custom_contextual_segments'
     PRODUCT_ADS_PREFIX='/product_ads'
     PRODUCT_CATEGORIES_PREFIX='/product_categories'
+    RATE_LIMITS_PREFIX='/rate_limits'
     RECOMMENDATIONS_PREFIX='/recommendations'
     REPORTS='reports'
     REPORTS_PREFIX='/reports'
@@ -133,9 +135,11 @@ class Constants:
     ADVERTISER_NAME='advertiser-name'
     ALIVE='alive'
     AMERICA_LOS_ANGELES_TIMEZONE='America/Los_Angeles'
+    APPLICATION_NDJSON='application/x-ndjson'
     APPLICATION_PDF='application/pdf'
     APPLICATION_TITLE='Visibly'
     APPROVED='approved'
+    AUTHORIZATION='Authorization'
     AUTO='auto'
     BRAND_ANALYTICS_INDEX='ba'
     BCRYPT='bcrypt'
@@ -164,6 +168,9 @@ class Constants:
     EMPTY_STRING=''
     END_DATE='end_date'
     ES_FILTER_ARRAY_LIMIT=1023
+    ES_TASK_ACTIONS='*byquery,*reindex'
+    ES_TASK_POLL_INTERVAL=10
+    ES_TASK_REQUESTS_PER_SECOND=500
     ES_TIMEOUT=60
     EVENT='EVENT'
     FORWARD_SLASH='/'
@@ -181,6 +188,15 @@ class Constants:
     GO_GETVISIBLY_COM='go.getvisibly.com'
     HOST='host'
     ID='id'
+    INGEST_CHUNK_SIZE=500
+    INGEST_INITIAL_BACKOFF=2
+    INGEST_MAX_BACKOFF=60
+    INGEST_MAX_CHUNK_BYTES=10*1024*1024
+    INGEST_MAX_RETRIES=5
+    # Rejected (429) and unavailable (502, 503 and 504) bulk requests and
+    # documents
+    INGEST_RETRY_STATUS_CODES=(429, 502, 503, 504)
+    INGEST_THREAD_COUNT=4
     INVITATION_EMAIL='invitation_email'
     INSIGHT_TYPE='insight_type'
     ISO_DATE_FORMAT='%Y-%m-%d'
@@ -189,6 +205,10 @@ class Constants:
     LINE_ITEM_ID='line_item_id'
     LOG_FORMAT=u'%(asctime)s [%(levelname)-8s] %(message)s [%(pathname)s:%(lineno)d]'
     MESSAGE='message'
+    MONTHLY_INDEX_DATE_FORMAT='%Y.%m'
+    MONTHLY_INDEX_PARTITIONS_TTL=5*60
+    MONTHLY_INDEX_SHARDS=1
+    MONTHLY_INDEX_SORT_FIELD='report_date'
     NEW_PASSWORD='new_password'
     NO_BRAND='No brand'
     NO_CATEGORY='No category'
@@ -205,21 +225,34 @@ class Constants:
     PORT_TLS=443
     PREVIOUS_PERIOD_END_DATE='previous_period_end_date'
     PREVIOUS_PERIOD_START_DATE='previous_period_start_date'
+    RATE_LIMIT_BURST=10
+    RATE_LIMIT_INITIAL_BACKOFF=1
+    RATE_LIMIT_MAX_BACKOFF=60
+    RATE_LIMIT_MAX_RETRIES=8
+    RATE_LIMIT_MIN_RATE=0.5
+    RATE_LIMIT_RATE=10
+    RATE_LIMIT_RECOVERY=0.05
+    REFRESH_BATCH_SIZE=100
     REFRESH_TOKEN_COOKIE_KEY='refresh_token'
     REFRESH_TOKEN_DURATION=60*60*24
     REFRESH_TOKEN_KEY='refresh_token'
     REPORT_CREATED_AT_DATETIME_FORMAT='%Y-%m-%d %H:%M:%S'
     REPORT_EVENT_DETAIL_TYPE='report'
     REPORT_EVENT_SOURCE='visibly-server'
+    REQUEST_CONTEXT_MAX_SIZE=10_000
+    REQUEST_CONTEXT_TTL=30
     RETRY_AFTER='Retry-After'
     SCHEDULE='schedule'
     SCOPE_ADMIN='admin'
     SCOPE_READ='read'
     SCOPE_WRITE='write'
+    SEARCH_TERMS_EXPORT_PREFIX='/export'
     SEARCH_TERMS_INDEX='search_terms'
+    SEARCH_TERMS_PAGE_SIZE=1000
     SEARCH_TERMS_PERIODS_PREFIX='/periods'
     SEARCH_TERMS_RANK_PREFIX='/rank'
     SEARCH_TERMS_PREFIX='/search_terms'
+    SEARCH_TERMS_SCROLL_KEEP_ALIVE='2m'
     SEARCH_TERMS_PERIODS_DATE_FORMAT='%m-%Y'
     SPACE=' '
     SPONSORED_ADS_INDEX='sa'
@@ -229,11 +262,17 @@ class Constants:
     STRICT='strict'
     SUBSTITUTIONS='substitutions'
     SYMBOLS='[]()-+!.-="<>@~.'
+    SYNC_METRICS_INTERVAL=10
     TAGS='tags'
     TEMPLATE_ID='template_id'
+    TEXT_CSV='text/csv'
     TFA_EMAIL='tfa_email'
     TO='to'
+    TOKEN_CACHE_MAX_SIZE=10_000
+    TOKEN_CACHE_TTL=30
+    TOO_MANY_REQUESTS_STATUS_CODE=429
     TS='ts'
+    UNAUTHORIZED_STATUS_CODE=401
     UNDERSCORE='_'
     URL='endpoint_url'
     USER_ID='user_id'
@@ -247,12 +286,18 @@ class Constants:
     YYYYMMDD_DATE_FORMAT='%Y%m%d'
 
     # AWS
+    AMAZON_AA_ACCESS_TOKEN_LIFETIME=60*60
+    AMAZON_AA_ACCESS_TOKEN_PARAMETER='shared-ssm-amazon-aa-sa-access-token-parameter'
+    AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL=30
+    AMAZON_AA_ACCESS_TOKEN_REFRESH_MARGIN=5*60
     AWS_ECS_TASK_DEFINITION='ecs-visibly-task'
     EB_RESOURCE='events'
     ECS_RESOURCE='ecs'
     ES_RESOURCE='es'
     RDS_RESOURCE='rds'
     S3_RESOURCE='s3'
+    SSM_GET_PARAMETERS_MAX_NAMES=10
+    SSM_PARAMETERS_TTL=5*60
     SSM_RESOURCE='ssm'
     STS_RESOURCE='sts'
     STS_SESSION_DURATION=12*60*60
@@ -0,0 +1,76 @@
+"""Configures gunicorn to serve `server` in production.
+
+gunicorn manages a pool of uvicorn workers, e.g.,
+
+    gunicorn --config python:server.core.gunicorn_config server.main:app
+
+Every setting is read from `server/core/settings.py`, so each can be
+overridden with an environment variable (see `SERVER_*`).
+"""
+
+
+import math
+import os
+
+from server.core import settings
+from server.services.aws_service import AWSService
+
+
+def post_fork(server, worker):
+    """Discards the AWS clients that a worker inherits from the master.
+
+    boto3 and pymongo clients, their connection pools and the CloudWatch
+    log handler's threads are not safe to share across a fork, so each
+    worker creates its own on first use.
+    """
+    AWSService.reset()
+
+
+def _cpus():
+    """Counts the CPUs available to `server`, e.g., to its container.
+
+    Counts the CPUs the process may run on, limited by the container's
+    cgroup quota (v2 `cpu.max` or v1 `cpu.cfs_quota_us`), if any, rather
+    than every CPU of the host.
+    """
+    cpus = len(os.sched_getaffinity(0))
+
+    for path, period_path in (
+        ('/sys/fs/cgroup/cpu.max', None),
+        ('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', '/sys/fs/cgroup/cpu/cpu.cfs_period_us'),
+    ):
+        try:
+            with open(path) as f:
+                values = f.read().split()
+            if period_path:
+                with open(period_path) as f:
+                    values.append(f.read().strip())
+        except (OSError, ValueError):
+            continue
+
+        quota, period = values[0], values[1]
+        if quota not in ('max', '-1'):
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+
+        break
+
+    return cpus
+
+
+backlog = settings.SERVER_BACKLOG
+bind = f'{settings.SERVER_HOST}:{settings.SERVER_PORT}'
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+keepalive = settings.SERVER_KEEP_ALIVE
+# Workers are recycled after a (jittered) number of requests to contain
+# memory growth, without every worker restarting at once
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+# The application is imported once before workers are forked. Importing it
+# reads SSM, e.g., the API prefix, so `post_fork` discards the clients the
+# worker inherits.
+preload_app = settings.SERVER_PRELOAD
+timeout = settings.SERVER_TIMEOUT
+worker_class = 'uvicorn.workers.UvicornWorker'
+# Each uvicorn worker runs an event loop that can keep a CPU busy, so there
+# is one worker per available CPU
+workers = settings.SERVER_WORKERS or _cpus()
@@ -9,6 +9,11 @@ ADVERTISER_NAME = config(
     cast=str,
     default='test',
 )
+AMAZON_AA_THREADS = config(
+    'AMAZON_AA_THREADS',
+    cast=int,
+    default=20,
+)
 AMAZON_WEB_SERVICES_REGION = config(
     'AMAZON_WEB_SERVICES_REGION',
     cast=str,
@@ -34,8 +39,110 @@ AWS_IAM_TRUSTING_ROLE = config(
     cast=str,
     default=None,
 )
+DEBUG = config(
+    'DEBUG',
+    cast=bool,
+    default=False,
+)
+DOCDB_THREADS = config(
+    'DOCDB_THREADS',
+    cast=int,
+    default=16,
+)
+ES_THREADS = config(
+    'ES_THREADS',
+    cast=int,
+    default=8,
+)
 ORIGIN = config(
     'ORIGIN',
     cast=str,
     default='getvisibly.com',
-)
\ No newline at end of file
+)
+SERVER_BACKLOG = config(
+    'SERVER_BACKLOG',
+    cast=int,
+    default=2048,
+)
+SERVER_GRACEFUL_TIMEOUT = config(
+    'SERVER_GRACEFUL_TIMEOUT',
+    cast=int,
+    default=30,
+)
+SERVER_HOST = config(
+    'SERVER_HOST',
+    cast=str,
+    default='0.0.0.0',
+)
+SERVER_KEEP_ALIVE = config(
+    'SERVER_KEEP_ALIVE',
+    cast=int,
+    default=5,
+)
+SERVER_MAX_REQUESTS = config(
+    'SERVER_MAX_REQUESTS',
+    cast=int,
+    default=10_000,
+)
+SERVER_MAX_REQUESTS_JITTER = config(
+    'SERVER_MAX_REQUESTS_JITTER',
+    cast=int,
+    default=1_000,
+)
+SERVER_PORT = config(
+    'SERVER_PORT',
+    cast=int,
+    default=8080,
+)
+SERVER_PRELOAD = config(
+    'SERVER_PRELOAD',
+    cast=bool,
+    default=True,
+)
+SERVER_TIMEOUT = config(
+    'SERVER_TIMEOUT',
+    cast=int,
+    default=120,
+)
+SERVER_WORKERS = config(
+    'SERVER_WORKERS',
+    cast=int,
+    default=0,  # 0 sizes workers by CPU count
+)
+SYNC_BATCH_CONCURRENCY = config(
+    'SYNC_BATCH_CONCURRENCY',
+    cast=int,
+    default=4,  # DSP batches of parent IDs requested at once per task
+)
+SYNC_CONCURRENCY = config(
+    'SYNC_CONCURRENCY',
+    cast=int,
+    default=16,
+)
+SYNC_FULL_INTERVAL = config(
+    'SYNC_FULL_INTERVAL',
+    cast=int,
+    # Seconds between full syncs of an entity type. 0 syncs in full on
+    # every run.
+    default=86_400,
+)
+SYNC_PROFILE_CONCURRENCY = config(
+    'SYNC_PROFILE_CONCURRENCY',
+    cast=int,
+    default=4,
+)
+SYNC_QUEUE_SIZE = config(
+    'SYNC_QUEUE_SIZE',
+    cast=int,
+    default=64,  # Pages waiting to be written
+)
+SYNC_WRITE_BATCH_SIZE = config(
+    'SYNC_WRITE_BATCH_SIZE',
+    cast=int,
+    default=1_000,  # Operations per bulk write
+)
+SYNC_WRITERS = config(
+    'SYNC_WRITERS',
+    cast=int,
+    default=4,
+)
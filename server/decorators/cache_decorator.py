@@ -12,22 +12,31 @@ from functools import wraps
 from typing import (
     Callable,
 )
+from urllib.parse import urlencode
 
+import copy
 import re
+import time
 
+from starlette.requests import Request
 from starlette.status import HTTP_304_NOT_MODIFIED
 
 import requests
 
 from server.core.constants import Constants
+from server.managers.flight_manager import FlightManager
+from server.resources.models.aio.checkpoint import Checkpoint
 from server.services.aws_service import AWSService
+from server.services.pipeline_service import PipelineService
 from server.services.redis_service import RedisService
+from server.services.sync_report_service import SyncReportService
 from server.utilities.cache_utility import CacheUtility
 from server.utilities.data_utility import DataUtility
 
 
 cache_utility = CacheUtility()
 data_utility = DataUtility()
+flight_manager = FlightManager()
 log = AWSService().log_service
 redis_service = RedisService().cache
 
@@ -35,6 +44,15 @@ redis_service = RedisService().cache
 def docdb_cache(is_many: bool = True):
     """Gets data from a DocumentDB cache or requests an external API.
 
+    GETs with a `response` read the cache. A path that was never requested
+    is requested first, and identical concurrent requests to the external
+    API share one request and one write (see `FlightManager`). A checkpoint
+    records that the path was requested, so that an empty response is
+    cached too.
+
+    DSP entities are requested with the entity's profile, `advertiser_id`,
+    and cached in the collection of the DSP advertiser, `dsp_advertiser_id`.
+
     Args:
         is_many: Whether the response is a list (True) or a single dictionary
         (False)
@@ -76,7 +94,7 @@ def docdb_cache(is_many: bool = True):
             if 'dsp' not in path and key:
                 key = key
 
-            database = docdb_service.client.amazon
+            database = docdb_service.motor_client.amazon
             
             if key:
                 # Cache uses a `_path` field without any `key` as a cache key
@@ -91,11 +109,11 @@ def docdb_cache(is_many: bool = True):
                     )
                 )
                 query = { '_path': path, f'{model}Id': key, }
-                value = database[advertiser_id].count_documents(
+                value = await database[advertiser_id].count_documents(
                     query,
                 )
                 if dsp_advertiser_id:
-                    value = database[dsp_advertiser_id].count_documents(
+                    value = await database[dsp_advertiser_id].count_documents(
                         query,
                     )
             else:
@@ -108,7 +126,99 @@ def docdb_cache(is_many: bool = True):
                 )
                 value = database[dsp_advertiser_id].find(query)
             
+            # Request using the external API
+            async def request_and_cache():
+                collection_name = advertiser_id
+
+                start_time = time.monotonic()
+                value = await func(self, *args, **kwargs)
+                seconds = time.monotonic() - start_time
+
+                pipeline = PipelineService.current()
+                if pipeline:
+                    pipeline.fetched(seconds)
+            
+                items = value
+
+                if isinstance(items, requests.Response):
+                    items = items.json()
+
+                SyncReportService.fetched(seconds, _count(items))
+
+                key = _key(request.url.path)
+             
+                # DSP
+                if dsp_advertiser_id:
+                    log.info(
+                        f'Switching advertiser_id from {collection_name} to {dsp_advertiser_id}'
+                    )
+                    collection_name = dsp_advertiser_id
+
+                # Update the cache with the response from the API
+                if is_many:
+                    if isinstance(items, dict):
+                        items = items.get('response', [])
+
+                        log.info(
+                            f'Caching DSP data {items}...'
+                        )
+
+                        log.info(
+                            f'Caching DSP data using {request.url.path} and advertiser_id {collection_name}...'
+                        )
+
+                        await _replace_all(
+                            database[collection_name],
+                            _replacements(items, request.url.path, is_dsp=True),
+                        )
+
+                        log.info(
+                            f'Cached DSP data'
+                        )
+
+                        return value
+                
+                    # Sponsored Ads
+                    if isinstance(items, list) and len(items):
+                        items = cache_utility.stringify_ids(items, request.url.path)
+
+                        await _replace_all(
+                            database[collection_name],
+                            _replacements(items, request.url.path),
+                        )
+                elif items:  # `items` is actually a single dict, not a list at this point
+                    items = cache_utility.stringify_id(items, request.url.path)
+                
+                    items['_path'] = request.url.path
+                    await _replace_all(
+                        database[collection_name],
+                        [(
+                            { '$and': [ { key: items.get(key) }, { '_path': request.url.path }, ] },
+                            items,
+                        )],
+                    )
+            
+                return value
+
+            async def flight(request_and_cache=request_and_cache):
+                # Identical requests in flight, e.g., of several users opening the
+                # same page, wait for the first request (and its write) instead of
+                # requesting the external API again
+                return await flight_manager.run(
+                    (
+                        advertiser_id,
+                        dsp_advertiser_id,
+                        func.__name__,
+                        request.url.path,
+                        key,
+                        tuple(sorted(request.query_params.multi_items())),
+                    ),
+                    request_and_cache,
+                )
+
             if value and response:
+                collection_name = dsp_advertiser_id or advertiser_id
+
                 query_parameters = {**request.query_params}
                 ad_group_ids = query_parameters.get('adGroupIdFilter')
                 ad_ids = query_parameters.get('adIdFilter')
@@ -163,7 +273,7 @@ def docdb_cache(is_many: bool = True):
                 if creative_line_item_ids:
                     creative_line_item_ids = creative_line_item_ids.split(Constants.COMMA)
                     
-                    items = database[advertiser_id].find(
+                    items = await database[collection_name].find(
                         {
                             '_path': '/api/v1/amazon/aa/dsp/line_item_creative_associations',
                             'lineItemId': {
@@ -171,7 +281,7 @@ def docdb_cache(is_many: bool = True):
                             },
                         },
                         { 'creativeId': 1, '_id': 0 },
-                    )
+                    ).to_list(None)
                     creative_ids = [item.get('creativeId') for item in items]
 
                     query['creativeId'] = {
@@ -344,91 +454,60 @@ def docdb_cache(is_many: bool = True):
 
                 print(query)
 
-                return list(
-                    database[advertiser_id].find(
-                        query,
-                        { '_id': 0, '_path': 0 },
-                    )
-                )
-
-            # Request using the external API
-            value = await func(self, *args, **kwargs)
-            
-            items = value
-
-            if isinstance(items, requests.Response):
-                items = items.json()
-
-            key = _key(request.url.path)
-             
-            # Update the cache with the response from the API
-            if is_many:
-                # DSP
-                if dsp_advertiser_id:
-                    log.info(
-                        f'Switching advertiser_id from {advertiser_id} to {dsp_advertiser_id}'
-                    )
-                    advertiser_id = dsp_advertiser_id
-
-                if isinstance(items, dict):
-                    items = items.get('response', [])
-
-                    log.info(
-                        f'Caching DSP data {items}...'
+                projection = { '_id': 0, '_path': 0, '_hash': 0, '_sync_generation': 0, '_updated_at': 0 }
+                cached = await database[collection_name].find(
+                    query,
+                    projection,
+                ).to_list(None)
+
+                if cached or await database[collection_name].count_documents({ '_path': path }, limit=1):
+                    return cached
+
+                # Paths whose response was empty are requested only once
+                motor_client = docdb_service.motor_client
+                if await Checkpoint.find(collection_name, path, motor_client):
+                    return cached
+
+                # `path` was never requested, e.g., for a new advertiser, so it
+                # is requested with only Amazon's filters, e.g.,
+                # `campaignIdFilter`, and read back from the cache with every
+                # filter applied
+                query_string = [
+                    (name, value)
+                    for name, value in request.query_params.multi_items()
+                    if name.endswith('Filter')
+                ]
+                # Lists of an entity's DSP entities not narrowed by their IDs
+                # are narrowed to the DSP advertiser
+                if dsp_advertiser_id and not any(name.endswith('IdFilter') for name, _ in query_string):
+                    query_string.append(('advertiserIdFilter', dsp_advertiser_id))
+
+                request = Request({
+                    **request.scope,
+                    'query_string': urlencode(query_string).encode(),
+                })
+                kwargs[Constants.REQUEST] = request
+
+                async def request_cache_and_checkpoint():
+                    value = await request_and_cache()
+
+                    await Checkpoint.update(
+                        collection_name,
+                        path,
+                        datetime.utcnow(),
+                        motor_client,
                     )
 
-                    for item in items:
-                        log.info(
-                            f'Caching DSP data {item} using {request.url.path} and advertiser_id {advertiser_id}...'
-                        )
-                        
-                        item.update({'_path': request.url.path})
-                        if isinstance(key, list):
-                            database[advertiser_id].replace_one(
-                                { '$and': [ { key[0]: str(item.get(key[0])), key[1]: str(item.get(key[1])) }, { '_path': request.url.path }, ] },
-                                item,
-                                upsert=True,
-                            )
-                        else:
-                            database[advertiser_id].replace_one(
-                                { '$and': [ { key: str(item.get(key)) }, { '_path': request.url.path }, ] },
-                                item,
-                                upsert=True,
-                            )
+                    return value
 
-                        log.info(
-                            f'Cached DSP data {item} using {request.url.path} and advertiser_id {advertiser_id}'
-                        )
+                await flight(request_cache_and_checkpoint)
 
-                    log.info(
-                        f'Cached DSP data'
-                    )
+                return await database[collection_name].find(
+                    query,
+                    projection,
+                ).to_list(None)
 
-                    return value
-                
-                # Sponsored Ads
-                if isinstance(items, list) and len(items):
-                    items = cache_utility.stringify_ids(items, request.url.path)
-                    
-                    for item in items:
-                        
-                        item.update({'_path': request.url.path})
-                        database[advertiser_id].replace_one(
-                            { '$and': [ { key: item.get(key) }, { '_path': request.url.path }, ] },
-                            item,
-                            upsert=True,
-                        )
-            elif items:  # `items` is actually a single dict, not a list at this point
-                items = cache_utility.stringify_id(items, request.url.path)
-                
-                items['_path'] = request.url.path
-                database[advertiser_id].replace_one(
-                    { '$and': [ { key: items.get(key) }, { '_path': request.url.path }, ] },
-                    items,
-                    upsert=True,
-                )
-            
-            return value
+            return await flight()
         
         return inner
     
@@ -497,6 +576,48 @@ def redis_cache(key_builder: Callable = None, is_json: bool = True, is_many: boo
     return wrapper
 
 
+async def cache_all(advertiser_id, path, items, is_dsp=False):
+    """Caches entities requested outside of `docdb_cache`, e.g., after an update.
+
+    Entities are written as `docdb_cache` writes a list response for `path`,
+    so they replace the entities that a GET of `path` cached.
+
+    Args:
+        advertiser_id: Name of the collection
+        path: Cache key of the entities, e.g., '/api/v1/amazon/aa/sp/campaigns'
+        items: List of Amazon Advertising models
+        is_dsp: Whether the models are from Amazon's DSP API
+
+    Returns:
+        pymongo `BulkWriteResult`, or None if nothing was written yet
+    """
+    if not items:
+        return None
+
+    # Models are updated with their `_path`, so each path caches copies
+    items = copy.deepcopy(items)
+    if not is_dsp:
+        items = cache_utility.stringify_ids(items, path)
+
+    database = AWSService().docdb_service.motor_client.amazon
+
+    return await _replace_all(
+        database[advertiser_id],
+        _replacements(items, path, is_dsp),
+    )
+
+
+def _count(items):
+    # Number of entities in a response: DSP lists them under `response`
+    if isinstance(items, dict):
+        items = items.get('response', [items])
+
+    if isinstance(items, list):
+        return len(items)
+
+    return 0
+
+
 def _key(path):
     if 'ad_groups' in path:
         return 'adGroupId'
@@ -520,3 +641,53 @@ def _key(path):
         return 'creativeId'
     elif 'line_item_creative_association' in path:
         return ['lineItemId', 'creativeId']
+
+
+def _replacements(items, path, is_dsp=False):
+    key = _key(path)
+
+    replacements = []
+    for item in items:
+        item.update({'_path': path})
+        # DSP line item creative associations are identified by two IDs
+        if isinstance(key, list):
+            query = { key[0]: str(item.get(key[0])), key[1]: str(item.get(key[1])) }
+        elif is_dsp:
+            query = { key: str(item.get(key)) }
+        else:
+            query = { key: item.get(key) }
+
+        replacements.append((
+            { '$and': [ query, { '_path': path }, ] },
+            item,
+        ))
+
+    return replacements
+
+
+async def _replace_all(collection, replacements):
+    """Writes the items whose content changed in one round trip.
+
+    Within a `PipelineService`, e.g., in the `cache` CLI, the operations are
+    queued for the pipeline's writers instead.
+
+    Returns:
+        pymongo `BulkWriteResult`, or None if nothing was written yet
+    """
+    if not replacements:
+        return None
+
+    operations = cache_utility.operations(
+        replacements,
+        PipelineService.generation(),
+    )
+
+    pipeline = PipelineService.current()
+    if pipeline:
+        await pipeline.put(collection, operations)
+        return None
+
+    return await collection.bulk_write(
+        operations,
+        ordered=False,
+    )
@@ -5,6 +5,9 @@ specific to `server`.
 """
 
 
+from server.managers.access_token_manager import AccessTokenManager
+
+
 class AADelegate:
     """Provides configuration data to amazon-api client.
 
@@ -35,8 +38,10 @@ class AADelegate:
 
     @property
     def access_token(self):
-        """Advertiser's API access token"""
-        return self._shared_ssm_service.amazon_aa_access_token
+        """Advertiser's API access token, shared by every delegate"""
+        return AccessTokenManager().access_token(
+            self._shared_ssm_service,
+        )
 
     @property
     def api(self):
@@ -1,87 +1,93 @@
 from typing import (
     Any,
-    Optional,
 )
 
 import logging
 import os
 import sys
 
-from bson.objectid import ObjectId
 from fastapi import (
     Request,
     Response,
 )
 from fastapi.params import Depends
 from fastapi.security import SecurityScopes
+from motor.motor_asyncio import AsyncIOMotorClient
 from starlette.exceptions import HTTPException
 from starlette.status import HTTP_403_FORBIDDEN
 
-import pymongo
-
-from amazon_api.resources.aa.client import Client
-
 from server.core.constants import Constants
-from server.delegates.aa_delegate import AADelegate
+from server.managers.access_token_manager import AccessTokenManager
 from server.managers.brand_manager import BrandManager
-from server.resources.models.brand import Brand
-from server.resources.models.user import User
+from server.managers.client_manager import ClientManager
+from server.managers.context_manager import (
+    ContextManager,
+    RequestContext,
+)
+from server.managers.executor_manager import ExecutorManager
+from server.managers.rate_limit_manager import RateLimitManager
 from server.resources.schema.token import Token
 from server.resources.types.data_types import ScopeType
 from server.services.auth_service import AuthService
 from server.services.aws_service import AWSService
 from server.services.data_service import DataService
 from server.services.insight_service import InsightService
+from server.services.sync_report_service import SyncReportService
 from server.services.twilio_service import TwilioService
-from server.utilities.aa_utility import AAUtility
 from server.utilities.auth_utility import AuthUtility
+from server.utilities.list_utility import partition_list
 from server.utilities.token_utility import Bearer
 
 
 aws_service = AWSService()
 bearer = Bearer()
+executor_manager = ExecutorManager()
+rate_limit_manager = RateLimitManager()
 log = aws_service.log_service
 log.handler = logging.StreamHandler(
     sys.stdout,
 )
 
 
+def async_docdb():
+    return aws_service.docdb_service.motor_client
+
+
 def docdb():
     return aws_service.docdb_service.client
 
 
-async def user(
+async def context(
     credentials: Token = Depends(
         bearer,
     ),
-    client: pymongo.MongoClient = Depends(
-        docdb,
+    client: AsyncIOMotorClient = Depends(
+        async_docdb,
     ),
 ):
-    return User.find_by_id(
-        ObjectId(credentials.claims.id),
+    return await ContextManager().context(
+        credentials,
         client,
     )
 
 
-async def brand(
-    client: pymongo.MongoClient = Depends(
-        docdb,
-    ),
-    credentials: Token = Depends(
-        bearer,
+async def user(
+    context: RequestContext = Depends(
+        context,
     ),
 ):
-    brand_id = credentials.claims.brand
-    brand = Brand.find_by_id(
-        ObjectId(brand_id),
-        client,
-    )
+    return context.user
 
+
+async def brand(
+    context: RequestContext = Depends(
+        context,
+    ),
+):
     brand_manager = BrandManager()
-    brand_manager.brand = brand
+    brand_manager.brand = context.brand
     
-    return brand
+    return context.brand
 
 
 async def advertising_data():
@@ -92,12 +98,11 @@ async def advertising_data():
 
 
 async def admin(
-    credentials: Token = Depends(
-        bearer,
+    context: RequestContext = Depends(
+        context,
     ),
 ):
-    user_scopes = credentials.claims.scopes
-    if ScopeType.ADMIN not in user_scopes:
+    if ScopeType.ADMIN not in context.scopes:
         raise HTTPException(
             HTTP_403_FORBIDDEN,
             detail=Constants.USER_FORBIDDEN,
@@ -134,81 +139,38 @@ async def auth_service(
 # Amazon
 
 def dsp_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
-        Constants.DSP,
-    )
-    aa_delegate = AADelegate(
+
+    return ClientManager().client(
         Constants.DSP,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
+        brand_manager.brand.amazon.aa.region,
     )
 
-    return Client(aa_delegate)
-
 
 def portfolios_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
+
+    return ClientManager().client(
         Constants.PORTFOLIOS,
+        brand_manager.brand.amazon.aa.region,
     )
-    aa_delegate = AADelegate(
-        Constants.PORTFOLIOS,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
-    )
-
-    return Client(aa_delegate)
 
 
 def profiles_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
-        Constants.PROFILES,
-    )
-    aa_delegate = AADelegate(
+
+    return ClientManager().client(
         Constants.PROFILES,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
+        brand_manager.brand.amazon.aa.region,
     )
 
-    return Client(aa_delegate)
-
 
 async def read(
-    credentials: Optional[Token] = Depends(
-        bearer,
+    context: RequestContext = Depends(
+        context,
     ),
 ):
-    user_scopes = credentials.claims.scopes
-    if ScopeType.READ not in user_scopes:
+    if ScopeType.READ not in context.scopes:
         raise HTTPException(
             HTTP_403_FORBIDDEN,
             detail=Constants.USER_FORBIDDEN,
@@ -225,81 +187,38 @@ def retail_data():
 
 
 def sb_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
-        Constants.SPONSORED_BRANDS,
-    )
-    aa_delegate = AADelegate(
+
+    return ClientManager().client(
         Constants.SPONSORED_BRANDS,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
+        brand_manager.brand.amazon.aa.region,
     )
 
-    return Client(aa_delegate)
-
 
 def sd_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
+
+    return ClientManager().client(
         Constants.SPONSORED_DISPLAY,
+        brand_manager.brand.amazon.aa.region,
     )
-    aa_delegate = AADelegate(
-        Constants.SPONSORED_DISPLAY,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
-    )
-
-    return Client(aa_delegate)
 
 
 def sp_client():
-    aa_utility = AAUtility()
     brand_manager = BrandManager()
-    
-    ssm_service = aws_service.ssm_service
-    shared_ssm_service = aws_service.shared_ssm_service
-    
-    region = brand_manager.brand.amazon.aa.region
-    
-    version = aa_utility.version_for_api(
-        Constants.SPONSORED_PRODUCTS,
-    )
-    aa_delegate = AADelegate(
+
+    return ClientManager().client(
         Constants.SPONSORED_PRODUCTS,
-        region,
-        version,
-        ssm_service,
-        shared_ssm_service,
+        brand_manager.brand.amazon.aa.region,
     )
 
-    return Client(aa_delegate)
-
 
 async def write(
-    credentials: Token = Depends(
-        bearer,
+    context: RequestContext = Depends(
+        context,
     ),
 ):
-    user_scopes = credentials.claims.scopes
-    if ScopeType.WRITE not in user_scopes:
+    if ScopeType.WRITE not in context.scopes:
         raise HTTPException(
             HTTP_403_FORBIDDEN,
             detail=Constants.USER_FORBIDDEN,
@@ -309,83 +228,203 @@ async def write(
 
 
 class Interface:
+    """Requests an Amazon Advertising API interface on behalf of an advertiser.
+
+    Routers share one `Interface` across requests, so the advertiser is
+    passed to every call and a new `klass` instance is created per call
+    rather than stored on `Interface`. amazon-api blocks while it requests
+    Amazon, so each request runs in `ExecutorManager`'s Amazon pool, paced
+    (and retried after 429s) by the advertiser's `RateLimitManager` bucket.
+    """
     
     from server.decorators.cache_decorator import docdb_cache
 
     def __init__(self, client, klass):
-        self._advertiser_id = None
         self._client = client
         self._klass = klass
 
-        self._interface = None
-
     def __call__(self):
         return self
 
     @docdb_cache()
     async def index(self, advertiser_id: str, request: Request = None, response: Response = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.index(**request.query_params)
+        return await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).index,
+            **request.query_params,
+        )
 
     @docdb_cache()
     async def index_creative_association(self, advertiser_id: str, request: Request = None, response: Response = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.index_creative_association(**request.query_params)
+        return await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).index_creative_association,
+            **request.query_params,
+        )
 
     async def create(self, advertiser_id: str, data, request: Request = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.create(
+        response = await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).create,
             data,
             **request.query_params,
-        ).json()
+        )
+
+        return response.json()
 
     async def index_create(self, advertiser_id: str, data: dict, request: Request = None, response: Response = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.index_create(
+        response = await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).index_create,
             data=data,
             **request.query_params,
-        ).json()
+        )
+
+        return response.json()
 
     async def register_brand(self, brand_name):
-        return self.interface.register_brand(brand_name)
+        return await self._request(
+            None,
+            self.interface().register_brand,
+            brand_name,
+        )
 
     @docdb_cache(is_many=False)
     async def show(self, advertiser_id: str, key, request: Request = None, response: Response = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.show(
+        response = await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).show,
             key,
-        ).json()
+        )
+
+        return response.json()
+
+    async def refresh(self, advertiser_id: str, id_filter: str, ids, paths, dsp_advertiser_id: str = None, **params):
+        """Re-caches entities after an update, e.g., of their bids.
+
+        Entities are requested with one list call per
+        `Constants.REFRESH_BATCH_SIZE` IDs, filtered by `id_filter`, instead of
+        one `show` per entity, and are cached once for every path in `paths`.
+
+        Args:
+            advertiser_id: Amazon profile or DSP entity ID
+            id_filter: Name of the list's ID filter, e.g., 'campaignIdFilter'
+            ids: IDs of the updated entities
+            paths: Cache keys of the entities, e.g., ['/api/v1/amazon/aa/sp/campaigns']
+            dsp_advertiser_id: Name of the collection of DSP entities, if not
+                `advertiser_id`
+            params: Other query parameters of the list, e.g., `count`
+
+        Returns:
+            List of the updated entities
+        """
+        from server.decorators.cache_decorator import cache_all
+
+        ids = [str(id) for id in ids if id is not None]
+
+        items, is_dsp = [], False
+        for partition in partition_list(ids, Constants.REFRESH_BATCH_SIZE):
+            response = await self._request(
+                advertiser_id,
+                self.interface(advertiser_id).index,
+                **{
+                    id_filter: Constants.COMMA.join(partition),
+                    **params,
+                },
+            )
+            response = response.json()
+
+            # DSP lists entities under `response`
+            if isinstance(response, dict):
+                is_dsp = True
+                response = response.get('response', [])
+
+            items.extend(response)
+
+        for path in paths:
+            await cache_all(
+                dsp_advertiser_id or advertiser_id,
+                path,
+                items,
+                is_dsp,
+            )
+
+        return items
 
     async def update(self, advertiser_id: str, data, request: Request = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.update(
+        response = await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).update,
             data,
             **request.query_params,
-        ).json()
+        )
+
+        return response.json()
 
     async def destroy(self, advertiser_id: str, key, request: Request = None):
-        self._advertiser_id = advertiser_id
-        return self.interface.destroy(
+        response = await self._request(
+            advertiser_id,
+            self.interface(advertiser_id).destroy,
             key,
             **request.query_params,
-        ).json()
+        )
+
+        return response.json()
 
-    @property
-    def interface(self):
+    def interface(self, advertiser_id: str = None):
         #
         # Use `callable` to identify if client is a callable.
         #
         # Necessary to support test clients that are not callables.
         #
         if callable(self._client):
-            self._interface = self._klass(
+            return self._klass(
                 self._client(),
-                self._advertiser_id,
+                advertiser_id,
             )
-        else:
-            self._interface = self._klass(
-                self._client,
-                self._advertiser_id,
+
+        return self._klass(
+            self._client,
+            advertiser_id,
+        )
+
+    async def _request(self, advertiser_id, func, *args, **kwargs):
+        # Limits are shared by every interface of the same class, e.g.,
+        # campaigns of Sponsored Products, for the same profile. Classes of
+        # different APIs share names, e.g., `Campaign`, so their module
+        # tells them apart.
+        for attempt in range(2):
+            response = await rate_limit_manager.request(
+                advertiser_id,
+                f'{self._klass.__module__}.{self._klass.__qualname__}',
+                executor_manager.aa,
+                func,
+                *args,
+                on_throttle=SyncReportService.throttled,
+                **kwargs,
             )
-        
-        return self._interface
+
+            # The access token's expiry is estimated, so a token rotated
+            # early is read again and the request retried once
+            if getattr(response, 'status_code', None) != Constants.UNAUTHORIZED_STATUS_CODE:
+                break
+
+            log.info('Access token was rejected, reading it again...')
+            if not AccessTokenManager().invalidate(_access_token(response)):
+                # The token was read too recently to have been rotated since
+                break
+
+        return response
+
+
+def _access_token(response):
+    # amazon-api sends the access token as a bearer token
+    request = getattr(response, 'request', None)
+    if request is None:
+        return None
+
+    authorization = request.headers.get(Constants.AUTHORIZATION, Constants.EMPTY_STRING)
+    if not authorization.startswith(f'{Constants.BEARER} '):
+        return None
+
+    return authorization[len(Constants.BEARER) + 1:]
@@ -32,9 +32,13 @@ else:
 
 
 def application():
+    # Every parameter is loaded in one pass as the application starts,
+    # rather than on the first access of each
     ssm_service = AWSService().ssm_service
+    ssm_service.load()
+
     application = FastAPI(
-        debug=True,
+        debug=settings.DEBUG,
         title=Constants.APPLICATION_TITLE,
         version='1.0.0',
     )
@@ -59,15 +63,15 @@ def application():
 app = application()
 
 
+# Serves a single process for local development. Production serves the
+# application with gunicorn (see server/core/gunicorn_config.py).
 if __name__ == '__main__':
     import uvicorn
 
-    reload=True
-
     uvicorn.run(
         'server.main:app',
-        host='0.0.0.0',
-        port=8080,
-        reload=reload,
-        debug=True,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        reload=settings.DEBUG,
+        debug=settings.DEBUG,
     )
@@ -0,0 +1,142 @@
+"""Caches the Amazon Advertising API access token for `server`."""
+
+
+from datetime import timezone
+
+import threading
+import time
+
+from server.core.constants import Constants
+from server.decorators.singleton_decorator import singleton
+from server.services.aws_service import AWSService
+
+
+log = AWSService().log_service
+
+
+@singleton
+class AccessTokenManager:
+    """Provides a singleton cache of the Amazon Advertising API access token.
+
+    The access token is refreshed outside of `server` and stored in the
+    shared SSM Parameter Store, from which every `AADelegate` reads it. The
+    token is valid for `Constants.AMAZON_AA_ACCESS_TOKEN_LIFETIME` seconds
+    after its parameter was last modified, so it is cached until
+    `Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_MARGIN` seconds before then.
+    Within the margin the cached token is returned while a background
+    thread reads the parameter again. Concurrent refreshes are coalesced
+    into one request to SSM.
+    """
+
+    def __init__(self):
+        self._access_token = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+        self._refresh_at = 0
+        self._refreshed_at = 0
+        self._refreshing = False
+
+    def access_token(self, shared_ssm_service):
+        """Finds the access token.
+
+        Args:
+            shared_ssm_service: Instance of AWSService.SharedSSMService
+
+        Returns:
+            Access token
+        """
+        now = time.time()
+
+        if self._access_token is None or self._expires_at <= now:
+            with self._lock:
+                # Another thread may have refreshed while this one waited
+                if self._access_token is None or self._expires_at <= time.time():
+                    self._refresh(shared_ssm_service)
+        elif self._refresh_at <= now:
+            self._refresh_in_background(shared_ssm_service)
+
+        return self._access_token
+
+    def invalidate(self, access_token=None):
+        """Forgets the access token, e.g., after Amazon rejects it.
+
+        A token that was already replaced, e.g., after a concurrent
+        rejection, is not read again. A token read within the last
+        `Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL` seconds is kept,
+        as SSM would return the same token.
+
+        Args:
+            access_token: Rejected access token, if known
+
+        Returns:
+            Whether a request with `access_token` can be retried with another
+            token
+        """
+        with self._lock:
+            if access_token is not None and access_token != self._access_token:
+                return True
+
+            if time.time() - self._refreshed_at < Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL:
+                return False
+
+            self._access_token = None
+            self._expires_at = 0
+            self._refresh_at = 0
+
+            return True
+
+    def _refresh(self, shared_ssm_service):
+        parameter = shared_ssm_service.parameter(
+            Constants.AMAZON_AA_ACCESS_TOKEN_PARAMETER,
+        )
+
+        modified_at = parameter.get('LastModifiedDate')
+        if modified_at is None:
+            expires_at = time.time() + Constants.AMAZON_AA_ACCESS_TOKEN_LIFETIME
+        else:
+            if modified_at.tzinfo is None:
+                modified_at = modified_at.replace(tzinfo=timezone.utc)
+
+            expires_at = modified_at.timestamp() + Constants.AMAZON_AA_ACCESS_TOKEN_LIFETIME
+
+        # A token that should have been rotated already is still used, but
+        # is read again after a short interval
+        expires_at = max(
+            expires_at,
+            time.time() + Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL,
+        )
+
+        self._access_token = parameter.get(Constants.VALUE_KEY)
+        self._expires_at = expires_at
+        self._refreshed_at = time.time()
+        # The token may not have been rotated yet, in which case it is read
+        # again after a short interval rather than on every access
+        self._refresh_at = max(
+            expires_at - Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_MARGIN,
+            time.time() + Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL,
+        )
+
+    def _refresh_in_background(self, shared_ssm_service):
+        if self._refreshing:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+
+            self._refreshing = True
+
+        def refresh():
+            try:
+                with self._lock:
+                    self._refresh(shared_ssm_service)
+            except Exception as e:
+                # The cached token is used until it expires
+                log.exception(e)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(
+            target=refresh,
+            daemon=True,
+        ).start()
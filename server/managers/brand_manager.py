@@ -1,9 +1,16 @@
 """Stores brand metadata for `server`."""
 
 
+from contextvars import ContextVar
+
 from server.decorators.singleton_decorator import singleton
 
 
+# Each request runs in its own context, so concurrent requests for
+# different brands never see each other's brand
+_brand = ContextVar('brand', default=None)
+
+
 @singleton
 class BrandManager:
     """Provides a singleton resource for `brand`.
@@ -11,16 +18,16 @@ class BrandManager:
     BrandManager is equivalent to the `brand` dependency that is available
     to FastAPI requests, however, BrandManager is available outside of requests
     and enables metadata to be used when defining API clients, e.g., sd_client.
-    """
 
-    def __init__(self):
-        self._brand = None
+    The brand is stored in a context variable and is therefore scoped to the
+    request (or task) that set it, although BrandManager itself is shared.
+    """
 
     @property
     def brand(self):
         """Brand object from DocumentDB."""
-        return self._brand
+        return _brand.get()
 
     @brand.setter
     def brand(self, value):
-        self._brand = value
+        _brand.set(value)
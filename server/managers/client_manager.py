@@ -0,0 +1,68 @@
+"""Stores amazon-api clients for `server`."""
+
+
+import threading
+
+from amazon_api.resources.aa.client import Client
+
+from server.decorators.singleton_decorator import singleton
+from server.delegates.aa_delegate import AADelegate
+from server.services.aws_service import AWSService
+from server.utilities.aa_utility import AAUtility
+
+
+@singleton
+class ClientManager:
+    """Provides a singleton cache of amazon-api clients.
+
+    A client is created once per `(api, region, version)` and shared by
+    every caller in the process. Clients read parameters from
+    `AWSService.SSMService` and the access token through
+    `AWSService.SharedSSMService`, whose assumed-role credentials refresh
+    themselves (see `AWSService.STSService.refreshable_session`), so a
+    cached client never needs to assume a role again.
+
+    Clients are shared, but their HTTP connections are not pooled here:
+    amazon-api's `Client` opens its own connections and does not accept a
+    `requests.Session`, so keep-alive has to be added to amazon-api.
+    """
+
+    def __init__(self):
+        self._aa_utility = AAUtility()
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, api, region, version=None):
+        """Finds or creates the client of an Amazon Advertising API.
+
+        Args:
+            api: Amazon Advertising API, e.g., 'dsp', 'sp' or 'profiles'
+            region: Advertiser region. One of 'na', 'eu', or 'fe'
+            version: API version. Defaults to the version `server` uses for `api`
+
+        Returns:
+            amazon-api `Client`
+        """
+        if version is None:
+            version = self._aa_utility.version_for_api(
+                api,
+            )
+
+        key = (api, region, version)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                aws_service = AWSService()
+                aa_delegate = AADelegate(
+                    api,
+                    region,
+                    version,
+                    aws_service.ssm_service,
+                    aws_service.shared_ssm_service,
+                )
+
+                client = Client(aa_delegate)
+                self._clients[key] = client
+
+            return client
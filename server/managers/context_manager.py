@@ -0,0 +1,89 @@
+"""Caches the brand and user behind each request for `server`."""
+
+
+from collections import OrderedDict
+
+import threading
+import time
+
+from bson.objectid import ObjectId
+
+from server.core.constants import Constants
+from server.decorators.singleton_decorator import singleton
+
+
+class RequestContext:
+    """Verified claims, brand and user of an authenticated request."""
+
+    def __init__(self, claims, brand, user):
+        self.claims = claims
+        self.brand = brand
+        self.user = user
+
+    @property
+    def scopes(self):
+        return self.claims.scopes
+
+
+@singleton
+class ContextManager:
+    """Provides a singleton cache of the brand and user of a token.
+
+    Requests with the same token need the same brand and user documents,
+    which are read from DocumentDB with two concurrent queries and cached
+    for `Constants.REQUEST_CONTEXT_TTL` seconds. The least recently used entry
+    is evicted once `Constants.REQUEST_CONTEXT_MAX_SIZE` entries are cached.
+    """
+
+    def __init__(self):
+        self._contexts = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def context(self, token, client):
+        """Resolves the context of a verified token.
+
+        Args:
+            token: `Token` whose signature has been verified
+            client: Motor client provided from AWSService.DocumentDBService
+
+        Returns:
+            RequestContext
+        """
+        key = (token.claims.brand, token.claims.id)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._contexts.get(key)
+            if cached and cached[0] > now:
+                self._contexts.move_to_end(key)
+                brand, user = cached[1]
+
+                return RequestContext(token.claims, brand, user)
+
+        # Imported here, because brands invalidate their contexts
+        from server.resources.models.aio.brand import Brand
+
+        brand, user = await Brand.find_by_id_with_user(
+            ObjectId(token.claims.brand),
+            ObjectId(token.claims.id),
+            client,
+        )
+
+        with self._lock:
+            self._contexts[key] = (now + Constants.REQUEST_CONTEXT_TTL, (brand, user))
+            self._contexts.move_to_end(key)
+
+            while len(self._contexts) > Constants.REQUEST_CONTEXT_MAX_SIZE:
+                self._contexts.popitem(last=False)
+
+        return RequestContext(token.claims, brand, user)
+
+    def invalidate(self, brand_id=None):
+        """Forgets the contexts of a brand, or of every brand if None."""
+        with self._lock:
+            if brand_id is None:
+                self._contexts.clear()
+                return
+
+            for key in [key for key in self._contexts if key[0] == str(brand_id)]:
+                self._contexts.pop(key)
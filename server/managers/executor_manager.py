@@ -0,0 +1,123 @@
+"""Runs blocking calls to Amazon, DocumentDB and Elasticsearch for `server`."""
+
+
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+import contextvars
+import functools
+import threading
+
+from server.core import settings
+from server.decorators.singleton_decorator import singleton
+from server.resources.types.data_types import BackendType
+
+
+@singleton
+class ExecutorManager:
+    """Provides a singleton thread pool per backend.
+
+    amazon-api, pymongo and elasticsearch-py block the calling thread, so
+    async endpoints that call them directly stall the event loop, and every
+    other request of the worker with it. `run` executes such calls in a bounded
+    thread pool of the backend instead, e.g.,
+
+        data = await ExecutorManager().run(BackendType.ES, source.sa_model, ...)
+
+    Pools are sized by `settings.AMAZON_AA_THREADS`, `settings.DOCDB_THREADS`
+    and `settings.ES_THREADS`.
+    Calls beyond a pool's size wait in its queue, whose depth is reported by
+    `metrics`. Calls run in a copy of the caller's context, so context
+    variables such as `BrandManager.brand` are visible to them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executors = {
+            BackendType.AA: ThreadPoolExecutor(
+                max_workers=settings.AMAZON_AA_THREADS,
+                thread_name_prefix=BackendType.AA.value,
+            ),
+            BackendType.DOCDB: ThreadPoolExecutor(
+                max_workers=settings.DOCDB_THREADS,
+                thread_name_prefix=BackendType.DOCDB.value,
+            ),
+            BackendType.ES: ThreadPoolExecutor(
+                max_workers=settings.ES_THREADS,
+                thread_name_prefix=BackendType.ES.value,
+            ),
+        }
+        self._metrics = {
+            backend: {
+                'active': 0,
+                'completed': 0,
+                'max_workers': executor._max_workers,
+                'queued': 0,
+            }
+            for backend, executor in self._executors.items()
+        }
+
+    async def aa(self, func, *args, **kwargs):
+        """Runs a blocking Amazon Advertising API call in the Amazon pool."""
+        return await self.run(BackendType.AA, func, *args, **kwargs)
+
+    async def docdb(self, func, *args, **kwargs):
+        """Runs a blocking DocumentDB call in the DocumentDB pool."""
+        return await self.run(BackendType.DOCDB, func, *args, **kwargs)
+
+    async def es(self, func, *args, **kwargs):
+        """Runs a blocking Elasticsearch call in the Elasticsearch pool."""
+        return await self.run(BackendType.ES, func, *args, **kwargs)
+
+    def metrics(self):
+        """Reports the size, active calls and queue depth of each pool."""
+        with self._lock:
+            return {
+                backend.value: dict(metrics)
+                for backend, metrics in self._metrics.items()
+            }
+
+    async def run(self, backend, func, *args, **kwargs):
+        """Runs a blocking call in the thread pool of `backend`.
+
+        Args:
+            backend: BackendType
+            func: Blocking callable
+            args: Positional arguments of `func`
+            kwargs: Keyword arguments of `func`
+
+        Returns:
+            Return value of `func`
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(
+            context.run,
+            self._measure,
+            backend,
+            func,
+            *args,
+            **kwargs,
+        )
+
+        self._count(backend, queued=1)
+
+        future = self._executors[backend].submit(call)
+        future.add_done_callback(
+            # A call cancelled while queued never starts
+            lambda future: future.cancelled() and self._count(backend, queued=-1),
+        )
+
+        return await asyncio.wrap_future(future)
+
+    def _count(self, backend, **counts):
+        with self._lock:
+            metrics = self._metrics[backend]
+            for name, count in counts.items():
+                metrics[name] += count
+
+    def _measure(self, backend, func, *args, **kwargs):
+        self._count(backend, active=1, queued=-1)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._count(backend, active=-1, completed=1)
@@ -0,0 +1,52 @@
+"""Coalesces identical concurrent requests to the Amazon Advertising API."""
+
+
+import asyncio
+import copy
+
+from server.decorators.singleton_decorator import singleton
+
+
+@singleton
+class FlightManager:
+    """Runs one request per key at a time and shares its result.
+
+    The first caller of a key starts the request. Callers of the same key
+    that arrive before it finishes wait for that request instead of starting
+    their own, and receive a copy of its result (or its exception). A key is
+    forgotten as soon as its request finishes, so results are never reused
+    afterwards; serving finished requests is left to the cache.
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+        self.coalesced = 0
+        self.requests = 0
+
+    async def run(self, key, func, *args, **kwargs):
+        """Awaits `func(*args, **kwargs)`, or the request of `key` in flight.
+
+        Args:
+            key: Hashable identifier of the request, e.g., its advertiser, path
+                and query parameters
+            func: Coroutine function that makes the request
+
+        Returns:
+            Result of the request
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+
+            # Callers may modify their result, so each one receives a copy
+            return copy.deepcopy(await asyncio.shield(flight))
+
+        flight = asyncio.ensure_future(func(*args, **kwargs))
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        self._flights[key] = flight
+        self.requests += 1
+
+        # A cancelled caller, e.g., of a closed connection, does not cancel
+        # the request that other callers wait for
+        return await asyncio.shield(flight)
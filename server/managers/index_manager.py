@@ -0,0 +1,68 @@
+"""Tracks the monthly indices behind each advertiser's alias."""
+
+
+import threading
+import time
+
+from elasticsearch.exceptions import NotFoundError
+
+from server.core.constants import Constants
+from server.decorators.singleton_decorator import singleton
+
+
+@singleton
+class IndexManager:
+    """Provides a singleton cache of the indices behind an alias.
+
+    Advertisers migrated to monthly indices (see `visibly data partition`)
+    query an alias, e.g., `sa_1110250468092771`, whose member indices change
+    only when a new month is created. Members are cached for
+    `Constants.MONTHLY_INDEX_PARTITIONS_TTL` seconds so that `DataService`
+    can name only the months a query needs without asking Elasticsearch
+    each time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._partitions = {}
+
+    def invalidate(self, alias=None):
+        """Forgets the members of `alias`, or of every alias if None."""
+        with self._lock:
+            if alias is None:
+                self._partitions.clear()
+            else:
+                self._partitions.pop(alias, None)
+
+    def partitions(self, client, alias):
+        """Names the indices behind `alias`.
+
+        Args:
+            client: Elasticsearch client
+            alias: Alias, or the name of an unmigrated (single) index
+
+        Returns:
+            Set of index names, which is empty if `alias` is not an alias
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._partitions.get(alias)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        try:
+            response = client.indices.get_alias(
+                name=alias,
+            )
+            partitions = set(response.keys())
+        except NotFoundError:
+            partitions = set()
+
+        with self._lock:
+            self._partitions[alias] = (
+                now + Constants.MONTHLY_INDEX_PARTITIONS_TTL,
+                partitions,
+            )
+
+        return partitions
@@ -0,0 +1,209 @@
+"""Rate limits requests to the Amazon Advertising API for `server`."""
+
+
+import asyncio
+import threading
+import time
+
+from server.core.constants import Constants
+from server.decorators.singleton_decorator import singleton
+from server.services.aws_service import AWSService
+from server.utilities.retry_utility import backoff
+
+
+log = AWSService().log_service
+
+
+class TokenBucket:
+    """Paces requests of one profile to one family of endpoints.
+
+    Tokens accrue at `rate` per second up to `burst`. Each request takes a
+    token, waiting until one is available. A 429 halves the rate (down to
+    `min_rate`) and pauses the bucket, after which every successful request
+    raises the rate again by a fraction of `max_rate`, so the bucket settles
+    just below the limit Amazon enforces.
+    """
+
+    def __init__(
+        self,
+        rate=Constants.RATE_LIMIT_RATE,
+        burst=Constants.RATE_LIMIT_BURST,
+        min_rate=Constants.RATE_LIMIT_MIN_RATE,
+        recovery=Constants.RATE_LIMIT_RECOVERY,
+    ):
+        self._burst = burst
+        self._lock = threading.Lock()
+        self._max_rate = rate
+        self._min_rate = min_rate
+        self._paused_until = 0
+        self._recovery = recovery
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+        self.rate = rate
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0
+
+    def reserve(self):
+        """Takes a token.
+
+        Returns:
+            Seconds to wait before the request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst,
+                self._tokens + (now - self._updated_at) * self.rate,
+            )
+            self._updated_at = now
+            # Tokens may go negative, which queues requests behind each other
+            self._tokens -= 1
+
+            delay = max(
+                -self._tokens / self.rate,
+                self._paused_until - now,
+                0,
+            )
+            self.requests += 1
+            self.waited += delay
+
+            return delay
+
+    def succeed(self):
+        with self._lock:
+            self.rate = min(
+                self._max_rate,
+                self.rate + self._max_rate * self._recovery,
+            )
+
+    def throttle(self, delay):
+        """Slows the bucket down after a 429.
+
+        Args:
+            delay: Seconds to pause the bucket, e.g., from `Retry-After`
+        """
+        with self._lock:
+            self.rate = max(self._min_rate, self.rate / 2)
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + delay,
+            )
+            self._tokens = min(self._tokens, 0)
+            self.throttled += 1
+
+    def to_dict(self):
+        return {
+            'rate': round(self.rate, 2),
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'waited': round(self.waited, 1),
+        }
+
+
+@singleton
+class RateLimitManager:
+    """Provides a singleton token bucket per profile and endpoint family.
+
+    Amazon limits requests per profile (or DSP entity) and per endpoint, so
+    every caller of the same endpoints with the same profile, e.g., the
+    `cache` CLI's fetchers and routers through `Interface`, shares one
+    `TokenBucket`. Requests are retried after a 429, waiting for
+    `Retry-After` seconds or, without the header, an exponential backoff
+    with full jitter. Waiting never blocks the event loop.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, profile, family):
+        """Finds or creates the bucket of `(profile, family)`.
+
+        Args:
+            profile: Amazon profile or DSP entity ID, or None for unscoped
+                endpoints, e.g., profiles
+            family: Family of endpoints with a common limit, e.g., the
+                amazon-api interface class
+
+        Returns:
+            TokenBucket
+        """
+        key = (profile, family)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket()
+                self._buckets[key] = bucket
+
+            return bucket
+
+    def metrics(self):
+        """Reports the rate, requests, 429s and seconds waited per bucket."""
+        with self._lock:
+            buckets = list(self._buckets.items())
+
+        return {
+            f'{profile}/{family}': bucket.to_dict()
+            for (profile, family), bucket in buckets
+        }
+
+    async def request(self, profile, family, func, *args, on_throttle=None, **kwargs):
+        """Awaits a request once the bucket allows it, retrying 429s.
+
+        Args:
+            profile: Amazon profile or DSP entity ID
+            family: Family of endpoints with a common limit
+            func: Coroutine function returning a `requests.Response`
+            args: Positional arguments of `func`
+            on_throttle: Function called with the seconds waited after
+                each 429, e.g., to report them
+            kwargs: Keyword arguments of `func`
+
+        Returns:
+            Response of `func`. The last 429 is returned once
+            `Constants.RATE_LIMIT_MAX_RETRIES` retries are exhausted.
+        """
+        bucket = self.bucket(profile, family)
+
+        for attempt in range(Constants.RATE_LIMIT_MAX_RETRIES + 1):
+            delay = bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+
+            response = await func(*args, **kwargs)
+
+            if getattr(response, 'status_code', None) != Constants.TOO_MANY_REQUESTS_STATUS_CODE:
+                bucket.succeed()
+                return response
+
+            delay = _retry_after(response)
+            if delay is None:
+                delay = backoff(
+                    attempt,
+                    Constants.RATE_LIMIT_INITIAL_BACKOFF,
+                    Constants.RATE_LIMIT_MAX_BACKOFF,
+                )
+
+            bucket.throttle(delay)
+            if on_throttle:
+                on_throttle(delay)
+
+            log.info(
+                f'Throttled {profile}/{family}, retrying after {round(delay, 1)} seconds...',
+            )
+
+        log.info(
+            f'Throttled {profile}/{family} after {Constants.RATE_LIMIT_MAX_RETRIES} retries',
+        )
+
+        return response
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers[Constants.RETRY_AFTER])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,112 @@
+"""Caches verified access tokens for `server`."""
+
+
+from collections import OrderedDict
+
+import hashlib
+import threading
+import time
+
+from server.core.constants import Constants
+from server.decorators.singleton_decorator import singleton
+
+
+@singleton
+class TokenManager:
+    """Provides a singleton cache of verified access tokens.
+
+    `Bearer` verifies an access token's signature and looks up the brands
+    of its user on every request. Both results hold until the token expires
+    or the user's brands change, so they are cached by a hash of the token
+    for at most `Constants.TOKEN_CACHE_TTL` seconds. The least recently used
+    token is evicted once `Constants.TOKEN_CACHE_MAX_SIZE` tokens are cached.
+
+    Callers that change which brands a user belongs to must call
+    `invalidate_user`. It only forgets the tokens cached by its own process,
+    so the TTL is kept as short as `Constants.REQUEST_CONTEXT_TTL`: a user
+    removed from a brand keeps access through other workers for at most
+    that long.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = OrderedDict()
+        self._user_keys = {}
+
+    def get(self, jwt_token):
+        """Finds a verified token.
+
+        Args:
+            jwt_token: Encoded access token
+
+        Returns:
+            A tuple of `Token` and the set of brand IDs of its user, or None
+            if the token is not cached or has expired
+        """
+        key = self._key(jwt_token)
+        now = time.time()
+
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is None:
+                return None
+
+            expires_at, token, brand_ids = cached
+            if expires_at <= now:
+                self._remove(key)
+                return None
+
+            self._tokens.move_to_end(key)
+
+            return token, brand_ids
+
+    def invalidate(self):
+        """Forgets every token."""
+        with self._lock:
+            self._tokens.clear()
+            self._user_keys.clear()
+
+    def invalidate_user(self, user_id):
+        """Forgets every token of a user, e.g., when their brands change."""
+        with self._lock:
+            for key in self._user_keys.pop(str(user_id), set()):
+                self._tokens.pop(key, None)
+
+    def set(self, jwt_token, token, brand_ids):
+        """Caches a verified token until it expires.
+
+        Args:
+            jwt_token: Encoded access token
+            token: `Token` whose signature has been verified
+            brand_ids: Set of IDs of the brands of the token's user
+
+        Returns:
+            None
+        """
+        key = self._key(jwt_token)
+        expires_at = time.time() + Constants.TOKEN_CACHE_TTL
+        if token.claims.exp:
+            expires_at = min(expires_at, token.claims.exp)
+
+        with self._lock:
+            self._remove(key)
+
+            self._tokens[key] = (expires_at, token, frozenset(brand_ids))
+            self._user_keys.setdefault(token.claims.id, set()).add(key)
+
+            while len(self._tokens) > Constants.TOKEN_CACHE_MAX_SIZE:
+                self._remove(next(iter(self._tokens)))
+
+    def _key(self, jwt_token):
+        return hashlib.sha256(jwt_token.encode(Constants.UTF8)).hexdigest()
+
+    def _remove(self, key):
+        cached = self._tokens.pop(key, None)
+        if cached is None:
+            return
+
+        user_keys = self._user_keys.get(cached[1].claims.id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                self._user_keys.pop(cached[1].claims.id)
@@ -0,0 +1,166 @@
+from bson.objectid import ObjectId
+
+import asyncio
+import pymongo
+
+from server.managers.context_manager import ContextManager
+from server.managers.token_manager import TokenManager
+from server.overrides.dict_override import Keypath
+from server.services.aws_service import AWSService
+
+
+log = AWSService().log_service
+
+
+class Brand():
+    """Asynchronous model class to an advertiser's brand.
+
+    Equivalent to `server.resources.models.brand.Brand`, but every method is
+    a coroutine that takes a Motor client, e.g., from the `async_docdb`
+    dependency.
+    """
+
+    @staticmethod
+    async def add_user(brand_id: ObjectId, user_id: ObjectId, client):
+        collection = client.visibly.brands
+        await collection.update_one(
+            { '_id': brand_id },
+            { '$addToSet': { 'users': user_id } },
+        )
+        ContextManager().invalidate(brand_id)
+        TokenManager().invalidate_user(user_id)
+        brand = await collection.find_one(
+            { '_id': brand_id }
+        )
+
+        return Keypath(brand)
+
+    @staticmethod
+    async def brand_ids_with_user(user_id: ObjectId, client):
+        collection = client.visibly.brands
+        brands = await collection.find(
+            { 'users': user_id },
+            { '_id': 1 },
+        ).to_list(None)
+
+        return { str(brand['_id']) for brand in brands }
+
+    @staticmethod
+    async def create(brand, client):
+        brand.update({
+            'dayparts': [],
+            'insights': [],
+            'reports': [],
+            'tags': [],
+            'users': [],
+        })
+        collection = client.visibly.brands
+        await collection.insert_one(
+            brand,
+        )
+
+    @staticmethod
+    async def create_many(brands, client):
+        for brand in brands:
+            brand.update({
+                'dayparts': [],
+                'insights': [],
+                'reports': [],
+                'tags': [],
+                'users': [],
+            })
+
+        collection = client.visibly.brands
+        try:
+            await collection.insert_many(
+                brands,
+            )
+        except pymongo.errors.OperationFailure as e:
+            log.exception(e)
+
+    @staticmethod
+    async def find_by_id(brand_id: ObjectId, client):
+        collection = client.visibly.brands
+        brand = await collection.find_one(
+            { '_id': brand_id },
+        )
+
+        if brand:
+            return Keypath(brand)
+
+        return None
+
+    @staticmethod
+    async def find_by_id_with_user(brand_id: ObjectId, user_id: ObjectId, client):
+        """Finds a brand and one of its users concurrently.
+
+        Returns:
+            A tuple of brand and user, either of which is None if not found.
+            The user is None if they are not a user of the brand.
+        """
+        brand, user = await asyncio.gather(
+            client.visibly.brands.find_one(
+                { '_id': brand_id },
+            ),
+            client.visibly.users.find_one(
+                { '_id': user_id },
+            ),
+        )
+
+        if not brand:
+            return None, None
+
+        if user and user_id not in brand.get('users', []):
+            user = None
+
+        return Keypath(brand), Keypath(user) if user else None
+
+    @staticmethod
+    async def find_by_name(name, client):
+        collection = client.visibly.brands
+        brand = await collection.find_one(
+            { 'name': name },
+        )
+
+        if brand:
+            return Keypath(brand)
+
+        return None
+
+    @staticmethod
+    async def find_by_id_and_user(brand_id: ObjectId, user_id: ObjectId, client):
+        collection = client.visibly.brands
+        brand = await collection.find_one(
+            {
+                '$and': [
+                    { '_id': brand_id },
+                    { 'users': user_id },
+                ],
+            }
+        )
+
+        if brand:
+            return Keypath(brand)
+
+        return None
+
+    @staticmethod
+    async def remove_user(brand_id: ObjectId, user_id: ObjectId, client):
+        collection = client.visibly.brands
+        await collection.update_one(
+            { '_id': brand_id },
+            {
+                '$pull': { 'users': user_id },
+            },
+        )
+        ContextManager().invalidate(brand_id)
+        TokenManager().invalidate_user(user_id)
+
+    @staticmethod
+    async def with_user(user_id: ObjectId, client):
+        collection = client.visibly.brands
+        brands = await collection.find(
+            { 'users': user_id },
+        ).to_list(None)
+
+        return [Keypath(brand) for brand in brands]
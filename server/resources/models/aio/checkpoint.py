@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from server.core.constants import Constants
+from server.overrides.dict_override import Keypath
+
+
+class Checkpoint():
+    """Asynchronous model class for a sync checkpoint.
+
+    A checkpoint records when the `cache` CLI last synced one entity type,
+    e.g., 'sp/keywords', of one advertiser, and when it last swept every
+    entity of that type rather than only the changed ones. While a sync is
+    running, its `cursor` records the last page that was cached.
+
+    `docdb_cache` also records when it first requested a path, e.g.,
+    '/api/v1/amazon/aa/sp/campaigns', so that a path whose response was
+    empty is not requested on every read.
+    """
+
+    @staticmethod
+    async def find(advertiser_id: str, entity_type: str, client):
+        collection = client.visibly.sync_checkpoints
+        checkpoint = await collection.find_one(
+            { 'advertiser_id': advertiser_id, 'entity_type': entity_type },
+        )
+
+        if checkpoint:
+            return Keypath(checkpoint)
+
+        return None
+
+    @staticmethod
+    async def update(advertiser_id: str, entity_type: str, synced_at: datetime, client, is_full: bool = False):
+        data = { 'synced_at': synced_at }
+        if is_full:
+            data['full_synced_at'] = synced_at
+
+        collection = client.visibly.sync_checkpoints
+        await collection.update_one(
+            { 'advertiser_id': advertiser_id, 'entity_type': entity_type },
+            { '$set': data, '$unset': { 'cursor': Constants.EMPTY_STRING } },
+            upsert=True,
+        )
+
+    @staticmethod
+    async def update_cursor(advertiser_id: str, entity_type: str, cursor: dict, client):
+        collection = client.visibly.sync_checkpoints
+        await collection.update_one(
+            { 'advertiser_id': advertiser_id, 'entity_type': entity_type },
+            { '$set': { 'cursor': cursor } },
+            upsert=True,
+        )
@@ -0,0 +1,87 @@
+from bson.objectid import ObjectId
+
+from server.overrides.dict_override import Keypath
+from server.resources.types.data_types import (
+    AdType,
+    PlatformType,
+    RegionType,
+)
+
+
+class Daypart():
+    """Asynchronous model class for a dayparting schedule.
+
+    Equivalent to `server.resources.models.daypart.Daypart`, but every
+    method is a coroutine that takes a Motor client, e.g., from the
+    `async_docdb` dependency.
+    """
+
+    @staticmethod
+    async def create(data, client):
+        collection = client.visibly.dayparts
+        result = await collection.insert_one(
+            data,
+        )
+        daypart = await collection.find_one(
+            { '_id': result.inserted_id },
+        )
+
+        if daypart:
+            return Keypath(daypart)
+
+        return None
+
+    @staticmethod
+    async def find(ad_type: AdType, advertiser_id: str, campaign_id: str, platform: PlatformType, region: RegionType, client):
+        collection = client.visibly.dayparts
+        daypart = await collection.find_one(
+            {
+                'ad_type': ad_type,
+                'advertiser_id': advertiser_id,
+                'campaign_id': campaign_id,
+                'platform': platform,
+                'region': region,
+            },
+        )
+
+        if daypart is not None:
+            return Keypath(daypart)
+
+        return None
+
+    @staticmethod
+    async def find_all(ad_type: AdType, advertiser_id: str, campaign_ids: str, platform: PlatformType, region: RegionType, client):
+        collection = client.visibly.dayparts
+        dayparts = await collection.find(
+            {
+                'ad_type': ad_type,
+                'advertiser_id': advertiser_id,
+                'campaign_id': {
+                    '$in': campaign_ids,
+                },
+                'platform': platform,
+                'region': region,
+            },
+        ).to_list(None)
+
+        return [Keypath(daypart) for daypart in dayparts]
+
+    @staticmethod
+    async def update(daypart_id: ObjectId, data, client):
+        collection = client.visibly.dayparts
+        daypart = await collection.find_one_and_update(
+            { '_id': daypart_id },
+            data,
+        )
+
+        if daypart:
+            return Keypath(daypart)
+
+        return None
+
+    @staticmethod
+    async def delete(daypart_id: ObjectId, client):
+        collection = client.visibly.dayparts
+        await collection.delete_one(
+            { '_id': daypart_id },
+        )
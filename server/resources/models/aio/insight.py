@@ -0,0 +1,204 @@
+from typing import List
+
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+
+import pymongo
+
+from server.overrides.dict_override import Keypath
+
+
+class Insight():
+    """Asynchronous model class for an insight.
+
+    Equivalent to `server.resources.models.insight.Insight`, but every
+    method is a coroutine that takes a Motor client, e.g., from the
+    `async_docdb` dependency. The tags of insights are read in one query
+    rather than one query per tag.
+    """
+
+    @staticmethod
+    async def add_report(insight_ids: List[ObjectId], report_id: ObjectId, brand_id: ObjectId, client):
+        collection = client.visibly.insights
+        await collection.update_many(
+            { '_id': { '$in': insight_ids }, 'brand_id': brand_id },
+            { '$addToSet': {
+                'reports': report_id,
+            }}
+        )
+
+    @staticmethod
+    async def add_tags(insight_id: ObjectId, tags: List[str], client):
+        tags = [ObjectId(tag) for tag in tags]
+
+        collection = client.visibly.insights
+        insight = await collection.find_one_and_update(
+            { '_id': insight_id },
+            { '$addToSet': { 'tags': { '$each': tags } } },
+            return_document=ReturnDocument.AFTER,
+        )
+
+        return Keypath(insight)
+
+    @staticmethod
+    async def create(data, client):
+        data.update(
+            {
+                'reports': data.get('reports', []),
+                'tags': data.get('tags', []),
+            }
+        )
+        collection = client.visibly.insights
+        result = await collection.insert_one(
+            data,
+        )
+        insight = await collection.find_one(
+            { '_id': result.inserted_id },
+        )
+
+        if insight:
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def delete(insight_id: ObjectId, client):
+        collection = client.visibly.insights
+        await collection.delete_one(
+            { '_id': insight_id },
+        )
+
+    @staticmethod
+    async def find(query: dict, client):
+        collection = client.visibly.insights
+        insight = await collection.find_one(
+            query,
+        )
+
+        if insight:
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def find_between_dates(from_date, to_date, brand_id: ObjectId, client):
+        collection = client.visibly.insights
+        insights = await collection.find(
+            {
+                'date': { '$gte': from_date, '$lte': to_date },
+                'brand_id': brand_id,
+            },
+        ).to_list(None)
+
+        return [Keypath(insight) for insight in insights]
+
+    @staticmethod
+    async def find_by_id(insight_id: ObjectId, client):
+        collection = client.visibly.insights
+        insight = await collection.find_one(
+            { '_id': insight_id },
+        )
+
+        if insight:
+            await _tag(
+                [insight],
+                client,
+            )
+
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def find_one(insight_id: ObjectId, client):
+        collection = client.visibly.insights
+        insight = await collection.find_one(
+            { '_id': insight_id },
+        )
+
+        if insight:
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def find_one_and_update(insight_id: ObjectId, update: dict, client):
+        collection = client.visibly.insights
+        insight = await collection.find_one_and_update(
+            { '_id': insight_id },
+            update,
+        )
+
+        if insight:
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def remove_report(insight_id: ObjectId, report_id: ObjectId, client):
+        collection = client.visibly.insights
+        await collection.update_one(
+            { '_id': insight_id },
+            {
+                '$pull': {
+                    'reports': report_id,
+                }
+            },
+        )
+
+    @staticmethod
+    async def update(insight_id: ObjectId, data: dict, client):
+        collection = client.visibly.insights
+        insight = await collection.find_one_and_update(
+            { '_id': insight_id },
+            data,
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if insight:
+            return Keypath(insight)
+
+        return None
+
+    @staticmethod
+    async def with_brand(brand_id: ObjectId, client):
+        collection = client.visibly.insights
+        insights = await collection.find(
+            { 'brand_id': brand_id },
+        ).sort(
+            [('date', pymongo.DESCENDING,)],
+        ).to_list(None)
+
+        await _tag(
+            insights,
+            client,
+        )
+
+        return [Keypath(insight) for insight in insights]
+
+
+async def _tag(insights, client):
+    # Replaces the tag IDs of each insight with the tags' IDs and names
+    tag_ids = {
+        ObjectId(tag_id)
+        for insight in insights
+        for tag_id in insight.get('tags', [])
+    }
+
+    tags = {}
+    if tag_ids:
+        collection = client.visibly.tags
+        async for tag in collection.find(
+            { '_id': { '$in': list(tag_ids) } },
+            { '_id': 1, 'name': 1 },
+        ):
+            tag_id = tag.pop('_id')
+            tag['id'] = str(tag_id)
+            tags[tag_id] = tag
+
+    for insight in insights:
+        insight['tags'] = [
+            Keypath(tags[ObjectId(tag_id)])
+            for tag_id in insight.get('tags', [])
+            if ObjectId(tag_id) in tags
+        ]
@@ -0,0 +1,88 @@
+from typing import List
+
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+
+import pymongo
+
+from server.overrides.dict_override import Keypath
+
+
+class Report():
+    """Asynchronous model class for reports.
+
+    Equivalent to `server.resources.models.report.Report`, but every method
+    is a coroutine that takes a Motor client, e.g., from the `async_docdb`
+    dependency.
+    """
+
+    @staticmethod
+    async def add_insights(report_id: ObjectId, insights: List[str], client):
+        insights = [ObjectId(insight) for insight in insights]
+
+        collection = client.visibly.reports
+        report = await collection.find_one_and_update(
+            { '_id': report_id },
+            { '$addToSet': { 'insights': { '$each': insights } } },
+            return_document=ReturnDocument.AFTER,
+        )
+
+        return Keypath(report)
+
+    @staticmethod
+    async def create(data, client):
+        data.update(
+            {
+                'insights': data.get('insights', []),
+                'tags': data.get('tags', []),
+            }
+        )
+
+        reports = client.visibly.reports
+        # The only session in the model layer, because the report is inserted
+        # and read back in one transaction
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                result = await reports.insert_one(
+                    data,
+                    session=session,
+                )
+                report = await reports.find_one(
+                    { '_id': result.inserted_id },
+                    session=session,
+                )
+
+        if report:
+            return Keypath(report)
+
+        return None
+
+    @staticmethod
+    async def delete(report_id: ObjectId, client):
+        collection = client.visibly.reports
+        await collection.delete_one(
+            { '_id': report_id },
+        )
+
+    @staticmethod
+    async def find_by_id(report_id: ObjectId, client):
+        collection = client.visibly.reports
+        report = await collection.find_one(
+            { '_id': report_id },
+        )
+
+        if report:
+            return Keypath(report)
+
+        return None
+
+    @staticmethod
+    async def with_brand(brand_id: ObjectId, client):
+        collection = client.visibly.reports
+        reports = await collection.find(
+            { 'brand_id': brand_id },
+        ).sort(
+            [('start_date', pymongo.DESCENDING,)],
+        ).to_list(None)
+
+        return [Keypath(report) for report in reports]
@@ -0,0 +1,21 @@
+from server.overrides.dict_override import Keypath
+
+
+class SyncReport():
+    """Asynchronous model class for the report of a `cache` CLI run."""
+
+    @staticmethod
+    async def create(data, client):
+        collection = client.visibly.sync_reports
+        result = await collection.insert_one(data)
+
+        return result.inserted_id
+
+    @staticmethod
+    async def find_all(command: str, client, limit: int = 100):
+        collection = client.visibly.sync_reports
+        reports = await collection.find(
+            { 'command': command },
+        ).sort('started_at', -1).limit(limit).to_list(None)
+
+        return [Keypath(report) for report in reports]
@@ -0,0 +1,117 @@
+from typing import List
+
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+
+from server.overrides.dict_override import Keypath
+
+
+class Tag():
+    """Asynchronous model class for tags.
+
+    Equivalent to `server.resources.models.tag.Tag`, but every method is a
+    coroutine that takes a Motor client, e.g., from the `async_docdb`
+    dependency.
+    """
+
+    @staticmethod
+    async def create(data, client):
+        data.update(
+            {
+                'campaigns': data.get('campaigns', []),
+                'insights': data.get('insights', []),
+                'orders': data.get('orders', []),
+            }
+        )
+        collection = client.visibly.tags
+        result = await collection.insert_one(
+            data,
+        )
+        tag = await collection.find_one(
+            { '_id': result.inserted_id },
+        )
+
+        if tag:
+            return Keypath(tag)
+
+        return None
+
+    @staticmethod
+    async def delete(tag_id: ObjectId, client):
+        collection = client.visibly.tags
+        await collection.delete_one(
+            { '_id': tag_id },
+        )
+
+    @staticmethod
+    async def find_all(client):
+        collection = client.visibly.tags
+        tags = await collection.find().to_list(None)
+
+        return [Keypath(tag) for tag in tags]
+
+    @staticmethod
+    async def find_by_id(tag_id: ObjectId, client):
+        collection = client.visibly.tags
+        tag = await collection.find_one(
+            { '_id': ObjectId(tag_id) },
+        )
+
+        if tag:
+            return Keypath(tag)
+
+        return None
+
+    @staticmethod
+    async def add_insight(tag_ids: List[ObjectId], insight_id: ObjectId, brand_id: ObjectId, client):
+        collection = client.visibly.tags
+        await collection.update_many(
+            { '_id': { '$in': tag_ids }, 'brand_id': brand_id },
+            { '$addToSet': {
+                'insights': insight_id,
+            }}
+        )
+
+    @staticmethod
+    async def update(tag: Keypath, data, client):
+        collection = client.visibly.tags
+        tag = await collection.find_one_and_update(
+            { '_id': tag._id },
+            {
+                '$set': {
+                    'name': data.get('name', tag.name),
+                    'prefix': data.get('prefix', tag.prefix),
+                    'campaigns': data.get('campaigns', tag.campaigns),
+                    'insights': data.get('insights', tag.insights),
+                    'orders': data.get('orders', tag.orders),
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if tag:
+            return Keypath(tag)
+
+        return None
+
+    @staticmethod
+    async def with_brand(brand_id: ObjectId, client):
+        collection = client.visibly.tags
+        tags = await collection.find(
+            { 'brand_id': brand_id },
+        ).to_list(None)
+
+        return [Keypath(tag) for tag in tags]
+
+    @staticmethod
+    async def with_brand_groups(brand_id: ObjectId, client):
+        collection = client.visibly.tags
+        tags = await collection.find(
+            {
+                'brand_id': brand_id,
+                'prefix': { '$ne': None },
+            },
+            { 'name': 1, 'prefix': 1 },
+        ).to_list(None)
+
+        return [Keypath(tag) for tag in tags]
@@ -0,0 +1,108 @@
+from typing import List
+
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+
+from server.overrides.dict_override import Keypath
+from server.resources.types.data_types import UserStatusType
+
+
+class User:
+    """Asynchronous model class for a user.
+
+    Equivalent to `server.resources.models.user.User`, but every method is
+    a coroutine that takes a Motor client, e.g., from the `async_docdb`
+    dependency.
+    """
+
+    @staticmethod
+    async def add_brand(user_id, brand_id, client):
+        collection = client.visibly.users
+        user = await collection.find_one_and_update(
+            { '_id': user_id },
+            { '$addToSet': { 'brands': brand_id } },
+            return_document=ReturnDocument.AFTER,
+        )
+
+        return Keypath(user)
+
+    @staticmethod
+    async def create(data, client):
+        data.update(
+            {
+                'refresh_token': None,
+                'status': UserStatusType.PENDING,
+                'brands': [],
+                'insights': [],
+                'reports': [],
+            }
+        )
+        collection = client.visibly.users
+        await collection.insert_one(
+            data,
+        )
+
+    @staticmethod
+    async def find(client):
+        collection = client.visibly.users
+        users = await collection.find().to_list(None)
+
+        return [Keypath(user) for user in users]
+
+    @staticmethod
+    async def find_by_email(email, client):
+        collection = client.visibly.users
+        user = await collection.find_one(
+            { 'email': email, 'status': { '$ne': UserStatusType.DISABLED } },
+        )
+
+        if user:
+            return Keypath(user)
+
+        return None
+
+    @staticmethod
+    async def find_by_id(id: ObjectId, client):
+        collection = client.visibly.users
+        user = await collection.find_one(
+            { '_id': id }
+        )
+
+        if user:
+            return Keypath(user)
+
+        return None
+
+    @staticmethod
+    async def find_by_password(password, client):
+        collection = client.visibly.users
+        user = await collection.find_one(
+            { 'password': password }
+        )
+
+        if user:
+            return Keypath(user)
+
+        return None
+
+    @staticmethod
+    async def remove_brands(user_id: ObjectId, brand_ids: List[ObjectId], client):
+        collection = client.visibly.users
+        await collection.update_one(
+            { '_id': user_id },
+            { '$pull': { 'brands': { '$in': brand_ids } } },
+        )
+
+    @staticmethod
+    async def update(user_id: ObjectId, data, client):
+        collection = client.visibly.users
+        user = await collection.find_one_and_update(
+            { '_id': user_id },
+            data,
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if user:
+            return Keypath(user)
+
+        return None
@@ -2,6 +2,8 @@ from bson.objectid import ObjectId
 
 import pymongo
 
+from server.managers.context_manager import ContextManager
+from server.managers.token_manager import TokenManager
 from server.overrides.dict_override import Keypath
 from server.services.aws_service import AWSService
 
@@ -18,18 +20,29 @@ class Brand():
 
     @staticmethod
     def add_user(brand_id: ObjectId, user_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            collection.update(
-                { '_id': brand_id },
-                { '$addToSet': { 'users': user_id } },
-            )
-            brand = collection.find_one(
-                { '_id': brand_id }
-            )
+        collection = client.visibly.brands
+        collection.update(
+            { '_id': brand_id },
+            { '$addToSet': { 'users': user_id } },
+        )
+        ContextManager().invalidate(brand_id)
+        TokenManager().invalidate_user(user_id)
+        brand = collection.find_one(
+            { '_id': brand_id }
+        )
             
-            return Keypath(brand)
+        return Keypath(brand)
     
+    @staticmethod
+    def brand_ids_with_user(user_id: ObjectId, client):
+        collection = client.visibly.brands
+        brands = collection.find(
+            { 'users': user_id },
+            { '_id': 1 },
+        )
+
+        return { str(brand['_id']) for brand in brands }
+
     @staticmethod
     def create(brand, client):
         brand.update({
@@ -39,11 +52,10 @@ class Brand():
             'tags': [],
             'users': [],
         })
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            collection.insert_one(
-                brand,
-            )
+        collection = client.visibly.brands
+        collection.insert_one(
+            brand,
+        )
 
     @staticmethod
     def create_many(brands, client):
@@ -56,79 +68,98 @@ class Brand():
                 'users': [],
             })
         
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            try:
-                collection.insert_many(
-                    brands,
-                )
-            except pymongo.errors.OperationFailure as e:
-                log.exception(e)
+        collection = client.visibly.brands
+        try:
+            collection.insert_many(
+                brands,
+            )
+        except pymongo.errors.OperationFailure as e:
+            log.exception(e)
     
     @staticmethod
     def find_by_id(brand_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            brand = collection.find_one(
-                { '_id': brand_id },
-            )
+        collection = client.visibly.brands
+        brand = collection.find_one(
+            { '_id': brand_id },
+        )
 
-            if brand:
-                return Keypath(brand)
+        if brand:
+            return Keypath(brand)
 
-            return None
+        return None
 
     @staticmethod
-    def find_by_name(name, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            brand = collection.find_one(
-                { 'name': name },
+    def find_by_id_with_user(brand_id: ObjectId, user_id: ObjectId, client):
+        """Finds a brand and one of its users.
+
+        Returns:
+            A tuple of brand and user, either of which is None if not found.
+            The user is None if they are not a user of the brand.
+        """
+        brand = client.visibly.brands.find_one(
+            { '_id': brand_id },
+        )
+
+        if not brand:
+            return None, None
+
+        user = None
+        if user_id in brand.get('users', []):
+            user = client.visibly.users.find_one(
+                { '_id': user_id },
             )
 
-            if brand:
-                return Keypath(brand)
+        return Keypath(brand), Keypath(user) if user else None
 
-            return None
+    @staticmethod
+    def find_by_name(name, client):
+        collection = client.visibly.brands
+        brand = collection.find_one(
+            { 'name': name },
+        )
+
+        if brand:
+            return Keypath(brand)
+
+        return None
 
     @staticmethod
     def find_by_id_and_user(brand_id: ObjectId, user_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            brand = collection.find_one(
-                {
-                    '$and': [
-                        { '_id': brand_id },
-                        { 'users': user_id },
-                    ],
-                }
-            )
-
-            if brand:
-                return Keypath(brand)
+        collection = client.visibly.brands
+        brand = collection.find_one(
+            {
+                '$and': [
+                    { '_id': brand_id },
+                    { 'users': user_id },
+                ],
+            }
+        )
+
+        if brand:
+            return Keypath(brand)
 
-            return None
+        return None
 
     @staticmethod
     def remove_user(brand_id: ObjectId, user_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            collection.update(
-                { '_id': brand_id },
-                {
-                    '$pull': { 'users': user_id },
-                },
-            )
+        collection = client.visibly.brands
+        collection.update(
+            { '_id': brand_id },
+            {
+                '$pull': { 'users': user_id },
+            },
+        )
+        ContextManager().invalidate(brand_id)
+        TokenManager().invalidate_user(user_id)
 
     @staticmethod
     def with_user(user_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.brands
-            brands = collection.find(
-                { 'users': user_id },
-            )
+        collection = client.visibly.brands
+        brands = collection.find(
+            { 'users': user_id },
+        )
 
-            if brands:
-                return [Keypath(brand) for brand in list(brands)]
+        if brands:
+            return [Keypath(brand) for brand in list(brands)]
 
-            return None
+        return None
@@ -20,14 +20,13 @@ class Daypart():
     
     @staticmethod
     def create(data, client):
-        with client.start_session() as session:
-            collection = client.visibly.dayparts
-            result = collection.insert_one(
-                data,
-            )
-            daypart = collection.find_one(
-                { '_id': result.inserted_id },
-            )
+        collection = client.visibly.dayparts
+        result = collection.insert_one(
+            data,
+        )
+        daypart = collection.find_one(
+            { '_id': result.inserted_id },
+        )
 
         if daypart:
             return Keypath(daypart)
@@ -36,62 +35,58 @@ class Daypart():
     
     @staticmethod
     def find(ad_type: AdType, advertiser_id: str, campaign_id: str, platform: PlatformType, region: RegionType, client):
-        with client.start_session() as session:
-            collection = client.visibly.dayparts
-            daypart = collection.find_one(
-                {
-                    'ad_type': ad_type,
-                    'advertiser_id': advertiser_id,
-                    'campaign_id': campaign_id,
-                    'platform': platform,
-                    'region': region,
-                },
-            )
-
-            if daypart is not None:
-                return Keypath(daypart)
+        collection = client.visibly.dayparts
+        daypart = collection.find_one(
+            {
+                'ad_type': ad_type,
+                'advertiser_id': advertiser_id,
+                'campaign_id': campaign_id,
+                'platform': platform,
+                'region': region,
+            },
+        )
+
+        if daypart is not None:
+            return Keypath(daypart)
 
-            return None
+        return None
 
     @staticmethod
     def find_all(ad_type: AdType, advertiser_id: str, campaign_ids: str, platform: PlatformType, region: RegionType, client):
-        with client.start_session() as session:
-            collection = client.visibly.dayparts
-            dayparts = collection.find(
-                {
-                    'ad_type': ad_type,
-                    'advertiser_id': advertiser_id,
-                    'campaign_id': {
-                        '$in': campaign_ids,
-                    },
-                    'platform': platform,
-                    'region': region,
+        collection = client.visibly.dayparts
+        dayparts = collection.find(
+            {
+                'ad_type': ad_type,
+                'advertiser_id': advertiser_id,
+                'campaign_id': {
+                    '$in': campaign_ids,
                 },
-            )
+                'platform': platform,
+                'region': region,
+            },
+        )
 
-            if dayparts:
-                return [Keypath(daypart) for daypart in dayparts]
+        if dayparts:
+            return [Keypath(daypart) for daypart in dayparts]
 
-            return []
+        return []
 
     @staticmethod
     def update(daypart_id: ObjectId, data, client):
-        with client.start_session() as session:
-            collection = client.visibly.dayparts
-            daypart = collection.find_one_and_update(
-                { '_id': daypart_id },
-                data,
-            )
+        collection = client.visibly.dayparts
+        daypart = collection.find_one_and_update(
+            { '_id': daypart_id },
+            data,
+        )
 
-            if daypart:
-                return Keypath(daypart)
+        if daypart:
+            return Keypath(daypart)
 
-            return None
+        return None
 
     @staticmethod
     def delete(daypart_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.dayparts
-            collection.delete_one(
-                { '_id': daypart_id },
-            )
\ No newline at end of file
+        collection = client.visibly.dayparts
+        collection.delete_one(
+            { '_id': daypart_id },
+        )
\ No newline at end of file
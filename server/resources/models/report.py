@@ -23,13 +23,12 @@ class Report():
     def add_insights(report_id: ObjectId, insights: List[str], client):
         insights = [ObjectId(insight) for insight in insights]
         
-        with client.start_session() as session:
-            collection = client.visibly.reports
-            report = collection.find_one_and_update(
-                { '_id': report_id },
-                { '$addToSet': { 'insights': { '$each': insights } } },
-                return_document=ReturnDocument.AFTER,
-            )
+        collection = client.visibly.reports
+        report = collection.find_one_and_update(
+            { '_id': report_id },
+            { '$addToSet': { 'insights': { '$each': insights } } },
+            return_document=ReturnDocument.AFTER,
+        )
             
         return Keypath(report)
     
@@ -61,19 +60,17 @@ class Report():
             
     @staticmethod
     def delete(report_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.reports
-            collection.remove(
-                { '_id': report_id },
-            )
+        collection = client.visibly.reports
+        collection.remove(
+            { '_id': report_id },
+        )
     
     @staticmethod
     def find_by_id(report_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.reports
-            report = collection.find_one(
-                { '_id': report_id },
-            )
+        collection = client.visibly.reports
+        report = collection.find_one(
+            { '_id': report_id },
+        )
             
         if report:
             return Keypath(report)
@@ -82,13 +79,12 @@ class Report():
     
     @staticmethod
     def with_brand(brand_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.reports
-            reports = collection.find(
-                { 'brand_id': brand_id },
-            ).sort(
-                [('start_date', pymongo.DESCENDING,)],
-            )
+        collection = client.visibly.reports
+        reports = collection.find(
+            { 'brand_id': brand_id },
+        ).sort(
+            [('start_date', pymongo.DESCENDING,)],
+        )
 
         if reports:
             return [Keypath(report) for report in reports]
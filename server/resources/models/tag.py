@@ -24,14 +24,13 @@ class Tag():
                 'orders': data.get('orders', []),
             }
         )
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            result = collection.insert_one(
-                data,
-            )
-            tag = collection.find_one(
-                { '_id': result.inserted_id },
-            )
+        collection = client.visibly.tags
+        result = collection.insert_one(
+            data,
+        )
+        tag = collection.find_one(
+            { '_id': result.inserted_id },
+        )
 
         if tag:
             return Keypath(tag)
@@ -40,17 +39,15 @@ class Tag():
             
     @staticmethod
     def delete(tag_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            collection.remove(
-                { '_id': tag_id },
-            )
+        collection = client.visibly.tags
+        collection.remove(
+            { '_id': tag_id },
+        )
     
     @staticmethod
     def find_all(client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            tags = collection.find()
+        collection = client.visibly.tags
+        tags = collection.find()
 
         if tags:
             return [Keypath(tag) for tag in tags]
@@ -59,12 +56,11 @@ class Tag():
 
     @staticmethod
     def find_by_id(tag_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            tag = collection.find_one(
-                { '_id': ObjectId(tag_id) },
-            )
-            print(tag)
+        collection = client.visibly.tags
+        tag = collection.find_one(
+            { '_id': ObjectId(tag_id) },
+        )
+        print(tag)
 
         if tag:
             return Keypath(tag)
@@ -74,39 +70,37 @@ class Tag():
     @staticmethod
     def add_insight(tag_ids: List[ObjectId], insight_id: ObjectId, brand_id: ObjectId, client):
         for tag_id in tag_ids:
-            with client.start_session() as session:
-                collection = client.visibly.tags
-                tag = collection.find_one(
-                    { '_id': tag_id, 'brand_id': brand_id }
-                )
-
-                if tag is None:
-                    continue
+            collection = client.visibly.tags
+            tag = collection.find_one(
+                { '_id': tag_id, 'brand_id': brand_id }
+            )
+
+            if tag is None:
+                continue
                 
-                collection.update(
-                    { '_id': tag.get('_id') },
-                    { '$addToSet': {
-                        'insights': insight_id,
-                    }}
-                )
+            collection.update(
+                { '_id': tag.get('_id') },
+                { '$addToSet': {
+                    'insights': insight_id,
+                }}
+            )
     
     @staticmethod
     def update(tag: Keypath, data, client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            tag = collection.find_one_and_update(
-                { '_id': tag._id },
-                {
-                    '$set': {
-                        'name': data.get('name', tag.name),
-                        'prefix': data.get('prefix', tag.prefix),
-                        'campaigns': data.get('campaigns', tag.campaigns),
-                        'insights': data.get('insights', tag.insights),
-                        'orders': data.get('orders', tag.orders),
-                    }
-                },
-                return_document=ReturnDocument.AFTER,
-            )
+        collection = client.visibly.tags
+        tag = collection.find_one_and_update(
+            { '_id': tag._id },
+            {
+                '$set': {
+                    'name': data.get('name', tag.name),
+                    'prefix': data.get('prefix', tag.prefix),
+                    'campaigns': data.get('campaigns', tag.campaigns),
+                    'insights': data.get('insights', tag.insights),
+                    'orders': data.get('orders', tag.orders),
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
 
         if tag:
             return Keypath(tag)
@@ -115,11 +109,10 @@ class Tag():
     
     @staticmethod
     def with_brand(brand_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            tags = collection.find(
-                { 'brand_id': brand_id },
-            )
+        collection = client.visibly.tags
+        tags = collection.find(
+            { 'brand_id': brand_id },
+        )
 
         if tags:
             return [Keypath(tag) for tag in tags]
@@ -128,15 +121,14 @@ class Tag():
     
     @staticmethod
     def with_brand_groups(brand_id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.tags
-            tags = collection.find(
-                {
-                    'brand_id': brand_id,
-                    'prefix': { '$ne': None },
-                },
-                { 'name': 1, 'prefix': 1 },
-            )
+        collection = client.visibly.tags
+        tags = collection.find(
+            {
+                'brand_id': brand_id,
+                'prefix': { '$ne': None },
+            },
+            { 'name': 1, 'prefix': 1 },
+        )
 
         if tags:
             return [Keypath(tag) for tag in list(tags)]
@@ -15,18 +15,17 @@ class User:
 
     @staticmethod
     def add_brand(user_id, brand_id, client):
-        with client.start_session() as session:
-            collection = client.visibly.users
+        collection = client.visibly.users
             
-            collection.update(
-                { '_id': user_id },
-                { '$addToSet': { 'brands': brand_id } },
-            )
-            user = collection.find_one(
-                { '_id': user_id },
-            )
+        collection.update(
+            { '_id': user_id },
+            { '$addToSet': { 'brands': brand_id } },
+        )
+        user = collection.find_one(
+            { '_id': user_id },
+        )
             
-            return Keypath(user)
+        return Keypath(user)
     
     @staticmethod
     def create(data, client):
@@ -39,83 +38,76 @@ class User:
                 'reports': [],
             }
         )
-        with client.start_session() as session:
-            collection = client.visibly.users
-            collection.insert_one(
-                data,
-            )
+        collection = client.visibly.users
+        collection.insert_one(
+            data,
+        )
             
     @staticmethod
     def find(client):
-        with client.start_session() as session:
-            collection = client.visibly.users
-            users = collection.find()
+        collection = client.visibly.users
+        users = collection.find()
             
-            if users:
-                return [Keypath(user) for user in users]
+        if users:
+            return [Keypath(user) for user in users]
 
-            return []
+        return []
     
     @staticmethod
     def find_by_email(email, client):
-        with client.start_session() as session:
-            collection = client.visibly.users
-            user = collection.find_one(
-                { 'email': email, 'status': { '$ne': UserStatusType.DISABLED } },
-            )
+        collection = client.visibly.users
+        user = collection.find_one(
+            { 'email': email, 'status': { '$ne': UserStatusType.DISABLED } },
+        )
             
-            if user:
-                return Keypath(user)
+        if user:
+            return Keypath(user)
 
-            return None
+        return None
     
     @staticmethod
     def find_by_id(id: ObjectId, client):
-        with client.start_session() as session:
-            collection = client.visibly.users
-            user = collection.find_one(
-                { '_id': id }
-            )
+        collection = client.visibly.users
+        user = collection.find_one(
+            { '_id': id }
+        )
 
-            if user:
-                return Keypath(user)
+        if user:
+            return Keypath(user)
 
-            return None
+        return None
 
     @staticmethod
     def find_by_password(password, client):
-        with client.start_session() as session:
-            collection = client.visibly.users
-            user = collection.find_one(
-                { 'password': password }
-            )
+        collection = client.visibly.users
+        user = collection.find_one(
+            { 'password': password }
+        )
 
-            if user:
-                return Keypath(user)
+        if user:
+            return Keypath(user)
 
-            return None
+        return None
 
     @staticmethod
     def remove_brands(user_id: ObjectId, brand_ids: List[ObjectId], client):
-        with client.start_session() as session:
-            collection = client.visibly.users
+        collection = client.visibly.users
             
-            collection.update(
-                { '_id': user_id },
-                { '$pull': { 'brands': { '$in': brand_ids } } },
-            )
+        collection.update(
+            { '_id': user_id },
+            { '$pull': { 'brands': { '$in': brand_ids } } },
+        )
     
     @staticmethod
     def update(user_id: ObjectId, data, client):
-        with client.start_session() as session:
-            collection = client.visibly.users
-            user = collection.find_one_and_update(
-                { '_id': user_id },
-                data,
-                return_document=ReturnDocument.AFTER,
-            )
-
-            if user:
-                return Keypath(user)
-
-            return None
+        collection = client.visibly.users
+        user = collection.find_one_and_update(
+            { '_id': user_id },
+            data,
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if user:
+            return Keypath(user)
+
+        return None
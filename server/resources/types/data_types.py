@@ -22,6 +22,12 @@ class ApiType(str, enum.Enum):
     SA='sa'
 
 
+class BackendType(str, enum.Enum):
+    AA='aa'
+    DOCDB='docdb'
+    ES='es'
+
+
 class BidType(str, enum.Enum):
     ABSOLUTE_VALUE='absolute'
     PERCENTAGE_VALUE='percentage'
@@ -73,6 +79,11 @@ class EmailType(str, enum.Enum):
     RESET='reset'
     
 
+class ExportFormatType(str, enum.Enum):
+    CSV='csv'
+    NDJSON='ndjson'
+
+
 class ExpressionType(str, enum.Enum):
     AUTO='auto'
     MANUAL='manual'
@@ -176,6 +187,14 @@ class TableType(str, enum.Enum):
     TOTAL_SALES_AND_SPEND='TOTAL_SALES_AND_SPEND'
 
 
+class TaskStateType(str, enum.Enum):
+    FAILED='failed'
+    PENDING='pending'
+    RUNNING='running'
+    SKIPPED='skipped'
+    SUCCEEDED='succeeded'
+
+
 class UserStatusType(str, enum.Enum):
     ACTIVE='active'
     DISABLED='disabled'
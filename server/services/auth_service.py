@@ -21,6 +21,7 @@ from starlette.status import (
 import pymongo
 
 from server.core.constants import Constants
+from server.managers.token_manager import TokenManager
 from server.overrides.dict_override import Keypath
 from server.resources.models.brand import Brand
 from server.resources.models.user import User
@@ -176,12 +177,14 @@ class AuthService:
             If successful, a tuple of access token, expiration timestamp, and refresh token
             If unsuccessful, a tuple of False, None, and None
         """
-        brands = Brand.with_user(user._id, client)
-        brand_ids = [str(brand._id) for brand in brands]
+        brand_ids = Brand.brand_ids_with_user(user._id, client)
 
         if brand_id not in brand_ids:
             return (False, None , None,)
 
+        # Tokens issued for the previous brand are verified again
+        TokenManager().invalidate_user(user._id)
+
         access_token_details = AccessToken(
             id=str(user._id),
             brand=str(brand_id),
@@ -338,11 +341,7 @@ class AuthService:
             Exception: An indeterminate error occurred when decoding the access token
         """
         try:
-            payload = jwt.decode(
-                token,
-                self.ssm_service.application_secret,
-                algorithms=[Constants.JWT_ALGORITHM],
-            )
+            payload = self.verify_token(token)
             brand_id = payload.get(Constants.BRAND_ID)
             email = payload.get(Constants.EMAIL)
             # TODO(declan.ryan@getvisibly.com) Rename `version` to something meaningful
@@ -356,6 +355,24 @@ class AuthService:
             log.exception(e)
             raise
 
+    def verify_token(self, token):
+        """Verifies a token's signature and expiry.
+
+        Args:
+            token: Encoded access or refresh token
+
+        Returns:
+            Verified claims
+
+        Raises:
+            JWTError: An error occurred decoding the token
+        """
+        return jwt.decode(
+            token,
+            self.ssm_service.application_secret,
+            algorithms=[Constants.JWT_ALGORITHM],
+        )
+
     def refresh_token(self, refresh_token, client):
         """Refreshes access token.
 
@@ -14,6 +14,7 @@ from urllib import parse
 
 import logging
 import sys
+import threading
 import time
 
 import boto3
@@ -26,7 +27,7 @@ from elasticsearch import (
     Elasticsearch,
     RequestsHttpConnection,
 )
-from elasticsearch.helpers import bulk
+from motor.motor_asyncio import AsyncIOMotorClient
 from requests_aws4auth import AWS4Auth
 
 from server.core.constants import Constants
@@ -45,6 +46,7 @@ class AWSService:
             self._client = None
             self._docdb = None
             self._endpoint = None
+            self._motor_client = None
             self._password = None
             self._port = None
             self._uri = None
@@ -52,6 +54,10 @@ class AWSService:
 
             self._ssm_service = ssm_service
 
+        def reset(self):
+            self._client = None
+            self._motor_client = None
+
         @property
         def client(self):
             if self._client is None:
@@ -75,6 +81,20 @@ class AWSService:
 
             return self._endpoint
 
+        @property
+        def motor_client(self):
+            # Motor binds to the event loop that first uses it, so the
+            # client is created lazily inside each worker's loop
+            if self._motor_client is None:
+                self._motor_client = AsyncIOMotorClient(
+                    self.uri,
+                    w=1,
+                    journal=True,
+                    readPreference='primary',
+                )
+
+            return self._motor_client
+
         @property
         def password(self):
             if self._password is None:
@@ -175,29 +195,104 @@ class AWSService:
             self._region = region
 
             self._es_service = None
+            self._log_service = AWSService().log_service
             self._session = session
             self._ssm_service = AWSService().ssm_service
 
-        def delete_by_query(self, query, index):
-            return self.es_service.delete_by_query(
-                index,
-                query,
+        def cancel_task(self, task_id):
+            return self.es_service.tasks.cancel(
+                task_id=task_id,
+            )
+
+        def delete_by_query(self, query, index, requests_per_second=Constants.ES_TASK_REQUESTS_PER_SECOND):
+            """Starts a sliced, throttled delete and returns its task ID."""
+            return self._start_task(
+                self.es_service.delete_by_query,
+                index=index,
+                body=query,
+                conflicts='proceed',
+                requests_per_second=requests_per_second,
             )
         
         def get_index(self, index):
             return self.es_service.indices.get(index)
         
-        def index(self, generator, *args):
-            bulk(
+        def index(self, generator, *args, **options):
+            # Imported here, because the ingestion service logs through AWSService
+            from server.services.ingestion_service import IngestionService
+
+            return IngestionService(
                 self.es_service,
-                generator(*args),
-            )
+                **options,
+            ).ingest(generator(*args))
         
         def search(self, query, index):
             return self.es_service.search(
                 query,
                 index=index,
             )
+
+        def reindex(self, body, requests_per_second=Constants.ES_TASK_REQUESTS_PER_SECOND):
+            """Starts a sliced, throttled reindex and returns its task ID."""
+            return self._start_task(
+                self.es_service.reindex,
+                body=body,
+                requests_per_second=requests_per_second,
+            )
+
+        def task(self, task_id):
+            return self.es_service.tasks.get(
+                task_id=task_id,
+            )
+
+        def tasks(self):
+            """Lists running delete, update and reindex tasks by task ID."""
+            response = self.es_service.tasks.list(
+                actions=Constants.ES_TASK_ACTIONS,
+                detailed=True,
+            )
+
+            return {
+                task_id: task
+                for node in response.get('nodes', {}).values()
+                for task_id, task in node.get('tasks', {}).items()
+                # Slices are listed under their parent task
+                if 'parent_task_id' not in task
+            }
+
+        def wait_for_task(self, task_id, interval=Constants.ES_TASK_POLL_INTERVAL):
+            """Polls a task until it completes.
+
+            Args:
+                task_id: ID returned when the task was started
+                interval: Seconds between polls
+
+            Returns:
+                Completed task, including its `response` or `error`
+            """
+            while True:
+                task = self.task(task_id)
+                if task.get('completed'):
+                    return task
+
+                status = task.get('task', {}).get('status', {})
+                self._log_service.info(
+                    f'{task_id} | {status.get("created", 0) + status.get("updated", 0) + status.get("deleted", 0)}'
+                    f'/{status.get("total", 0)} documents'
+                )
+
+                time.sleep(interval)
+
+        def _start_task(self, method, **kwargs):
+            # Runs in the background with one slice per shard, throttled so
+            # that maintenance does not compete with dashboard queries
+            response = method(
+                slices='auto',
+                wait_for_completion=False,
+                **kwargs,
+            )
+
+            return response.get('task')
         
         @property
         def domain(self):
@@ -265,6 +360,17 @@ class AWSService:
         def info(self, value):
             self.service.info(value, stacklevel=2)
 
+        def reset(self):
+            # The CloudWatch handler's threads are not forked with it
+            if self._service is not None:
+                self._service.removeHandler(
+                    self._handler,
+                )
+
+            self._handler = None
+            self._service = None
+            self._session = None
+
         # TODO(declan.ryan@getvisibly.com) Align warning with warn
         def warning(self, value):
             self.service.warn(value, stacklevel=2)
@@ -370,13 +476,22 @@ class AWSService:
                 Name=name,
                 WithDecryption=with_decryption,
             )
-            self._ssm = None  # Forces to access latest STS session via delegate
             return response.get(
                 Constants.PARAMETER_KEY,
             ).get(
                 Constants.VALUE_KEY,
             )
 
+        def parameter(self, name, with_decryption=True):
+            """Gets a parameter, including its metadata, e.g., `LastModifiedDate`."""
+            response = self.ssm.get_parameter(
+                Name=name,
+                WithDecryption=with_decryption,
+            )
+            return response.get(
+                Constants.PARAMETER_KEY,
+            )
+
         def put(self, name, value, _type='SecureString'):
             self.ssm.put_parameter(
                 Name=name,
@@ -384,12 +499,15 @@ class AWSService:
                 Type=_type,
                 Value=value,
             )
+
+        def reset(self):
             self._ssm = None
+            self.delegate.reset()
 
         @property
         def amazon_aa_access_token(self):
             return self.get(
-                'shared-ssm-amazon-aa-sa-access-token-parameter',
+                Constants.AMAZON_AA_ACCESS_TOKEN_PARAMETER,
             )
 
         @property
@@ -407,113 +525,164 @@ class AWSService:
             return self._ssm
                 
     class SSMService:
+        """Reads the parameters of `server` from SSM Parameter Store.
+
+        Every parameter with the prefix `<prefix>-ssm-visibly-server-` is
+        loaded, decrypted, in one pass by `load`, e.g., when the application
+        starts, or else on first access, and cached for
+        `Constants.SSM_PARAMETERS_TTL` seconds. Once stale, cached values
+        are still returned while a background thread reloads them.
+        Parameters outside of the prefix are requested and cached
+        individually, and parameters requested without decryption are not
+        cached.
+        """
 
         def __init__(self, prefix, region):
             self._prefix = prefix
             self._region = region
             self._ssm = None
 
-            self._access_token_expire_minutes = None
-            self._amazon_aa_client_id = None
-            self._amazon_aa_client_secret = None
-            self._amazon_advertising_elasticsearch_domain = None
-            self._amazon_retail_elasticsearch_domain = None
-            self._api_prefix = None
-            self._application_secret = None
-            self._cloudwatch_log_namespace = None
-            self._cloudwatch_log_stream = None
-            self._cloudwatch_log_group = None
-            self._bucket = None
-            self._cookie_domain = None
-            self._documentdb_endpoint = None
-            self._documentdb_password = None
-            self._documentdb_port = None
-            self._documentdb_user = None
-            self._encryption_key = None
-            self._event_bus = None
-            self._shared_parameter_store_role_arn = None
-            self._twilio_account_sid = None
-            self._twilio_auth_token = None
-            self._twilio_confirmation_template = None
-            self._twilio_email_config_service = None
-            self._twilio_invitation_template = None
-            self._twilio_reset_password_template = None
-            self._uri = None
+            self._expires_at = 0
+            self._lock = threading.Lock()
+            self._parameters = None
+            self._refreshing = False
 
         def get(self, name, with_decryption=True):
+            if not with_decryption:
+                return self._get_parameter(name, with_decryption)
+
+            if self._parameters is None:
+                self.load()
+            elif self._expires_at <= time.monotonic():
+                self._refresh()
+
+            value = self._parameters.get(name)
+            if value is None:
+                # Parameters outside of the prefix are requested individually
+                value = self._get_parameter(name, with_decryption)
+                self._parameters[name] = value
+
+            return value
+
+        def load(self):
+            """Loads every parameter of the prefix, unless they are loaded."""
+            with self._lock:
+                if self._parameters is None:
+                    self._load()
+
+        def put(self, name, value, _type='SecureString'):
+            self.ssm.put_parameter(
+                Name=name,
+                Overwrite=True,
+                Type=_type,
+                Value=value,
+            )
+
+            if self._parameters is not None:
+                self._parameters[name] = value
+
+        def reset(self):
+            # Loaded parameters are kept, but the lock may have been held by
+            # a refresh, whose thread is not forked with it
+            self._lock = threading.Lock()
+            self._refreshing = False
+            self._ssm = None
+
+        def _get_parameter(self, name, with_decryption):
             response = self.ssm.get_parameter(
                 Name=name,
                 WithDecryption=with_decryption,
             )
-            self._ssm = None  # Forces to access latest STS session via delegate
+
             return response.get(
                 Constants.PARAMETER_KEY,
             ).get(
                 Constants.VALUE_KEY,
             )
 
-        def put(self, name, value, _type='SecureString'):
-            self.ssm.put_parameter(
-                Name=name,
-                Overwrite=True,
-                Type=_type,
-                Value=value,
-            )
-            self._ssm = None
+        def _load(self):
+            names = []
+            paginator = self.ssm.get_paginator('describe_parameters')
+            for page in paginator.paginate(
+                ParameterFilters=[
+                    {
+                        'Key': 'Name',
+                        'Option': 'BeginsWith',
+                        'Values': [f'{self.prefix}-ssm-visibly-server-'],
+                    },
+                ],
+            ):
+                names.extend(parameter.get('Name') for parameter in page.get('Parameters', []))
+
+            parameters = {}
+            for index in range(0, len(names), Constants.SSM_GET_PARAMETERS_MAX_NAMES):
+                response = self.ssm.get_parameters(
+                    Names=names[index:index + Constants.SSM_GET_PARAMETERS_MAX_NAMES],
+                    WithDecryption=True,
+                )
+                for parameter in response.get('Parameters', []):
+                    parameters[parameter.get('Name')] = parameter.get(Constants.VALUE_KEY)
+
+            # Replaced rather than updated, so readers never see a partial load
+            self._parameters = parameters
+            self._expires_at = time.monotonic() + Constants.SSM_PARAMETERS_TTL
+
+        def _refresh(self):
+            with self._lock:
+                if self._refreshing:
+                    return
+
+                self._refreshing = True
+
+            def refresh():
+                try:
+                    self._load()
+                except Exception as e:
+                    # Stale values are kept and the next access retries
+                    logging.getLogger(__name__).exception(e)
+                finally:
+                    self._refreshing = False
+
+            threading.Thread(
+                target=refresh,
+                daemon=True,
+            ).start()
 
         @property
         def access_token_expire_minutes(self):
-            if self._access_token_expire_minutes is None:
-                self._access_token_expire_minutes = self.get(
-                    f'{self.prefix}-ssm-visibly-server-access-token-expire-minutes-parameter',
-                )
-
-            return self._access_token_expire_minutes
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-access-token-expire-minutes-parameter',
+            )
         
         @property
         def amazon_aa_client_id(self):
-            if self._amazon_aa_client_id is None:
-                self._amazon_aa_client_id = self.get(
-                    f'{self.prefix}-ssm-visibly-server-amazon-aa-client-id-parameter',
-                )
-
-            return self._amazon_aa_client_id
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-amazon-aa-client-id-parameter',
+            )
         
         @property
         def amazon_aa_client_secret(self):
-            if self._amazon_aa_client_secret is None:
-                self._amazon_aa_client_secret = self.get(
-                    f'{self.prefix}-ssm-visibly-server-amazon-aa-client-secret-parameter',
-                )
-            
-            return self._amazon_aa_client_secret
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-amazon-aa-client-secret-parameter',
+            )
         
         @property
         def shared_parameter_store_role_arn(self):
-            if self._shared_parameter_store_role_arn is None:
-                self._shared_parameter_store_role_arn = self.get(
-                    f'{self.prefix}-ssm-visibly-server-amazon-aa-parameter-store-role-arn-parameter',
-                )
-
-            return self._shared_parameter_store_role_arn
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-amazon-aa-parameter-store-role-arn-parameter',
+            )
         
         @property
         def amazon_advertising_elasticsearch_domain(self):
-            if self._amazon_advertising_elasticsearch_domain is None:
-                self._amazon_advertising_elasticsearch_domain = self.get(
-                    f'{self.prefix}-ssm-visibly-server-amazon-advertising-elasticsearch-domain-parameter',
-                )
-
-            return self._amazon_advertising_elasticsearch_domain
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-amazon-advertising-elasticsearch-domain-parameter',
+            )
         
         @property
         def amazon_retail_elasticsearch_domain(self):
-            if self._amazon_retail_elasticsearch_domain is None:
-                self._amazon_retail_elasticsearch_domain = self.get(
-                    f'{self.prefix}-ssm-visibly-server-amazon-retail-elasticsearch-domain-parameter',
-                )
-
-            return self._amazon_retail_elasticsearch_domain
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-amazon-retail-elasticsearch-domain-parameter',
+            )
         
         @property
         def api_prefix(self):
@@ -522,111 +691,75 @@ class AWSService:
 
         @property
         def application_secret(self):
-            if self._application_secret is None:
-                self._application_secret = self.get(
-                    f'{self.prefix}-ssm-visibly-server-application-secret-parameter',
-                )
-
-            return self._application_secret
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-application-secret-parameter',
+            )
         
         @property
         def bucket(self):
-            if self._bucket is None:
-                self._bucket = self.get(
-                    f'{self.prefix}-ssm-visibly-server-s3-bucket-parameter',
-                )
-            
-            return self._bucket
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-s3-bucket-parameter',
+            )
         
         @property
         def cloudwatch_log_group(self):
-            if self._cloudwatch_log_group is None:
-                self._cloudwatch_log_group = self.get(
-                    f'{self.prefix}-ssm-visibly-server-cloudwatch-log-group-parameter'
-                )
-
-            return self._cloudwatch_log_group
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-cloudwatch-log-group-parameter',
+            )
 
         @property
         def cloudwatch_log_namespace(self):
-            if self._cloudwatch_log_namespace is None:
-                self._cloudwatch_log_namespace = self.get(
-                    f'{self.prefix}-ssm-visibly-server-cloudwatch-log-namespace-parameter'
-                )
-
-            return self._cloudwatch_log_namespace
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-cloudwatch-log-namespace-parameter',
+            )
 
         @property
         def cloudwatch_log_stream(self):
-            if self._cloudwatch_log_stream is None:
-                self._cloudwatch_log_stream = self.get(
-                    f'{self.prefix}-ssm-visibly-server-cloudwatch-log-stream-parameter'
-                )
-
-            return self._cloudwatch_log_stream
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-cloudwatch-log-stream-parameter',
+            )
 
         @property
         def cookie_domain(self):
-            if self._cookie_domain is None:
-                self._cookie_domain = self.get(
-                    f'{self.prefix}-ssm-visibly-server-cookie-domain-parameter',
-                )
-            
-            return self._cookie_domain
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-cookie-domain-parameter',
+            )
         
         @property
         def documentdb_endpoint(self):
-            if self._documentdb_endpoint is None:
-                self._documentdb_endpoint = self.get(
-                    f'{self.prefix}-ssm-visibly-server-documentdb-endpoint-parameter',
-                )
-            
-            return self._documentdb_endpoint
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-documentdb-endpoint-parameter',
+            )
         
         @property
         def documentdb_password(self):
-            if self._documentdb_password is None:
-                self._documentdb_password = self.get(
-                    f'{self.prefix}-ssm-visibly-server-documentdb-password-parameter',
-                )
-
-            return self._documentdb_password
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-documentdb-password-parameter',
+            )
         
         @property
         def documentdb_port(self):
-            if self._documentdb_port is None:
-                self._documentdb_port = self.get(
-                    f'{self.prefix}-ssm-visibly-server-documentdb-port-parameter',
-                )
-
-            return self._documentdb_port
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-documentdb-port-parameter',
+            )
         
         @property
         def documentdb_user(self):
-            if self._documentdb_user is None:
-                self._documentdb_user = self.get(
-                    f'{self.prefix}-ssm-visibly-server-documentdb-user-parameter',
-                )
-
-            return self._documentdb_user
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-documentdb-user-parameter',
+            )
         
         @property
         def encryption_key(self):
-            if self._encryption_key is None:
-                self._encryption_key = self.get(
-                    f'{self.prefix}-ssm-visibly-server-encryption-key-parameter',
-                )
-
-            return self._encryption_key
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-encryption-key-parameter',
+            )
         
         @property
         def event_bus(self):
-            if self._event_bus is None:
-                self._event_bus = self.get(
-                    f'{self.prefix}-ssm-visibly-server-event-bus-parameter'
-                )
-
-            return self._event_bus
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-event-bus-parameter',
+            )
 
         @property
         def prefix(self):
@@ -634,12 +767,9 @@ class AWSService:
 
         @property
         def shared_parameter_store_role_arn(self):
-            if self._shared_parameter_store_role_arn is None:
-                self._shared_parameter_store_role_arn = self.get(
-                    f'{self.prefix}-ssm-visibly-server-shared-parameter-store-role-arn-parameter',
-                )
-
-            return self._shared_parameter_store_role_arn
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-shared-parameter-store-role-arn-parameter',
+            )
         
         @property
         def ssm(self):
@@ -653,66 +783,45 @@ class AWSService:
 
         @property
         def twilio_account_sid(self):
-            if self._twilio_account_sid is None:
-                self._twilio_account_sid = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-account-sid-parameter',
-                )
-            
-            return self._twilio_account_sid
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-account-sid-parameter',
+            )
         
         @property
         def twilio_auth_token(self):
-            if self._twilio_auth_token is None:
-                self._twilio_auth_token = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-auth-token-parameter',
-                )
-            
-            return self._twilio_auth_token
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-auth-token-parameter',
+            )
         
         @property
         def twilio_confirmation_template(self):
-            if self._twilio_confirmation_template is None:
-                self._twilio_confirmation_template = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-confirm-template-id-parameter',
-                )
-
-            return self._twilio_confirmation_template
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-confirm-template-id-parameter',
+            )
         
         @property
         def twilio_email_config_service(self):
-            if self._twilio_email_config_service is None:
-                self._twilio_email_config_service = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-email-config-service-parameter',
-                )
-            
-            return self._twilio_email_config_service
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-email-config-service-parameter',
+            )
         
         @property
         def twilio_invitation_template(self):
-            if self._twilio_invitation_template is None:
-                self._twilio_invitation_template = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-invite-template-id-parameter',
-                )
-
-            return self._twilio_invitation_template
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-invite-template-id-parameter',
+            )
         
         @property
         def twilio_reset_password_template(self):
-            if self._twilio_reset_password_template is None:
-                self._twilio_reset_password_template = self.get(
-                    f'{self.prefix}-ssm-visibly-server-twilio-reset-template-id-parameter',
-                )
-
-            return self._twilio_reset_password_template
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-twilio-reset-template-id-parameter',
+            )
         
         @property
         def uri(self):
-            if self._uri is None:
-                self._uri = self.get(
-                    f'{self.prefix}-ssm-visibly-server-s3-origin-parameter',
-                )
-
-            return self._uri
+            return self.get(
+                f'{self.prefix}-ssm-visibly-server-s3-origin-parameter',
+            )
     
     class STSService:
 
@@ -741,6 +850,10 @@ class AWSService:
             
             return {}
 
+        def reset(self):
+            self._client = None
+            self._refreshable_session = None
+
         @property
         def client(self):
             if self._client is None:
@@ -787,6 +900,24 @@ class AWSService:
         self._ssm_service = None
         self._sts_service = None
 
+    @classmethod
+    def reset(cls):
+        """Discards the clients that every `AWSService` shares.
+
+        A process forked from one that used them, e.g., a gunicorn worker of
+        a preloaded application, creates its own clients on first use. The
+        services themselves are kept, because modules hold them, e.g., as
+        `log`.
+        """
+        for service in (
+            cls.__docdb_service,
+            cls.__log_service,
+            cls.__shared_ssm_service,
+            cls.__ssm_service,
+        ):
+            if service is not None:
+                service.reset()
+
     @property
     def advertiser_name(self):
         if self._advertiser_name is None:
@@ -6,6 +6,7 @@ from elasticsearch_dsl import (
     Q,
     Search,
 )
+from elasticsearch_dsl.response import Response
 
 from server.core.constants import Constants
 from server.resources.types.data_types import (
@@ -3973,40 +3974,42 @@ def search_terms_time_series(client, index, data):
                     'lte': data.end_date,
                 },
             ),
+            Q(
+                'terms',
+                search_term_search__keyword=data.search_terms,
+            ),
         ],
     )
 
     search = search.query(query)
 
-    for search_term in data.search_terms:
-        aggregation = A(
-            'filter',
-            Q(
-                'term',
-                search_term_search__keyword=search_term,
-            )
-        )
-        aggregation.bucket(
-            'ranking_over_time',
-            'date_histogram',
-            field='report_date',
-            interval='week',
-            format='yyyy-MM',
-            min_doc_count=0,
-        )
-        aggregation['ranking_over_time'].bucket(
-            'ranking',
-            'terms',
-            field='search_frequency_rank',
-            size=1,
-        )
+    # A single `terms` bucket per search term keeps the aggregation tree
+    # constant in depth, however many search terms are compared
+    search_terms_aggregation = A(
+        'terms',
+        field='search_term_search.keyword',
+        include=data.search_terms,
+        size=len(data.search_terms),
+    )
+    search_terms_aggregation.bucket(
+        'ranking_over_time',
+        'date_histogram',
+        field='report_date',
+        interval='week',
+        format='yyyy-MM',
+        min_doc_count=0,
+    ).metric(
+        'rank',
+        'min',
+        field='search_frequency_rank',
+    )
 
-        search.aggs.bucket(
-            search_term,
-            aggregation,
-        )
+    search.aggs.bucket(
+        'search_terms',
+        search_terms_aggregation,
+    )
 
-    return search.execute()
+    return search.extra(size=0).execute()
 
 
 def search_terms_filter(client, index, q, limit):
@@ -4062,6 +4065,51 @@ def search_terms_periods(client, index):
 
 
 def search_terms(client, index, data):
+    search = _search_terms_search(client, index, data)
+
+    search = search.sort(
+        {'search_frequency_rank': 'asc'},
+    )
+    
+    return search[0:1000].execute()
+
+
+def search_terms_scroll(client, index, data, size=Constants.SEARCH_TERMS_PAGE_SIZE):
+    search = _search_terms_search(client, index, data)
+
+    # A scroll reads a snapshot of the index, so pages never skip or repeat
+    # a document, however many search terms share a rank. Unlike a point in
+    # time and `_shard_doc`, scrolls are supported by OpenSearch.
+    search = search.sort(
+        {'search_frequency_rank': 'asc'},
+        {'search_term_search.keyword': 'asc'},
+    )
+
+    search = search.params(
+        scroll=Constants.SEARCH_TERMS_SCROLL_KEEP_ALIVE,
+    ).extra(
+        size=size,
+    )
+
+    return search.execute()
+
+
+def search_terms_scroll_page(client, scroll_id):
+    response = client.scroll(
+        scroll_id=scroll_id,
+        scroll=Constants.SEARCH_TERMS_SCROLL_KEEP_ALIVE,
+    )
+
+    return Response(Search(using=client), response)
+
+
+def clear_scroll(client, scroll_id):
+    return client.clear_scroll(
+        scroll_id=scroll_id,
+    )
+
+
+def _search_terms_search(client, index, data):
     report_range_components = data.report_range.split(
         Constants.DASH,
     )
@@ -4160,13 +4208,26 @@ def search_terms(client, index, data):
         should=should_filter,
     )
 
-    search = search.query(query)
+    return search.query(query)
 
-    search = search.sort(
-        {'search_frequency_rank': 'asc'},
+
+# Maintenance
+
+def report_months_aggregation(client, index):
+    search = Search(
+        using=client,
+        index=index,
     )
-    
-    return search[0:1000].execute()
+
+    search.aggs.bucket(
+        'months',
+        'date_histogram',
+        field=Constants.MONTHLY_INDEX_SORT_FIELD,
+        interval='month',
+        min_doc_count=1,
+    )
+
+    return search.extra(size=0).execute()
 
 
 # Tags
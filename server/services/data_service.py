@@ -12,6 +12,7 @@ from datetime import(
 
 from server.core.constants import Constants
 from server.managers.brand_manager import BrandManager
+from server.managers.index_manager import IndexManager
 from server.resources.schema.amazon_api import IndexSearchTermsResponseSchema
 from server.resources.types.data_types import (
     ApiType,
@@ -44,8 +45,11 @@ from server.services.data.es import(
     # Retail
     brand_analytics_statistics,
     brand_analytics_time_series,
+    clear_scroll,
     search_terms_filter,
     search_terms_periods,
+    search_terms_scroll,
+    search_terms_scroll_page,
     search_terms_time_series,
     search_terms,
     # Tags
@@ -56,6 +60,7 @@ from server.services.data.es import(
 )
 from server.utilities.data_utility import DataUtility
 from server.utilities.date_utility import DateUtility
+from server.utilities.index_utility import IndexUtility
 
 
 log = AWSService().log_service
@@ -69,6 +74,8 @@ class DataService:
         self._brand_manager = BrandManager()
         self._data_utility = None
         self._date_utility = None
+        self._index_manager = IndexManager()
+        self._index_utility = None
 
     # Advertising
 
@@ -82,7 +89,7 @@ class DataService:
         try:
             time_series = advertising_sales_and_total_sales_time_series(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -129,7 +136,7 @@ class DataService:
         try:
             time_series = advertising_statistics(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -196,7 +203,7 @@ class DataService:
         try:
             time_series = cumulative_sales_and_spend_time_series(
                 self._client, 
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date, 
                 end_date, 
                 interval,
@@ -250,7 +257,7 @@ class DataService:
         try:
             time_series = dsp_and_sa_objectives_time_series(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -353,7 +360,7 @@ class DataService:
         try:
             time_series = dsp_dashboard_time_series(
                 self._client,
-                self._dsp_index(),
+                self._dsp_index(start_date, end_date),
                 order_ids,
                 start_date,
                 end_date,
@@ -498,7 +505,7 @@ class DataService:
         try:
             aggregate = dsp_model_aggregation(
                 self._client,
-                self._dsp_index(),
+                self._dsp_index(from_date, to_date),
                 model,
                 model_ids,
                 from_date,
@@ -554,7 +561,7 @@ class DataService:
         try:
             time_series = dsp_objectives_time_series(
                 self._client,
-                self._indices(),
+                self._indices(start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -643,7 +650,7 @@ class DataService:
         try:
             engagement = engagement_time_series(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -692,7 +699,7 @@ class DataService:
         try:
             time_series = my_dashboard_statistics(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -795,7 +802,7 @@ class DataService:
         try:
             time_series = portfolios_dashboard_time_series(
                 self._client,
-                self._sa_index(),
+                self._sa_index(start_date, end_date),
                 start_date,
                 end_date,
                 campaign_ids,
@@ -927,7 +934,7 @@ class DataService:
         try:
             time_series = sa_dashboard_time_series(
                 self._client,
-                self._sa_index(),
+                self._sa_index(start_date, end_date),
                 campaign_ids,
                 start_date,
                 end_date,
@@ -1028,7 +1035,7 @@ class DataService:
             try:
                 aggregate = portfolio_aggregation(
                     self._client,
-                    self._sa_index(),
+                    self._sa_index(from_date, to_date),
                     model_ids,
                     from_date,
                     to_date,
@@ -1086,7 +1093,7 @@ class DataService:
             try:
                 aggregate = sa_model_aggregation(
                     self._client,
-                    self._sa_index(),
+                    self._sa_index(from_date, to_date),
                     api,
                     model,
                     model_ids,
@@ -1138,7 +1145,7 @@ class DataService:
         try:
             time_series = sa_objectives_time_series(
                 self._client,
-                self._sa_index(),
+                self._sa_index(start_date, end_date),
                 start_date,
                 end_date,
                 interval,
@@ -1231,7 +1238,7 @@ class DataService:
         try:
             aggregate = sales_and_spend_aggregation(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 start_date,
                 end_date,
             )
@@ -1339,7 +1346,7 @@ class DataService:
         try:
             aggregate = sales_and_spend_by_objective_aggregation(
                 self._client,
-                self._index(api),
+                self._index(api, previous_period_start_date, adjusted_end_date),
                 formatted_start_date,
                 formatted_end_date,
                 formatted_previous_start_date,
@@ -1580,14 +1587,14 @@ class DataService:
         try:
             aggregate = total_attributed_sales_and_spend_aggregation(
                 self._client,
-                self._index(api),
+                self._index(api, previous_period_start_date, previous_period_end_date),
                 self.date_utility.to_string(previous_period_start_date),
                 self.date_utility.to_string(previous_period_end_date),
             )
             
             detail_aggregate = total_attributed_sales_and_spend_detail_aggregation(
                 self._client,
-                self._index(api),
+                self._index(api, start_date, end_date),
                 self.date_utility.to_string(start_date),
                 self.date_utility.to_string(end_date),
             )
@@ -1871,6 +1878,9 @@ class DataService:
 
         response = {}
 
+        if not data.search_terms:
+            return []
+
         try:
             search_terms_ranking = search_terms_time_series(
                 self._client,
@@ -1881,13 +1891,12 @@ class DataService:
             log.exception(e)
             return response
 
-        aggregations = search_terms_ranking.aggregations
-        search_terms = list(aggregations.to_dict().keys())
+        search_terms = data.search_terms
         
-        for search_term in search_terms:
-            aggregation = aggregations[search_term]
-            
-            for bucket in aggregation.ranking_over_time.buckets:
+        for search_term_bucket in search_terms_ranking.aggregations.search_terms.buckets:
+            search_term = search_term_bucket.key
+
+            for bucket in search_term_bucket.ranking_over_time.buckets:
                 start_date = self.date_utility.timestamp_to_date(
                     bucket.key / 1000,
                 )
@@ -1904,10 +1913,11 @@ class DataService:
                     Constants.DATE_FORMAT_YYYY_MM_DD,
                 )
 
-                try:
-                    rank = bucket.ranking.buckets[0].key
-                except IndexError:
+                rank = bucket.rank.value
+                if rank is None:
                     rank = -1
+                else:
+                    rank = int(rank)
                 
                 response[start_date] = response.get(
                     start_date,
@@ -1967,6 +1977,55 @@ class DataService:
 
         return response
 
+    def search_terms_stream(self, data, page_size=Constants.SEARCH_TERMS_PAGE_SIZE):
+        log.info(
+            'Streaming search terms...',
+        )
+
+        page = search_terms_scroll(
+            self._client,
+            Constants.SEARCH_TERMS_INDEX,
+            data,
+            page_size,
+        )
+        scroll_id = page['_scroll_id']
+        total = 0
+
+        # Pages are read from a scroll, so results are consistent across
+        # pages, uncapped, and held one page at a time
+        try:
+            while True:
+                hits = page.hits.hits
+                for hit in hits:
+                    try:
+                        yield IndexSearchTermsResponseSchema(**hit._source.to_dict())
+                    except Exception as e:
+                        log.exception(e)
+
+                total += len(hits)
+
+                if len(hits) < page_size:
+                    break
+
+                page = search_terms_scroll_page(
+                    self._client,
+                    scroll_id,
+                )
+                # The scroll identifier may change between pages
+                scroll_id = page['_scroll_id']
+        finally:
+            try:
+                clear_scroll(
+                    self._client,
+                    scroll_id,
+                )
+            except Exception as e:
+                log.exception(e)
+
+        log.info(
+            f'Streamed {total} search terms',
+        )
+
     # Tags
 
     def dsp_and_sa_tags(self, campaign_ids, order_ids, start_date, end_date, interval, objectives, segments):
@@ -1979,7 +2038,7 @@ class DataService:
         try:
             time_series = dsp_and_sa_tags_time_series(
                 self._client,
-                self._indices(),
+                self._indices(start_date, end_date),
                 campaign_ids,
                 order_ids,
                 start_date,
@@ -2094,7 +2153,7 @@ class DataService:
         try:
             time_series = dsp_tags_time_series(
                 self._client,
-                self._dsp_index(),
+                self._dsp_index(start_date, end_date),
                 order_ids,
                 start_date,
                 end_date,
@@ -2176,7 +2235,7 @@ class DataService:
         try:
             time_series = sa_tags_time_series(
                 self._client,
-                self._sa_index(),
+                self._sa_index(start_date, end_date),
                 campaign_ids,
                 start_date,
                 end_date,
@@ -2263,7 +2322,7 @@ class DataService:
         try:
             time_series = tag_statistics(
                 self._client,
-                self._indices(),
+                self._indices(start_date, end_date),
                 campaign_ids,
                 order_ids,
                 start_date,
@@ -2312,6 +2371,13 @@ class DataService:
 
         return self._date_utility
 
+    @property
+    def index_utility(self):
+        if self._index_utility is None:
+            self._index_utility = IndexUtility()
+
+        return self._index_utility
+
     def _ba_index(self):
         try:
             vendor_id = self.amazon.aa.sp.seller_partner_id.split(
@@ -2322,29 +2388,71 @@ class DataService:
             return None
 
 
-    def _dsp_index(self):
+    def _dsp_index(self, *dates):
         try:
-            return f'{Constants.DSP_INDEX}_{self.amazon.aa.dsp.advertiser_id}'
+            return self._partitioned_index(
+                f'{Constants.DSP_INDEX}_{self.amazon.aa.dsp.advertiser_id}',
+                *dates,
+            )
         except KeyError:
             return None
         
-    def _index(self, api):
+    def _index(self, api, *dates):
         if api == ApiType.DSP:
-            return f'{Constants.DSP_INDEX}_{self.amazon.aa.dsp.advertiser_id}'
+            return self._partitioned_index(
+                f'{Constants.DSP_INDEX}_{self.amazon.aa.dsp.advertiser_id}',
+                *dates,
+            )
         elif api == ApiType.SA:
-            return f'{Constants.SPONSORED_ADS_INDEX}_{self.amazon.aa.sa.advertiser_id}'
+            return self._partitioned_index(
+                f'{Constants.SPONSORED_ADS_INDEX}_{self.amazon.aa.sa.advertiser_id}',
+                *dates,
+            )
 
-    def _indices(self):
-        indices = [self._sa_index(), self._dsp_index()]
+    def _indices(self, *dates):
+        indices = [self._sa_index(*dates), self._dsp_index(*dates)]
         return [index for index in indices if index]
 
-    def _sa_index(self):
+    def _partitioned_index(self, alias, *dates):
+        # Advertisers migrated to monthly indices are queried through only the
+        # months that `dates` span. Unmigrated advertisers, and queries
+        # without dates, use the alias (or single index) as before.
+        dates = [self.index_utility.to_date(date) for date in dates]
+        dates = [date for date in dates if date]
+        if not dates:
+            return alias
+
+        try:
+            partitions = self._index_manager.partitions(
+                self._client,
+                alias,
+            )
+        except Exception as e:
+            log.exception(e)
+            return alias
+
+        if not partitions:
+            return alias
+
+        indices = [
+            index for index in self.index_utility.monthly_indices(alias, min(dates), max(dates))
+            if index in partitions
+        ]
+
+        if not indices:
+            return alias
+
+        return Constants.COMMA.join(indices)
+
+    def _sa_index(self, *dates):
         try:
-            return f'{Constants.SPONSORED_ADS_INDEX}_{self.amazon.aa.sa.advertiser_id}'
+            return self._partitioned_index(
+                f'{Constants.SPONSORED_ADS_INDEX}_{self.amazon.aa.sa.advertiser_id}',
+                *dates,
+            )
         except KeyError:
             return None
 
-
 if __name__ == '__main__':
     import json
     from server.resources.schema.amazon_api import (
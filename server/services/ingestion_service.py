@@ -0,0 +1,328 @@
+"""Bulk-indexes documents into OpenSearch (Elasticsearch) in parallel.
+
+`IngestionService` streams actions into size-bounded chunks, sends them
+from a pool of threads and backs off (with jitter) whenever the cluster
+rejects work with 429 `es_rejected_execution_exception` or cannot be
+reached. Requests that time out or fail with 502, 503 or 504 may have been
+indexed anyway, so they are retried only if every document has an `_id`,
+which the retry overwrites rather than duplicates. Documents that cannot be
+indexed are written to a dead-letter file instead of being dropped
+silently.
+"""
+
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import json
+import threading
+import time
+
+from elasticsearch.exceptions import (
+    ConnectionError as ElasticsearchConnectionError,
+    TransportError,
+)
+from elasticsearch.helpers import expand_action
+from urllib3.exceptions import NewConnectionError
+
+from server.core.constants import Constants
+from server.services.aws_service import AWSService
+from server.utilities.retry_utility import backoff
+
+
+log = AWSService().log_service
+
+
+class IngestionMetrics:
+    """Counts documents and bytes sent during an ingestion."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start_time = time.monotonic()
+        self._end_time = None
+
+        self.bytes = 0
+        self.chunks = 0
+        self.documents = 0
+        self.failed = 0
+        self.rejected = 0
+        self.retries = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def stop(self):
+        self._end_time = time.monotonic()
+
+    @property
+    def documents_per_second(self):
+        return self.documents / max(self.duration, 1e-9)
+
+    @property
+    def duration(self):
+        return (self._end_time or time.monotonic()) - self._start_time
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes / (1024 * 1024) / max(self.duration, 1e-9)
+
+    def to_dict(self):
+        return {
+            'bytes': self.bytes,
+            'chunks': self.chunks,
+            'documents': self.documents,
+            'documents_per_second': round(self.documents_per_second, 1),
+            'duration': round(self.duration, 1),
+            'failed': self.failed,
+            'megabytes_per_second': round(self.megabytes_per_second, 2),
+            'rejected': self.rejected,
+            'retries': self.retries,
+        }
+
+    def __str__(self):
+        return (
+            f'{self.documents} documents ({self.failed} failed) in {self.duration:.1f}s | '
+            f'{self.documents_per_second:.1f} docs/s | '
+            f'{self.megabytes_per_second:.2f} MB/s | '
+            f'{self.rejected} rejections, {self.retries} retries'
+        )
+
+
+class IngestionService:
+    """Indexes a stream of bulk actions with parallel, retrying workers.
+
+    Args:
+        client: Elasticsearch client
+        chunk_size: Maximum number of documents in a bulk request
+        max_chunk_bytes: Maximum size of a bulk request in bytes
+        thread_count: Number of bulk requests in flight
+        max_retries: Number of times a rejected document is retried
+        initial_backoff: Seconds to wait before the first retry
+        max_backoff: Maximum seconds to wait before a retry
+        dead_letter_path: File to which failed documents are appended as
+            NDJSON, or None to only count them
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size=Constants.INGEST_CHUNK_SIZE,
+        max_chunk_bytes=Constants.INGEST_MAX_CHUNK_BYTES,
+        thread_count=Constants.INGEST_THREAD_COUNT,
+        max_retries=Constants.INGEST_MAX_RETRIES,
+        initial_backoff=Constants.INGEST_INITIAL_BACKOFF,
+        max_backoff=Constants.INGEST_MAX_BACKOFF,
+        dead_letter_path=None,
+    ):
+        self._client = client
+        self._chunk_size = chunk_size
+        self._max_chunk_bytes = max_chunk_bytes
+        self._thread_count = thread_count
+        self._max_retries = max_retries
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._dead_letter_path = dead_letter_path
+
+        self._dead_letter_lock = threading.Lock()
+        self._paused_until = 0
+        self._pause_lock = threading.Lock()
+
+    def ingest(self, actions):
+        """Indexes every action in `actions`.
+
+        At most `thread_count * 2` chunks are held in memory, so `actions`
+        may be a generator over any number of documents.
+
+        Args:
+            actions: Iterable of bulk actions (dicts), as accepted by
+                `elasticsearch.helpers.bulk`
+
+        Returns:
+            IngestionMetrics
+        """
+        metrics = IngestionMetrics()
+        in_flight = set()
+
+        with ThreadPoolExecutor(max_workers=self._thread_count) as executor:
+            for chunk in self._chunks(actions):
+                # Backpressure: the reader waits while the pool is saturated
+                while len(in_flight) >= self._thread_count * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._raise_for(done)
+
+                in_flight.add(
+                    executor.submit(self._send, chunk, metrics),
+                )
+
+            done, _ = wait(in_flight)
+            self._raise_for(done)
+
+        metrics.stop()
+
+        log.info(
+            f'Ingested {metrics}',
+        )
+
+        return metrics
+
+    def _backoff(self, attempt):
+        return backoff(
+            attempt,
+            self._initial_backoff,
+            self._max_backoff,
+        )
+
+    def _chunks(self, actions):
+        serializer = self._client.transport.serializer
+
+        chunk, chunk_bytes = [], 0
+        for action in actions:
+            operation, document = expand_action(action)
+
+            lines = [serializer.dumps(operation)]
+            if document is not None:
+                lines.append(serializer.dumps(document))
+
+            size = sum(len(line.encode(Constants.UTF8)) + 1 for line in lines)
+
+            if chunk and (len(chunk) >= self._chunk_size or chunk_bytes + size > self._max_chunk_bytes):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+
+            chunk.append((action, lines, size))
+            chunk_bytes += size
+
+        if chunk:
+            yield chunk
+
+    def _dead_letter(self, items):
+        if not self._dead_letter_path or not items:
+            return
+
+        with self._dead_letter_lock:
+            with open(self._dead_letter_path, 'a') as dead_letter_file:
+                for action, error in items:
+                    dead_letter_file.write(
+                        json.dumps(
+                            {
+                                'action': action,
+                                'error': error,
+                            },
+                            default=str,
+                        ) + '\n'
+                    )
+
+    def _pause(self, seconds):
+        # A rejection from one worker pauses every worker
+        with self._pause_lock:
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + seconds,
+            )
+
+    def _raise_for(self, futures):
+        for future in futures:
+            future.result()
+
+    def _send(self, chunk, metrics):
+        attempt = 0
+
+        while chunk:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            body = '\n'.join(line for _, lines, _ in chunk for line in lines) + '\n'
+
+            try:
+                response = self._client.bulk(
+                    body=body,
+                )
+            except TransportError as e:
+                if not _is_retryable(e, chunk) or attempt >= self._max_retries:
+                    metrics.add(failed=len(chunk))
+                    self._dead_letter([(action, str(e)) for action, _, _ in chunk])
+                    return
+
+                metrics.add(rejected=len(chunk), retries=len(chunk))
+                self._pause(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            retry, failed, succeeded = [], [], []
+            for item, entry in zip(response.get('items', []), chunk):
+                result = next(iter(item.values()))
+                status = result.get(Constants.STATUS, 500)
+
+                if status < 300:
+                    succeeded.append(entry)
+                elif status in Constants.INGEST_RETRY_STATUS_CODES and attempt < self._max_retries:
+                    retry.append(entry)
+                else:
+                    failed.append((entry[0], result.get('error')))
+
+            metrics.add(
+                bytes=sum(size for _, _, size in succeeded),
+                chunks=1,
+                documents=len(succeeded),
+                failed=len(failed),
+                rejected=len(retry),
+                retries=len(retry),
+            )
+            self._dead_letter(failed)
+
+            if retry:
+                self._pause(self._backoff(attempt))
+                attempt += 1
+
+            chunk = retry
+
+
+def _is_retryable(error, chunk):
+    # A rejected request, or one that never reached the cluster, indexed
+    # nothing, so it is always retried
+    if error.status_code == Constants.TOO_MANY_REQUESTS_STATUS_CODE or _is_connection_refused(error):
+        return True
+
+    # Connection errors, e.g., timeouts and resets, have no status code
+    # ('N/A'). These requests may have been indexed, and a retry of
+    # documents without an `_id` would index them twice.
+    is_unavailable = (
+        isinstance(error, ElasticsearchConnectionError)
+        or error.status_code in Constants.INGEST_RETRY_STATUS_CODES
+    )
+
+    return is_unavailable and all(
+        action.get('_id') is not None for action, _, _ in chunk
+    )
+
+
+def _is_connection_refused(error):
+    # The transport wraps the error of its HTTP library, which wraps the
+    # socket's error
+    errors, seen = [error], set()
+    while errors:
+        error = errors.pop()
+        if error is None or id(error) in seen:
+            continue
+
+        seen.add(id(error))
+        if isinstance(error, (ConnectionRefusedError, NewConnectionError)):
+            return True
+
+        errors.extend(
+            cause for cause in (
+                *getattr(error, 'args', ()),
+                getattr(error, 'reason', None),
+                error.__cause__,
+                error.__context__,
+            )
+            if isinstance(cause, BaseException)
+        )
+
+    return False
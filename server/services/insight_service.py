@@ -1,9 +1,6 @@
-from amazon_api.resources.aa.client import Client
-
 from server.core.constants import Constants
-from server.delegates.aa_delegate import AADelegate
+from server.managers.client_manager import ClientManager
 from server.resources.types.data_types import InsightMetaType
-from server.services.aws_service import AWSService
 from server.utilities.aa_utility import AAUtility
 
 
@@ -16,7 +13,6 @@ class InsightService:
 
     def __init__(self):
         self._aa_utility = AAUtility()
-        self._client = None
 
     def accept(self, insight):
         """Accepts and completes action recommended by insight.
@@ -81,19 +77,7 @@ class InsightService:
         pass
 
     def _client(self, region, ad_type):
-        aws_service = AWSService()
-        ssm_service = aws_service.ssm_service
-        shared_ssm_service = aws_service.shared_ssm_service
-        
-        version = self._aa_utility.version_for_api(
-            ad_type,
-        )
-        aa_delegate = AADelegate(
+        return ClientManager().client(
             ad_type,
             region,
-            version,
-            ssm_service,
-            shared_ssm_service,
         )
-
-        return Client(aa_delegate)
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""Decouples requests to Amazon from writes to DocumentDB.
+
+While a `PipelineService` is open, `docdb_cache` hands the bulk write
+operations of every page to the pipeline instead of writing them before
+returning, so the `cache` CLI requests the next page while writer tasks
+drain earlier pages into batched `bulk_write`s. The queue is bounded: once
+DocumentDB falls behind, fetchers wait for a free slot rather than
+buffering pages without limit.
+"""
+
+
+from collections import defaultdict
+from contextvars import ContextVar
+
+import asyncio
+import time
+
+from server.core import settings
+from server.core.constants import Constants
+from server.services.aws_service import AWSService
+from server.services.sync_report_service import SyncReportService
+
+
+log = AWSService().log_service
+
+_generation = ContextVar('generation', default=None)
+_pipeline = ContextVar('pipeline', default=None)
+
+
+class PipelineService:
+    """Writes pages of operations to DocumentDB from a bounded queue.
+
+    Every page is numbered in the order it is queued, so callers that
+    record progress, e.g., a sync cursor, can tell when every page up to
+    one of theirs is written.
+
+    Args:
+        writers: Number of writer tasks
+        maxsize: Maximum number of pages waiting to be written
+        batch_size: Maximum number of operations per bulk write
+    """
+
+    def __init__(
+        self,
+        writers=settings.SYNC_WRITERS,
+        maxsize=settings.SYNC_QUEUE_SIZE,
+        batch_size=settings.SYNC_WRITE_BATCH_SIZE,
+    ):
+        self._batch_size = batch_size
+        self._condition = None
+        self._failed = set()
+        self._maxsize = maxsize
+        self._pending = set()
+        self._queue = None
+        self._start_time = None
+        self._tasks = []
+        self._token = None
+        self._writers = writers
+
+        self.seq = 0
+        self.metrics = defaultdict(float)
+
+    @staticmethod
+    def current():
+        """Returns the pipeline open in the current context, if any."""
+        return _pipeline.get()
+
+    @staticmethod
+    def generation():
+        """Returns the sync generation of the current context, if any."""
+        return _generation.get()
+
+    @staticmethod
+    def set_generation(generation):
+        """Stamps the entities cached from the current context.
+
+        Args:
+            generation: Value of `_sync_generation`, e.g., the start time of
+                a full sync
+        """
+        _generation.set(generation)
+
+    async def __aenter__(self):
+        self._condition = asyncio.Condition()
+        self._queue = asyncio.Queue(self._maxsize)
+        self._tasks = [
+            asyncio.ensure_future(self._write())
+            for _ in range(self._writers)
+        ]
+        self._tasks.append(asyncio.ensure_future(self._log()))
+        self._start_time = time.monotonic()
+        # Tasks started from this context, e.g., by `SchedulerService`,
+        # inherit the pipeline
+        self._token = _pipeline.set(self)
+
+        return self
+
+    async def __aexit__(self, *args):
+        _pipeline.reset(self._token)
+
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._report()
+
+    def fetched(self, seconds):
+        """Records the duration of one request to Amazon."""
+        self.metrics['fetches'] += 1
+        self.metrics['fetch_seconds'] += seconds
+
+    async def put(self, collection, operations):
+        """Queues the operations of one page, waiting while the queue is full.
+
+        Args:
+            collection: Motor collection to write to
+            operations: List of pymongo operations
+
+        Returns:
+            Number of the page
+        """
+        self.seq += 1
+        seq = self.seq
+        self._pending.add(seq)
+
+        start_time = time.monotonic()
+        await self._queue.put(
+            (seq, collection, operations, SyncReportService.key()),
+        )
+        self.metrics['blocked_seconds'] += time.monotonic() - start_time
+        self.metrics['max_depth'] = max(
+            self.metrics['max_depth'],
+            self._queue.qsize(),
+        )
+
+        return seq
+
+    def written(self, seq):
+        """Whether every page up to `seq` is written."""
+        return not any(
+            pending <= seq for pending in self._pending | self._failed
+        )
+
+    async def wait(self, seq=None):
+        """Waits until every page up to `seq` (default: the last page) is written.
+
+        Raises:
+            RuntimeError: If a page up to `seq` could not be written
+        """
+        if seq is None:
+            seq = self.seq
+
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not any(pending <= seq for pending in self._pending),
+            )
+
+        if any(failed <= seq for failed in self._failed):
+            raise RuntimeError(f'Pages up to {seq} were not written')
+
+    async def _write(self):
+        while True:
+            pages = [await self._queue.get()]
+            size = len(pages[0][2])
+            # Pages queued meanwhile are written together, which batches
+            # writes the more DocumentDB falls behind
+            while size < self._batch_size and not self._queue.empty():
+                page = self._queue.get_nowait()
+                pages.append(page)
+                size += len(page[2])
+
+            # Pages are grouped by collection and by the entity type they
+            # are reported under
+            collections = {}
+            operations = defaultdict(list)
+            seqs = defaultdict(list)
+            for seq, collection, page_operations, key in pages:
+                group = (collection.full_name, key)
+                collections[group] = collection
+                operations[group].extend(page_operations)
+                seqs[group].append(seq)
+
+            for group, collection in collections.items():
+                start_time = time.monotonic()
+                try:
+                    result = await collection.bulk_write(
+                        operations[group],
+                        ordered=False,
+                    )
+                    self._record(result)
+                    # `CacheUtility.operations` writes each item with two
+                    # operations
+                    SyncReportService.wrote(
+                        result,
+                        len(operations[group]) // 2,
+                        group[1],
+                    )
+                except Exception as e:
+                    log.exception(e)
+                    self._failed.update(seqs[group])
+                finally:
+                    self.metrics['write_seconds'] += time.monotonic() - start_time
+                    self.metrics['writes'] += 1
+
+            async with self._condition:
+                for seq, _, _, _ in pages:
+                    self._pending.discard(seq)
+                self._condition.notify_all()
+
+            for _ in pages:
+                self._queue.task_done()
+
+    def _record(self, result):
+        self.metrics['inserted'] += result.upserted_count
+        self.metrics['modified'] += result.modified_count
+
+    async def _log(self):
+        while True:
+            await asyncio.sleep(Constants.SYNC_METRICS_INTERVAL)
+            log.info(
+                f'Pipeline | {self._queue.qsize()}/{self._maxsize} pages queued, '
+                f'{round(self.metrics["fetch_seconds"], 1)} seconds fetching, '
+                f'{round(self.metrics["write_seconds"], 1)} seconds writing, '
+                f'{round(self.metrics["blocked_seconds"], 1)} seconds waiting for writers',
+            )
+
+    def _report(self):
+        duration = time.monotonic() - self._start_time
+        metrics = self.metrics
+
+        log.info(
+            f'Pipeline | {int(metrics["fetches"])} fetches in {round(metrics["fetch_seconds"], 1)} seconds, '
+            f'{int(metrics["writes"])} writes in {round(metrics["write_seconds"], 1)} seconds '
+            f'({int(metrics["inserted"])} inserted, {int(metrics["modified"])} modified), '
+            f'{round(metrics["blocked_seconds"], 1)} seconds waiting for writers, '
+            f'at most {int(metrics["max_depth"])} pages queued, '
+            f'{round(duration, 1)} seconds in total',
+        )
+
+        if self._failed:
+            log.info(f'Pipeline | {len(self._failed)} pages were not written')
@@ -0,0 +1,163 @@
+"""Runs a graph of asynchronous tasks with bounded concurrency.
+
+`SchedulerService` is used by the `cache` CLI to sync Amazon Advertising
+entities. Each task is a coroutine function that may depend on other
+tasks, e.g., DSP line items are requested only after the orders of an
+advertiser are cached. Tasks without unfinished dependencies run
+concurrently, limited globally and per Amazon profile, so the duration of
+a sync grows with the number of profiles rather than with the number of
+entities of every profile.
+"""
+
+
+from collections import defaultdict
+
+import asyncio
+import time
+
+from server.resources.types.data_types import TaskStateType
+from server.services.aws_service import AWSService
+
+
+log = AWSService().log_service
+
+
+class SchedulerTask:
+    """A node of the task graph."""
+
+    def __init__(self, name, func, args, kwargs, profile, dependencies):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.profile = profile
+        self.dependencies = dependencies
+
+        self.duration = None
+        self.error = None
+        self.state = TaskStateType.PENDING
+
+
+class SchedulerService:
+    """Schedules tasks on asyncio.
+
+    Args:
+        concurrency: Maximum number of tasks running at once
+        profile_concurrency: Maximum number of tasks of one profile running
+        at once
+    """
+
+    def __init__(self, concurrency, profile_concurrency):
+        self._concurrency = concurrency
+        self._profile_concurrency = profile_concurrency
+        self._tasks = {}
+
+    def add(self, name, func, *args, profile=None, dependencies=(), **kwargs):
+        """Adds a task to the graph.
+
+        Args:
+            name: Unique name of the task, e.g., 'sp/campaigns/1234'
+            func: Coroutine function of the task
+            args: Positional arguments of `func`
+            profile: Amazon profile (or DSP entity) whose requests the task makes
+            dependencies: Names of tasks that must succeed before the task runs
+            kwargs: Keyword arguments of `func`
+
+        Returns:
+            Name of the task
+        """
+        if name in self._tasks:
+            raise ValueError(f'Task {name} is already scheduled')
+
+        for dependency in dependencies:
+            if dependency not in self._tasks:
+                raise ValueError(f'Task {name} depends on unknown task {dependency}')
+
+        self._tasks[name] = SchedulerTask(
+            name,
+            func,
+            args,
+            kwargs,
+            profile,
+            tuple(dependencies),
+        )
+
+        return name
+
+    async def run(self):
+        """Runs every task of the graph.
+
+        A task whose dependency fails is skipped rather than run. Failures
+        are logged, so one profile cannot stop the sync of the others.
+
+        Returns:
+            Dictionary of task names and `SchedulerTask`s
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+        profile_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self._profile_concurrency),
+        )
+        futures = {}
+
+        async def run_task(task):
+            dependencies = [futures[dependency] for dependency in task.dependencies]
+            if dependencies:
+                await asyncio.gather(*dependencies)
+
+            failed = [
+                dependency for dependency in task.dependencies
+                if self._tasks[dependency].state != TaskStateType.SUCCEEDED
+            ]
+            if failed:
+                task.state = TaskStateType.SKIPPED
+                log.info(f'Skipped {task.name} because {", ".join(failed)} did not succeed')
+                return
+
+            # The profile's slot is taken first, so tasks waiting on a busy
+            # profile do not hold global slots other profiles could use
+            async with profile_semaphores[task.profile], semaphore:
+                task.state = TaskStateType.RUNNING
+                start_time = time.monotonic()
+                try:
+                    await task.func(*task.args, **task.kwargs)
+                    task.state = TaskStateType.SUCCEEDED
+                except Exception as e:
+                    log.exception(e)
+                    task.error = e
+                    task.state = TaskStateType.FAILED
+                finally:
+                    task.duration = time.monotonic() - start_time
+
+            log.info(f'{round(task.duration, 1)} seconds | {task.state.value} {task.name}')
+
+        # Dependencies are added before their dependents, so each dependency
+        # already has a future when its dependents are started
+        for name, task in self._tasks.items():
+            futures[name] = asyncio.ensure_future(run_task(task))
+
+        start_time = time.monotonic()
+        await asyncio.gather(*futures.values())
+        duration = time.monotonic() - start_time
+
+        self._report(duration)
+
+        return self._tasks
+
+    def _report(self, duration):
+        tasks = sorted(
+            self._tasks.values(),
+            key=lambda task: task.duration or 0,
+            reverse=True,
+        )
+
+        log.info(f'{"Seconds":>10}  {"State":<10}  Task')
+        for task in tasks:
+            seconds = '-' if task.duration is None else round(task.duration, 1)
+            log.info(f'{seconds:>10}  {task.state.value:<10}  {task.name}')
+
+        states = defaultdict(int)
+        for task in tasks:
+            states[task.state.value] += 1
+
+        summary = ', '.join(f'{count} {state}' for state, count in sorted(states.items()))
+        log.info(f'{round(duration/60)} minutes | Ran {len(tasks)} tasks ({summary})')
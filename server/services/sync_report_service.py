@@ -0,0 +1,236 @@
+"""Reports how a run of the `cache` CLI went.
+
+While a `SyncReportService` is open, every sync task records its metrics
+under its advertiser and entity type: API calls, items fetched, page
+latencies, 429s and backoff, and how many items were inserted, updated or
+left unchanged. When it closes, the report is logged as a table, written to
+a JSON file and stored in `visibly.sync_reports`.
+"""
+
+
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+
+import json
+import math
+
+from server.resources.models.aio.sync_report import SyncReport
+from server.services.aws_service import AWSService
+
+
+log = AWSService().log_service
+
+_key = ContextVar('sync_report_key', default=None)
+_report = ContextVar('sync_report', default=None)
+
+COUNTERS = [
+    'api_calls',
+    'items',
+    'inserted',
+    'updated',
+    'unchanged',
+    'throttled',
+    'backoff_seconds',
+    'swept',
+]
+
+
+class SyncReportService:
+    """Collects the metrics of one run of the `cache` CLI.
+
+    Args:
+        command: Name of the command, e.g., 'dsp'
+        arguments: Arguments of the command
+        path: Path of the JSON file, or None to only log and store the report
+    """
+
+    def __init__(self, command, arguments, path=None):
+        self._arguments = arguments
+        self._command = command
+        self._entries = defaultdict(lambda: defaultdict(float))
+        self._latencies = defaultdict(list)
+        self._path = path
+        self._started_at = None
+        self._token = None
+
+    @staticmethod
+    def current():
+        """Returns the report open in the current context, if any."""
+        return _report.get()
+
+    @staticmethod
+    def key():
+        """Returns the advertiser and entity type of the current context."""
+        return _key.get()
+
+    @staticmethod
+    def start(advertiser_id, entity_type):
+        """Records the metrics of the current context under an entity type.
+
+        Args:
+            advertiser_id: Amazon profile or DSP advertiser ID
+            entity_type: Path of the entity type, e.g., 'sp/keywords'
+        """
+        _key.set((advertiser_id, entity_type))
+
+    @staticmethod
+    def count(name, value=1, key=None):
+        """Adds `value` to a counter of the current (or `key`'s) entity type."""
+        report = _report.get()
+        key = key or _key.get()
+        if report is None or key is None:
+            return
+
+        report._entries[key][name] += value
+
+    @staticmethod
+    def fetched(seconds, items):
+        """Records one page requested from Amazon."""
+        report = _report.get()
+        key = _key.get()
+        if report is None or key is None:
+            return
+
+        report._entries[key]['api_calls'] += 1
+        report._entries[key]['items'] += items
+        report._latencies[key].append(seconds)
+
+    @staticmethod
+    def throttled(delay):
+        """Records a 429 and the seconds waited before retrying it."""
+        SyncReportService.count('throttled')
+        SyncReportService.count('backoff_seconds', delay)
+
+    @staticmethod
+    def wrote(result, items, key):
+        """Records a bulk write of `items` items made by `CacheUtility.operations`.
+
+        Each item is written by a replacement that matches only if its hash
+        changed and an upsert that matches every cached item, so the upserts
+        that matched are the cached items and the remaining matches are the
+        changed ones.
+        """
+        if _report.get() is None or key is None:
+            return
+
+        inserted = result.upserted_count
+        updated = result.matched_count - (items - inserted)
+
+        SyncReportService.count('inserted', inserted, key)
+        SyncReportService.count('updated', updated, key)
+        SyncReportService.count('unchanged', items - inserted - updated, key)
+
+    async def __aenter__(self):
+        self._started_at = datetime.utcnow()
+        self._token = _report.set(self)
+
+        return self
+
+    async def __aexit__(self, *args):
+        _report.reset(self._token)
+
+        report = self.to_dict()
+
+        self._log(report)
+
+        if self._path:
+            with open(self._path, 'w') as write_file:
+                json.dump(report, write_file, default=str, indent=2)
+
+            log.info(f'Wrote sync report to {self._path}')
+
+        await SyncReport.create(
+            report,
+            AWSService().docdb_service.motor_client,
+        )
+
+    def to_dict(self):
+        finished_at = datetime.utcnow()
+
+        entries = []
+        advertisers = defaultdict(lambda: defaultdict(float))
+        totals = defaultdict(float)
+        for (advertiser_id, entity_type), counters in sorted(self._entries.items()):
+            latencies = sorted(self._latencies[(advertiser_id, entity_type)])
+            entry = {
+                'advertiser_id': advertiser_id,
+                'entity_type': entity_type,
+                'p50_page_seconds': _percentile(latencies, 50),
+                'p95_page_seconds': _percentile(latencies, 95),
+            }
+
+            for name in COUNTERS:
+                value = counters[name]
+                entry[name] = value
+                advertisers[advertiser_id][name] += value
+                totals[name] += value
+
+            entries.append(entry)
+
+        return {
+            'arguments': self._arguments,
+            'command': self._command,
+            'duration': (finished_at - self._started_at).total_seconds(),
+            'entries': entries,
+            'advertisers': {
+                advertiser_id: dict(counters)
+                for advertiser_id, counters in advertisers.items()
+            },
+            'finished_at': finished_at,
+            'started_at': self._started_at,
+            'totals': dict(totals),
+        }
+
+    def _log(self, report):
+        columns = [
+            ('Advertiser', 'advertiser_id', 16),
+            ('Entity', 'entity_type', 36),
+            ('Calls', 'api_calls', 7),
+            ('Items', 'items', 8),
+            ('Inserted', 'inserted', 9),
+            ('Updated', 'updated', 8),
+            ('Unchanged', 'unchanged', 10),
+            ('429s', 'throttled', 5),
+            ('Backoff', 'backoff_seconds', 8),
+            ('p50', 'p50_page_seconds', 6),
+            ('p95', 'p95_page_seconds', 6),
+        ]
+
+        log.info('  '.join(f'{title:>{width}}' for title, _, width in columns))
+        for entry in report['entries']:
+            log.info('  '.join(
+                f'{_format(entry[name]):>{width}}' for _, name, width in columns
+            ))
+
+        totals = report['totals']
+        log.info(
+            f'{round(report["duration"]/60)} minutes | '
+            f'{_format(totals.get("api_calls", 0))} API calls, '
+            f'{_format(totals.get("items", 0))} items '
+            f'({_format(totals.get("inserted", 0))} inserted, '
+            f'{_format(totals.get("updated", 0))} updated, '
+            f'{_format(totals.get("unchanged", 0))} unchanged), '
+            f'{_format(totals.get("throttled", 0))} 429s, '
+            f'{_format(totals.get("backoff_seconds", 0))} seconds of backoff',
+        )
+
+
+def _format(value):
+    if value is None:
+        return '-'
+
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 2)
+
+    return value
+
+
+def _percentile(values, percentile):
+    # Nearest rank of sorted values
+    if not values:
+        return None
+
+    rank = math.ceil(percentile / 100 * len(values))
+
+    return round(values[max(rank, 1) - 1], 3)
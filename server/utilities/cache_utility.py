@@ -1,9 +1,89 @@
+from datetime import datetime
+
+import hashlib
+import json
+
+from pymongo import (
+    ReplaceOne,
+    UpdateOne,
+)
+
 from server.core.constants import Constants
 
 
 class CacheUtility:
     """Utility methods used by `CacheDecorator`."""
 
+    def content_hash(self, item):
+        """Hashes the content of a model (item).
+
+        Fields added by the cache, i.e., whose names start with an
+        underscore, are excluded, so an item hashes the same before and
+        after it is cached.
+
+        Args:
+            item: An Amazon Advertising model
+
+        Returns:
+            Hexadecimal SHA-1 digest of the item
+        """
+        content = {
+            key: value for key, value in item.items()
+            if not key.startswith(Constants.UNDERSCORE)
+        }
+
+        return hashlib.sha1(
+            json.dumps(content, default=str, sort_keys=True).encode(),
+        ).hexdigest()
+
+    def operations(self, replacements, generation=None):
+        """Transforms items to bulk write operations that skip unchanged items.
+
+        Each item is stored with the hash of its content (`_hash`) and the
+        time it last changed (`_updated_at`). A cached item is replaced only
+        if its hash differs and a missing item is inserted, so unchanged
+        items are not written at all. Neither operation matches a document
+        the other one writes, so the operations may run unordered.
+
+        With a `generation`, every item is also stamped with it as
+        `_sync_generation`, which does write unchanged items.
+
+        Args:
+            replacements: List of queries and the items they match
+            generation: Sync generation of the items, if any
+
+        Returns:
+            List of pymongo operations
+        """
+        updated_at = datetime.utcnow()
+        operations = []
+        for query, item in replacements:
+            item['_hash'] = self.content_hash(item)
+            item['_updated_at'] = updated_at
+
+            update = { '$setOnInsert': item }
+            if generation is not None:
+                # A field cannot be both inserted and set
+                update = {
+                    '$set': { '_sync_generation': generation },
+                    '$setOnInsert': item.copy(),
+                }
+                item['_sync_generation'] = generation
+
+            operations.extend([
+                ReplaceOne(
+                    { '$and': [ query, { '_hash': { '$ne': item['_hash'] } } ] },
+                    item,
+                ),
+                UpdateOne(
+                    query,
+                    update,
+                    upsert=True,
+                ),
+            ])
+
+        return operations
+
     def stringify_id(self, item, path):
         """Transforms integer identifiers to strings for a single model (item).
 
@@ -63,7 +143,7 @@ class CacheUtility:
         elif Constants.KEYWORDS in path:
             return ['adGroupId', 'campaignId', 'keywordId']
         elif Constants.PORTFOLIOS in path:
-            return 'portfolioId'
+            return ['portfolioId']
         elif 'product_ads' in path:
             return ['adGroupId', 'adId', 'campaignId']
         elif Constants.TARGETS in path:
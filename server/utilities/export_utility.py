@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+
+class ExportUtility:
+    """Serializes rows for streaming exports.
+
+    Each method is a generator that yields one serialized row at a time,
+    so an export holds a single row in memory regardless of its size.
+    """
+
+    def to_csv(self, rows, fields):
+        """Serializes rows as CSV, starting with a header row.
+
+        Args:
+            rows: Iterable of dicts
+            fields: Column names, in order
+
+        Returns:
+            Generator of CSV lines
+        """
+        buffer = io.StringIO()
+        writer = csv.DictWriter(
+            buffer,
+            fieldnames=fields,
+            extrasaction='ignore',
+        )
+
+        writer.writeheader()
+        yield self._drain(buffer)
+
+        for row in rows:
+            writer.writerow(row)
+            yield self._drain(buffer)
+
+    def to_ndjson(self, rows):
+        """Serializes rows as newline-delimited JSON.
+
+        Args:
+            rows: Iterable of JSON-serializable dicts
+
+        Returns:
+            Generator of JSON lines
+        """
+        for row in rows:
+            yield f'{json.dumps(row)}\n'
+
+    def _drain(self, buffer):
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+        return value
@@ -0,0 +1,74 @@
+from datetime import (
+    date,
+    datetime,
+)
+
+from server.core.constants import Constants
+
+
+class IndexUtility:
+    """Names the monthly Elasticsearch indices behind an advertiser's alias.
+
+    Report documents are partitioned by month of `report_date` into indices
+    named `<alias>-<YYYY.MM>`, e.g., `sa_1110250468092771-2021.07`, where the
+    alias (e.g., `sa_1110250468092771`) spans every month.
+    """
+
+    def monthly_index(self, alias, value):
+        """Names the monthly index that holds documents reported on `value`."""
+        value = self.to_date(value)
+
+        return f'{alias}{Constants.DASH}{value.strftime(Constants.MONTHLY_INDEX_DATE_FORMAT)}'
+
+    def monthly_indices(self, alias, start_date, end_date):
+        """Names every monthly index between `start_date` and `end_date`.
+
+        Args:
+            alias: Alias over an advertiser's monthly indices
+            start_date: First report date of the range (inclusive)
+            end_date: Last report date of the range (inclusive)
+
+        Returns:
+            List of monthly index names in chronological order
+        """
+        start_date, end_date = self.to_date(start_date), self.to_date(end_date)
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+
+        indices = []
+        year, month = start_date.year, start_date.month
+        while (year, month) <= (end_date.year, end_date.month):
+            indices.append(
+                self.monthly_index(alias, date(year, month, 1)),
+            )
+
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+        return indices
+
+    def to_date(self, value):
+        """Transforms a `date`, `datetime` or date string into a `date`.
+
+        Strings may use the formats YYYY-MM-DD or YYYYMMDD.
+
+        Returns:
+            `date`, or None if `value` is empty or cannot be parsed
+        """
+        if not value:
+            return None
+
+        if isinstance(value, datetime):
+            return value.date()
+
+        if isinstance(value, date):
+            return value
+
+        for date_format in [Constants.DATE_FORMAT_YYYY_MM_DD, Constants.DATE_FORMAT_YYYYMMDD]:
+            try:
+                return datetime.strptime(str(value)[:10], date_format).date()
+            except ValueError:
+                continue
+
+        return None
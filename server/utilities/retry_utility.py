@@ -0,0 +1,26 @@
+"""Spaces out retries of rejected or failed requests."""
+
+
+import random
+
+
+def backoff(attempt, initial_backoff, max_backoff):
+    """Finds the delay before a retry, with "full jitter".
+
+    The bound of the delay doubles with each attempt, from `initial_backoff`
+    up to `max_backoff`, and the delay is drawn uniformly below it, so
+    retries from concurrent callers are spread over the window instead of
+    arriving together.
+
+    Args:
+        attempt: Number of retries so far, starting from 0
+        initial_backoff: Bound of the first delay in seconds
+        max_backoff: Maximum bound of a delay in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    return random.uniform(
+        0,
+        min(max_backoff, initial_backoff * (2 ** attempt)),
+    )
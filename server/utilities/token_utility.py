@@ -13,7 +13,8 @@ from starlette.requests import Request
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from server.core.constants import Constants
-from server.resources.models.brand import Brand
+from server.managers.token_manager import TokenManager
+from server.resources.models.aio.brand import Brand
 from server.resources.schema.token import (
     AccessToken,
     Header,
@@ -35,12 +36,6 @@ class Bearer(HTTPBearer):
 
     async def __call__(self, request: Request):
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
-        aws_service = AWSService()
-        ssm_service = aws_service.ssm_service
-        authenticator = AuthService(
-            ssm_service,
-            None,
-        )
 
         if credentials:
             if not credentials.scheme == Constants.BEARER:
@@ -61,43 +56,52 @@ class Bearer(HTTPBearer):
                     status_code=HTTP_401_UNAUTHORIZED,
                     detail=Constants.INVALID_TOKEN_FORMAT,
                 )
-            
-            try:
-                client = aws_service.docdb_service.client
-
-                token = Token(
-                    claims=AccessToken.parse_obj(
-                        jwt.get_unverified_claims(jwt_token),
-                    ),
-                    header=Header.parse_obj(
-                        jwt.get_unverified_header(jwt_token),
-                    ),
-                    jwt_token=jwt_token,
-                )
 
-                brands = Brand.with_user(
-                    ObjectId(token.claims.id),
-                    client,
-                )
+            token_manager = TokenManager()
+            cached = token_manager.get(jwt_token)
+            if cached is None:
+                cached = await self._verify(jwt_token)
+                token_manager.set(jwt_token, *cached)
 
-                brand_ids = [str(brand._id) for brand in brands]
-
-                if not brand_ids or not token.claims.brand in brand_ids:
-                    raise HTTPException(
-                        status_code=HTTP_401_UNAUTHORIZED,
-                        detail=Constants.USER_ACCESS_DENIED,
-                    )
-
-                if not authenticator.is_valid_token(token.jwt_token):
-                    raise HTTPException(
-                        status_code=HTTP_401_UNAUTHORIZED,
-                        detail=Constants.INVALID_JWT_TOKEN,
-                    )
-            except JWTError as e:
-                log.exception(e)
+            token, brand_ids = cached
+
+            if not token.claims.brand in brand_ids:
                 raise HTTPException(
                     status_code=HTTP_401_UNAUTHORIZED,
-                    detail=Constants.SESSION_EXPIRED,
+                    detail=Constants.USER_ACCESS_DENIED,
                 )
 
             return token
+
+    async def _verify(self, jwt_token):
+        aws_service = AWSService()
+        authenticator = AuthService(
+            aws_service.ssm_service,
+            None,
+        )
+
+        try:
+            client = aws_service.docdb_service.motor_client
+
+            token = Token(
+                claims=AccessToken.parse_obj(
+                    authenticator.verify_token(jwt_token),
+                ),
+                header=Header.parse_obj(
+                    jwt.get_unverified_header(jwt_token),
+                ),
+                jwt_token=jwt_token,
+            )
+
+            brand_ids = await Brand.brand_ids_with_user(
+                ObjectId(token.claims.id),
+                client,
+            )
+        except JWTError as e:
+            log.exception(e)
+            raise HTTPException(
+                status_code=HTTP_401_UNAUTHORIZED,
+                detail=Constants.SESSION_EXPIRED,
+            )
+
+        return token, brand_ids
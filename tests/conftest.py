@@ -5,6 +5,7 @@ import time
 import uuid
 
 from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
 import pymongo
 import pytest
@@ -94,23 +95,48 @@ def test_client():
 
             class DocumentDBServiceMock:
 
-                def __init__(self, client):
+                def __init__(self, client, uri):
                     self._client = client
+                    self._motor_client = None
+                    self._uri = uri
 
                 @property
                 def client(self):
                     return self._client
 
+                @property
+                def motor_client(self):
+                    if self._motor_client is None:
+                        self._motor_client = AsyncIOMotorClient(self._uri)
+
+                    return self._motor_client
+
 
             # token_utility.py (a circular dependency of dependencies.py) cannot
             # have its dependency on 'client' stubbed. This is a workaround to
             # enable local testing.
-            docdb_service_mock = DocumentDBServiceMock(client)
+            docdb_service_mock = DocumentDBServiceMock(
+                client,
+                mongo.get_connection_url(),
+            )
             AWSService._AWSService__docdb_service = docdb_service_mock
 
             yield client
 
 
+@pytest.fixture()
+def async_test_client(event_loop, test_client):
+    docdb_service = AWSService().docdb_service
+
+    # Motor binds to the event loop that first uses it, and every test runs
+    # in its own loop
+    docdb_service._motor_client = None
+
+    yield docdb_service.motor_client
+
+    docdb_service._motor_client = None
+
+
 @pytest.fixture()
 def sandbox_brand(test_client):
     brand = Brand.find_by_name(
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from server.cli.commands.cache import (
+    batches,
+    SyncCursor,
+)
+
+
+@pytest.mark.cli
+def test_sync_cursor_skips_cached_batches():
+    cursor = SyncCursor(
+        '1',
+        'dsp/line_items',
+        { 'batch': 1, 'start_index': 200 },
+    )
+
+    order_ids = [str(order_id) for order_id in range(5)]
+    resumed = []
+    for order_id_batch in cursor.batches(batches(order_ids, 2)):
+        resumed.append((order_id_batch, cursor.start_index))
+
+    expected = [
+        (['2', '3'], 200),
+        (['4'], 0),
+    ]
+    actual = resumed
+
+    assert expected == actual
+
+    expected = 2
+    actual = cursor.batch
+
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.cli
+async def test_sync_cursor_gathers_batches_concurrently():
+    class _Cursor(SyncCursor):
+
+        async def save(self, start_index=0, next_token=None):
+            self.start_index = start_index
+            saves.append(self.batch)
+
+    saves = []
+    cursor = _Cursor('1', 'dsp/line_items', { 'batch': 1, 'start_index': 200 })
+    running, peak = 0, 0
+    start_indexes = {}
+
+    async def fetch(index, order_id_batch, start_index):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        start_indexes[index] = start_index
+        # Later batches finish first
+        await asyncio.sleep(0.01 * (5 - index))
+        running -= 1
+
+    await cursor.gather(batches(list(range(10)), 2), fetch, 2)
+
+    expected = {1: 200, 2: 0, 3: 0, 4: 0}
+    actual = start_indexes
+
+    assert expected == actual
+    assert peak == 2
+    assert saves[-1] == 5
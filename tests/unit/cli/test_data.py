@@ -0,0 +1,127 @@
+from datetime import date
+
+import json
+
+import click
+import pytest
+
+from server.cli.commands.data import (
+    _max_seq_nos,
+    _month_mismatches,
+    _ndjson_actions,
+    _raise_for_task,
+)
+
+
+@pytest.mark.cli
+def test_ndjson_actions_write_partitioned_documents_by_month(tmp_path):
+    path = tmp_path / 'reports.ndjson'
+    path.write_text('\n'.join([
+        json.dumps({ 'id': '1', 'report_date': '2021-07-31' }),
+        json.dumps({ 'id': '2', 'report_date': '2021-08-01' }),
+        json.dumps({ 'id': '3' }),
+    ]))
+
+    expected = ['sa_1-2021.07', 'sa_1-2021.08', 'sa_1']
+    actual = [
+        action['_index'] for action in _ndjson_actions(str(path), 'sa_1', 'id', True)
+    ]
+    assert expected == actual
+
+    expected = ['sa_1', 'sa_1', 'sa_1']
+    actual = [
+        action['_index'] for action in _ndjson_actions(str(path), 'sa_1', 'id')
+    ]
+    assert expected == actual
+
+
+class _Indices:
+
+    def __init__(self, counts):
+        self._counts = counts
+
+    def exists(self, index):
+        return index in self._counts
+
+    def stats(self, index, level):
+        return {
+            'indices': {
+                index: {
+                    'shards': {
+                        '0': [
+                            { 'routing': { 'primary': True }, 'seq_no': { 'max_seq_no': 10 } },
+                            { 'routing': { 'primary': False }, 'seq_no': { 'max_seq_no': 9 } },
+                        ],
+                    },
+                },
+            },
+        }
+
+
+class _Client:
+
+    def __init__(self, counts):
+        self._counts = counts
+        self.indices = _Indices(counts)
+
+    def count(self, index):
+        return { 'count': self._counts[index] }
+
+
+@pytest.mark.cli
+def test_max_seq_nos_reads_primary_shards():
+    expected = { ('sa_1', '0',): 10 }
+    actual = _max_seq_nos(_Client({}), 'sa_1')
+    assert expected == actual
+
+
+@pytest.mark.cli
+def test_month_mismatches_compares_every_month(mocker):
+    mocker.patch(
+        'server.cli.commands.data._report_months',
+        return_value=[(date(2021, 7, 1), 2), (date(2021, 8, 1), 1), (date(2021, 9, 1), 1)],
+    )
+
+    client = _Client({
+        'sa_1': 4,
+        'sa_1-*': 4,
+        'sa_1-2021.07': 2,
+        'sa_1-2021.08': 2,
+    })
+
+    # Months may differ even when the totals match
+    expected = [
+        'sa_1-2021.08 holds 2 of 1 documents',
+        'sa_1-2021.09 holds 0 of 1 documents',
+    ]
+    actual = _month_mismatches(client, 'sa_1')
+    assert expected == actual
+
+    client = _Client({
+        'sa_1': 4,
+        'sa_1-*': 3,
+        'sa_1-2021.07': 2,
+        'sa_1-2021.08': 1,
+        'sa_1-2021.09': 1,
+    })
+
+    expected = ['sa_1 holds 4 documents, but its monthly indices hold 3']
+    actual = _month_mismatches(client, 'sa_1')
+    assert expected == actual
+
+
+@pytest.mark.cli
+def test_raise_for_task_raises_for_failed_and_cancelled_tasks():
+    task = { 'description': 'reindex from [sa_1] to [sa_1-2021.07]' }
+
+    # Completed tasks do not raise
+    _raise_for_task({ 'completed': True, 'task': task, 'response': { 'failures': [] } })
+
+    responses = [
+        { 'completed': True, 'task': task, 'error': { 'type': 'index_not_found_exception' } },
+        { 'completed': True, 'task': task, 'response': { 'failures': [{ 'status': 409 }] } },
+        { 'completed': True, 'task': task, 'response': { 'canceled': 'by user request', 'failures': [] } },
+    ]
+    for response in responses:
+        with pytest.raises(click.ClickException):
+            _raise_for_task(response)
@@ -0,0 +1,276 @@
+import pytest
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from server.core.constants import Constants
+from server.decorators.cache_decorator import cache_all
+from server.dependencies import Interface
+
+
+CAMPAIGNS_PATH = '/api/v1/amazon/aa/sp/campaigns'
+ORDERS_PATH = '/api/v1/amazon/aa/dsp/orders'
+PORTFOLIOS_PATHS = [
+    '/api/v1/amazon/aa/portfolios',
+    '/api/v1/amazon/aa/portfolios/list',
+    '/api/v1/amazon/aa/portfolios/graphs/index',
+]
+
+
+class _Response:
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def _klass(requests, respond):
+    # Stands in for an amazon-api interface, e.g., `Campaign`, and records
+    # the query parameters of each list request
+    class _Interface:
+
+        def __init__(self, client, advertiser_id):
+            self._advertiser_id = advertiser_id
+
+        def index(self, **params):
+            requests.append(params)
+
+            return _Response(respond(params))
+
+    return _Interface
+
+
+def _request(path, query_string=''):
+    return Request({
+        'headers': [],
+        'method': 'GET',
+        'path': path,
+        'query_string': query_string.encode(),
+        'scheme': 'http',
+        'server': ('getvisibly.com', 443,),
+        'type': 'http',
+    })
+
+
+async def _cached(client, advertiser_id, path):
+    return await client.amazon[advertiser_id].find(
+        { '_path': path },
+        { '_id': 0, '_hash': 0, '_path': 0, '_updated_at': 0 },
+    ).to_list(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_refresh_requests_ids_in_batches(mocker, async_test_client):
+    mocker.patch.object(Constants, 'REFRESH_BATCH_SIZE', 2)
+
+    requests = []
+    interface = Interface(
+        None,
+        _klass(
+            requests,
+            lambda params: [
+                { 'campaignId': int(campaign_id), 'state': 'paused' }
+                for campaign_id in params['campaignIdFilter'].split(Constants.COMMA)
+            ],
+        ),
+    )
+
+    campaigns = await interface.refresh(
+        advertiser_id='1',
+        id_filter='campaignIdFilter',
+        ids=[1, 2, None, 3, 4, 5],
+        paths=[CAMPAIGNS_PATH],
+        count=10,
+    )
+
+    expected = [
+        { 'campaignIdFilter': '1,2', 'count': 10 },
+        { 'campaignIdFilter': '3,4', 'count': 10 },
+        { 'campaignIdFilter': '5', 'count': 10 },
+    ]
+    actual = requests
+    assert expected == actual
+
+    expected = [1, 2, 3, 4, 5]
+    actual = [campaign['campaignId'] for campaign in campaigns]
+    assert expected == actual
+
+    # Sponsored Ads IDs are cached as strings
+    expected = ['1', '2', '3', '4', '5']
+    actual = sorted(
+        campaign['campaignId']
+        for campaign in await _cached(async_test_client, '1', CAMPAIGNS_PATH)
+    )
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_refresh_reads_dsp_entities_from_response(async_test_client):
+    requests = []
+    interface = Interface(
+        None,
+        _klass(
+            requests,
+            lambda params: {
+                'totalResults': 2,
+                'response': [
+                    { 'orderId': order_id, 'name': f'Order {order_id}' }
+                    for order_id in params['orderIdFilter'].split(Constants.COMMA)
+                ],
+            },
+        ),
+    )
+
+    orders = await interface.refresh(
+        advertiser_id='entity',
+        id_filter='orderIdFilter',
+        ids=['1', '2'],
+        paths=[ORDERS_PATH],
+        dsp_advertiser_id='advertiser',
+    )
+
+    expected = [
+        { 'orderId': '1', 'name': 'Order 1' },
+        { 'orderId': '2', 'name': 'Order 2' },
+    ]
+    actual = orders
+    assert expected == actual
+
+    # DSP entities are cached in the advertiser's collection, not the entity's
+    actual = sorted(
+        await _cached(async_test_client, 'advertiser', ORDERS_PATH),
+        key=lambda order: order['orderId'],
+    )
+    assert expected == actual
+
+    expected = []
+    actual = await _cached(async_test_client, 'entity', ORDERS_PATH)
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_refresh_caches_portfolios_for_every_path(async_test_client):
+    requests = []
+    interface = Interface(
+        None,
+        _klass(
+            requests,
+            lambda params: [
+                { 'portfolioId': int(portfolio_id), 'name': f'Portfolio {portfolio_id}' }
+                for portfolio_id in params['portfolioIdFilter'].split(Constants.COMMA)
+            ],
+        ),
+    )
+
+    portfolios = await interface.refresh(
+        advertiser_id='1',
+        id_filter='portfolioIdFilter',
+        ids=[1, 2],
+        paths=PORTFOLIOS_PATHS,
+    )
+
+    # Portfolios are listed once, however many paths cache them
+    expected = 1
+    actual = len(requests)
+    assert expected == actual
+
+    expected = [
+        { 'portfolioId': 1, 'name': 'Portfolio 1' },
+        { 'portfolioId': 2, 'name': 'Portfolio 2' },
+    ]
+    actual = portfolios
+    assert expected == actual
+
+    for path in PORTFOLIOS_PATHS:
+        expected = ['1', '2']
+        actual = sorted(
+            portfolio['portfolioId']
+            for portfolio in await _cached(async_test_client, '1', path)
+        )
+        assert expected == actual
+
+    expected = { 'portfolioId', 'name' }
+    actual = set((await _cached(async_test_client, '1', PORTFOLIOS_PATHS[0]))[0])
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_cache_all_replaces_cached_entities(async_test_client):
+    campaigns = [{ 'campaignId': 1, 'state': 'enabled' }]
+
+    await cache_all(
+        '1',
+        CAMPAIGNS_PATH,
+        campaigns,
+    )
+
+    # Entities are cached as copies
+    expected = [{ 'campaignId': 1, 'state': 'enabled' }]
+    actual = campaigns
+    assert expected == actual
+
+    await cache_all(
+        '1',
+        CAMPAIGNS_PATH,
+        [{ 'campaignId': 1, 'state': 'paused' }],
+    )
+
+    expected = [('1', 'paused',)]
+    actual = [
+        (campaign['campaignId'], campaign['state'],)
+        for campaign in await _cached(async_test_client, '1', CAMPAIGNS_PATH)
+    ]
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_cache_all_writes_nothing_without_entities(async_test_client):
+    result = await cache_all(
+        '1',
+        CAMPAIGNS_PATH,
+        [],
+    )
+
+    assert result is None
+
+    expected = []
+    actual = await _cached(async_test_client, '1', CAMPAIGNS_PATH)
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.decorators
+async def test_index_requests_empty_dsp_path_once(async_test_client):
+    requests = []
+    interface = Interface(
+        None,
+        _klass(
+            requests,
+            lambda params: { 'totalResults': 0, 'response': [] },
+        ),
+    )
+
+    for _ in range(2):
+        orders = await interface.index(
+            advertiser_id='entity',
+            dsp_advertiser_id='advertiser',
+            request=_request(ORDERS_PATH, 'name=Order&statusFilter=DELIVERING'),
+            response=Response(),
+        )
+
+        expected = []
+        actual = orders
+        assert expected == actual
+
+    # The entity's orders are narrowed to the advertiser, and the empty
+    # response is not requested again
+    expected = [{ 'statusFilter': 'DELIVERING', 'advertiserIdFilter': 'advertiser' }]
+    actual = requests
+    assert expected == actual
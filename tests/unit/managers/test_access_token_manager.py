@@ -0,0 +1,194 @@
+from datetime import (
+    datetime,
+    timezone,
+)
+
+import threading
+import time
+
+import pytest
+
+from server.core.constants import Constants
+from server.dependencies import Interface
+from server.managers.access_token_manager import AccessTokenManager
+
+
+class _SharedSSMService:
+
+    def __init__(self, access_tokens, modified_at, released=None):
+        self.reads = 0
+        self._access_tokens = access_tokens
+        self._modified_at = modified_at
+        self._released = released
+
+    def parameter(self, name):
+        self.reads += 1
+
+        # Reads after the first wait until they are released
+        if self._released and self.reads > 1:
+            self._released.wait(1)
+
+        return {
+            'LastModifiedDate': self._modified_at,
+            'Value': self._access_tokens[min(self.reads, len(self._access_tokens)) - 1],
+        }
+
+
+class _Request:
+
+    def __init__(self, access_token):
+        self.headers = { 'Authorization': f'Bearer {access_token}' }
+
+
+class _Response:
+
+    def __init__(self, status_code, access_token):
+        self.request = _Request(access_token)
+        self.status_code = status_code
+
+
+@pytest.fixture()
+def access_token_manager(mocker):
+    # A new instance rather than the singleton, so every test starts without
+    # a cached token
+    access_token_manager = AccessTokenManager.__wrapped__()
+    mocker.patch(
+        'server.dependencies.AccessTokenManager',
+        return_value=access_token_manager,
+    )
+
+    return access_token_manager
+
+
+def _now(mocker, now):
+    mocker.patch(
+        'server.managers.access_token_manager.time.time',
+        return_value=now,
+    )
+
+
+@pytest.mark.managers
+def test_access_token_is_cached_until_it_expires(mocker, access_token_manager):
+    now = time.time()
+    shared_ssm_service = _SharedSSMService(
+        ['token-1', 'token-2'],
+        datetime.fromtimestamp(now, timezone.utc),
+    )
+
+    _now(mocker, now)
+
+    expected = ['token-1', 'token-1']
+    actual = [
+        access_token_manager.access_token(shared_ssm_service),
+        access_token_manager.access_token(shared_ssm_service),
+    ]
+    assert expected == actual
+
+    expected = 1
+    actual = shared_ssm_service.reads
+    assert expected == actual
+
+    _now(mocker, now + Constants.AMAZON_AA_ACCESS_TOKEN_LIFETIME + 1)
+
+    expected = 'token-2'
+    actual = access_token_manager.access_token(shared_ssm_service)
+    assert expected == actual
+
+
+@pytest.mark.managers
+def test_access_token_is_refreshed_in_background_before_it_expires(mocker, access_token_manager):
+    now = time.time()
+    released = threading.Event()
+    shared_ssm_service = _SharedSSMService(
+        ['token-1', 'token-2'],
+        datetime.fromtimestamp(now, timezone.utc),
+        released,
+    )
+
+    _now(mocker, now)
+    access_token_manager.access_token(shared_ssm_service)
+
+    _now(mocker, now + Constants.AMAZON_AA_ACCESS_TOKEN_LIFETIME - Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_MARGIN + 1)
+
+    # The cached token is returned while it is read again
+    expected = 'token-1'
+    actual = access_token_manager.access_token(shared_ssm_service)
+    assert expected == actual
+
+    released.set()
+    for _ in range(100):
+        if not access_token_manager._refreshing:
+            break
+
+        time.sleep(0.01)
+
+    expected = 'token-2'
+    actual = access_token_manager.access_token(shared_ssm_service)
+    assert expected == actual
+
+
+@pytest.mark.managers
+def test_invalidate_reads_rejected_token_again(mocker, access_token_manager):
+    now = time.time()
+    shared_ssm_service = _SharedSSMService(
+        ['token-1', 'token-2'],
+        datetime.fromtimestamp(now, timezone.utc),
+    )
+
+    _now(mocker, now)
+    access_token_manager.access_token(shared_ssm_service)
+
+    # A token read moments ago has not been rotated since
+    assert not access_token_manager.invalidate('token-1')
+
+    _now(mocker, now + Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL + 1)
+
+    assert access_token_manager.invalidate('token-1')
+
+    expected = 'token-2'
+    actual = access_token_manager.access_token(shared_ssm_service)
+    assert expected == actual
+
+    # A token that was already replaced is not read again
+    assert access_token_manager.invalidate('token-1')
+
+    expected = 2
+    actual = shared_ssm_service.reads
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_interface_retries_rejected_token_once(mocker, access_token_manager):
+    now = time.time()
+    shared_ssm_service = _SharedSSMService(
+        ['token-1', 'token-2'],
+        datetime.fromtimestamp(now, timezone.utc),
+    )
+
+    access_token_manager.access_token(shared_ssm_service)
+
+    def request():
+        access_token = access_token_manager.access_token(shared_ssm_service)
+
+        return _Response(
+            200 if access_token == 'token-2' else Constants.UNAUTHORIZED_STATUS_CODE,
+            access_token,
+        )
+
+    interface = Interface(None, object)
+
+    # The token was read moments ago, so the request is not retried
+    expected = Constants.UNAUTHORIZED_STATUS_CODE
+    actual = (await interface._request('1', request)).status_code
+    assert expected == actual
+
+    _now(mocker, now + Constants.AMAZON_AA_ACCESS_TOKEN_REFRESH_INTERVAL + 1)
+
+    expected = 200
+    actual = (await interface._request('1', request)).status_code
+    assert expected == actual
+
+    expected = 2
+    actual = shared_ssm_service.reads
+    assert expected == actual
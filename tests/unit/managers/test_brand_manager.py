@@ -1,3 +1,5 @@
+import contextvars
+
 import pytest
 
 from server.managers.brand_manager import BrandManager
@@ -22,4 +24,22 @@ def test_brand_manager_is_configured_by_brand_dependency(test_brand):
     expected = '1110250468092771'
     actual = brand_manager.brand.amazon.aa.sa.advertiser_id
 
-    assert expected == actual
\ No newline at end of file
+    assert expected == actual
+
+
+@pytest.mark.managers
+def test_brand_manager_scopes_brand_to_context():
+    brand_manager = BrandManager()
+
+    def _brand(brand):
+        brand_manager.brand = brand
+        return brand_manager.brand
+
+    expected = ['brand_a', 'brand_b']
+    actual = [
+        contextvars.copy_context().run(_brand, 'brand_a'),
+        contextvars.copy_context().run(_brand, 'brand_b'),
+    ]
+
+    assert expected == actual
+    assert brand_manager.brand not in expected
@@ -0,0 +1,38 @@
+import threading
+
+import pytest
+
+from server.managers.brand_manager import BrandManager
+from server.managers.executor_manager import ExecutorManager
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_executor_manager_runs_calls_outside_event_loop_thread():
+    executor_manager = ExecutorManager()
+
+    expected = threading.get_ident()
+    actual = await executor_manager.docdb(threading.get_ident)
+
+    assert expected != actual
+
+    metrics = executor_manager.metrics()
+
+    assert metrics['docdb']['active'] == 0
+    assert metrics['docdb']['completed'] >= 1
+    assert metrics['docdb']['queued'] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_executor_manager_propagates_context():
+    brand_manager = BrandManager()
+    brand_manager.brand = 'brand'
+
+    def _brand():
+        return brand_manager.brand
+
+    expected = 'brand'
+    actual = await ExecutorManager().es(_brand)
+
+    assert expected == actual
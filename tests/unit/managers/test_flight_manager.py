@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from server.managers.flight_manager import FlightManager
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_flight_manager_coalesces_identical_requests():
+    flight_manager = FlightManager()
+    calls = []
+
+    async def request(path):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return {'path': path}
+
+    results = await asyncio.gather(
+        flight_manager.run(('1', '/campaigns'), request, '/campaigns'),
+        flight_manager.run(('1', '/campaigns'), request, '/campaigns'),
+        flight_manager.run(('1', '/keywords'), request, '/keywords'),
+    )
+
+    expected = ['/campaigns', '/keywords']
+    actual = calls
+    assert expected == actual
+
+    expected = [
+        {'path': '/campaigns'},
+        {'path': '/campaigns'},
+        {'path': '/keywords'},
+    ]
+    actual = results
+    assert expected == actual
+    assert results[0] is not results[1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_flight_manager_requests_again_after_a_request_finishes():
+    flight_manager = FlightManager()
+    calls = []
+
+    async def request():
+        calls.append(1)
+        raise ValueError('Throttled')
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await flight_manager.run(('1', '/campaigns'), request)
+
+    expected = 2
+    actual = len(calls)
+    assert expected == actual
@@ -0,0 +1,84 @@
+import pytest
+
+from server.managers.rate_limit_manager import (
+    RateLimitManager,
+    TokenBucket,
+)
+
+
+class _Response:
+
+    def __init__(self, status_code, headers=None):
+        self.headers = headers or {}
+        self.status_code = status_code
+
+
+@pytest.mark.managers
+def test_token_bucket_paces_requests_beyond_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[0] == 0
+    assert delays[1] == 0
+    assert 0.05 < delays[2] <= 0.1
+    assert 0.15 < delays[3] <= 0.2
+
+
+@pytest.mark.managers
+def test_token_bucket_throttles_and_recovers():
+    bucket = TokenBucket(rate=10, burst=10, min_rate=1, recovery=0.5)
+
+    bucket.throttle(30)
+
+    expected = 5
+    actual = bucket.rate
+
+    assert expected == actual
+    assert bucket.reserve() > 29
+
+    bucket.succeed()
+    bucket.succeed()
+
+    expected = 10
+    actual = bucket.rate
+
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.managers
+async def test_rate_limit_manager_retries_after_too_many_requests():
+    responses = [
+        _Response(429, { 'Retry-After': '0' }),
+        _Response(429, { 'Retry-After': '0' }),
+        _Response(200),
+    ]
+
+    async def request():
+        return responses.pop(0)
+
+    delays = []
+
+    rate_limit_manager = RateLimitManager()
+    response = await rate_limit_manager.request(
+        '1',
+        'test',
+        request,
+        on_throttle=delays.append,
+    )
+
+    expected = 200
+    actual = response.status_code
+
+    assert expected == actual
+
+    expected = [0, 0]
+    actual = delays
+
+    assert expected == actual
+
+    metrics = rate_limit_manager.metrics()['1/test']
+
+    assert metrics['requests'] == 3
+    assert metrics['throttled'] == 2
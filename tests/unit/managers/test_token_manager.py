@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from server.managers.token_manager import TokenManager
+from server.resources.schema.token import (
+    AccessToken,
+    Header,
+    Token,
+)
+
+
+def _token(jwt_token, user_id='1', exp=None):
+    return Token(
+        claims=AccessToken(
+            id=user_id,
+            brand='brand',
+            email='user@getvisibly.com',
+            exp=exp,
+            scopes=[],
+        ),
+        header=Header(
+            alg='HS256',
+            typ='JWT',
+        ),
+        jwt_token=jwt_token,
+    )
+
+
+@pytest.fixture()
+def token_manager():
+    token_manager = TokenManager()
+    token_manager.invalidate()
+
+    yield token_manager
+
+    token_manager.invalidate()
+
+
+@pytest.mark.managers
+def test_token_manager_returns_cached_token(token_manager):
+    token = _token('a.b.c')
+    token_manager.set('a.b.c', token, {'brand'})
+
+    expected = (token, frozenset({'brand'}))
+    actual = token_manager.get('a.b.c')
+
+    assert expected == actual
+
+
+@pytest.mark.managers
+def test_token_manager_forgets_expired_token(token_manager):
+    token_manager.set('a.b.c', _token('a.b.c', exp=int(time.time()) - 1), {'brand'})
+
+    expected = None
+    actual = token_manager.get('a.b.c')
+
+    assert expected == actual
+
+
+@pytest.mark.managers
+def test_token_manager_forgets_tokens_of_invalidated_user(token_manager):
+    token_manager.set('a.b.c', _token('a.b.c', user_id='1'), {'brand'})
+    token_manager.set('d.e.f', _token('d.e.f', user_id='2'), {'brand'})
+
+    token_manager.invalidate_user('1')
+
+    assert token_manager.get('a.b.c') is None
+    assert token_manager.get('d.e.f') is not None
@@ -0,0 +1,153 @@
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.brand import Brand
+from server.resources.models.aio.user import User
+
+from tests.test_constants import TestConstants
+
+
+async def _user(email, client):
+    await User.create(
+        {
+            'email': email,
+            'name': TestConstants.FULL_NAME,
+        },
+        client,
+    )
+
+    return await User.find_by_email(
+        email,
+        client,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_by_name_finds_brand(async_test_client):
+    brand = await Brand.find_by_name(
+        TestConstants.BRAND_NAME,
+        async_test_client,
+    )
+
+    expected = TestConstants.BRAND_NAME
+    actual = brand.name
+    assert expected == actual
+
+    expected = brand
+    actual = await Brand.find_by_id(
+        brand._id,
+        async_test_client,
+    )
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_by_id_returns_none_for_unknown_brand(async_test_client):
+    brand = await Brand.find_by_id(
+        ObjectId(),
+        async_test_client,
+    )
+
+    assert brand is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_add_user_and_remove_user_update_brand_users(async_test_client):
+    brand = await Brand.find_by_name(
+        TestConstants.BRAND_NAME,
+        async_test_client,
+    )
+    user = await _user(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+
+    brand = await Brand.add_user(
+        brand._id,
+        user._id,
+        async_test_client,
+    )
+
+    expected = [user._id]
+    actual = brand.users
+    assert expected == actual
+
+    expected = { str(brand._id) }
+    actual = await Brand.brand_ids_with_user(
+        user._id,
+        async_test_client,
+    )
+    assert expected == actual
+
+    expected = [brand._id]
+    actual = [brand._id for brand in await Brand.with_user(user._id, async_test_client)]
+    assert expected == actual
+
+    await Brand.remove_user(
+        brand._id,
+        user._id,
+        async_test_client,
+    )
+
+    brand = await Brand.find_by_id_and_user(
+        brand._id,
+        user._id,
+        async_test_client,
+    )
+
+    assert brand is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_by_id_with_user_finds_only_users_of_brand(async_test_client):
+    brand = await Brand.find_by_name(
+        TestConstants.BRAND_NAME,
+        async_test_client,
+    )
+    user = await _user(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+    other_user = await _user(
+        TestConstants.ALTERNATIVE_EMAIL,
+        async_test_client,
+    )
+    await Brand.add_user(
+        brand._id,
+        user._id,
+        async_test_client,
+    )
+
+    found_brand, found_user = await Brand.find_by_id_with_user(
+        brand._id,
+        user._id,
+        async_test_client,
+    )
+
+    expected = (brand._id, user._id,)
+    actual = (found_brand._id, found_user._id,)
+    assert expected == actual
+
+    found_brand, found_user = await Brand.find_by_id_with_user(
+        brand._id,
+        other_user._id,
+        async_test_client,
+    )
+
+    expected = brand._id
+    actual = found_brand._id
+    assert expected == actual
+    assert found_user is None
+
+    expected = (None, None,)
+    actual = await Brand.find_by_id_with_user(
+        ObjectId(),
+        user._id,
+        async_test_client,
+    )
+    assert expected == actual
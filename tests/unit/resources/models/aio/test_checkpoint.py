@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from server.resources.models.aio.checkpoint import Checkpoint
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_update_clears_cursor_and_records_full_syncs(async_test_client):
+    await Checkpoint.update_cursor(
+        '1',
+        'sp/keywords',
+        { 'startIndex': 100 },
+        async_test_client,
+    )
+
+    expected = { 'startIndex': 100 }
+    actual = (await Checkpoint.find('1', 'sp/keywords', async_test_client)).cursor
+    assert expected == actual
+
+    await Checkpoint.update(
+        '1',
+        'sp/keywords',
+        datetime(2021, 9, 1),
+        async_test_client,
+        is_full=True,
+    )
+    await Checkpoint.update(
+        '1',
+        'sp/keywords',
+        datetime(2021, 9, 2),
+        async_test_client,
+    )
+
+    checkpoint = await Checkpoint.find(
+        '1',
+        'sp/keywords',
+        async_test_client,
+    )
+
+    expected = (datetime(2021, 9, 2), datetime(2021, 9, 1), False,)
+    actual = (checkpoint.synced_at, checkpoint.full_synced_at, 'cursor' in checkpoint,)
+    assert expected == actual
+
+    checkpoint = await Checkpoint.find(
+        '2',
+        'sp/keywords',
+        async_test_client,
+    )
+
+    assert checkpoint is None
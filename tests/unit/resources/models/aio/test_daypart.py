@@ -0,0 +1,102 @@
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.daypart import Daypart
+from server.resources.types.data_types import (
+    AdType,
+    PlatformType,
+    RegionType,
+)
+
+
+def _daypart(campaign_id):
+    return {
+        'ad_type': AdType.SP,
+        'advertiser_id': '1',
+        'campaign_id': campaign_id,
+        'platform': PlatformType.AA,
+        'region': RegionType.NA,
+        'schedule': [],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_and_find_all_find_dayparts_of_campaigns(async_test_client):
+    daypart = await Daypart.create(
+        _daypart('1'),
+        async_test_client,
+    )
+    await Daypart.create(
+        _daypart('2'),
+        async_test_client,
+    )
+
+    expected = daypart
+    actual = await Daypart.find(
+        AdType.SP,
+        '1',
+        '1',
+        PlatformType.AA,
+        RegionType.NA,
+        async_test_client,
+    )
+    assert expected == actual
+
+    expected = ['1', '2']
+    actual = sorted(
+        daypart.campaign_id
+        for daypart in await Daypart.find_all(
+            AdType.SP,
+            '1',
+            ['1', '2', '3'],
+            PlatformType.AA,
+            RegionType.NA,
+            async_test_client,
+        )
+    )
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_update_and_delete_daypart(async_test_client):
+    daypart = await Daypart.create(
+        _daypart('1'),
+        async_test_client,
+    )
+
+    await Daypart.update(
+        daypart._id,
+        { '$set': { 'schedule': [[0, 1]] } },
+        async_test_client,
+    )
+
+    expected = [[0, 1]]
+    actual = (await Daypart.find(AdType.SP, '1', '1', PlatformType.AA, RegionType.NA, async_test_client)).schedule
+    assert expected == actual
+
+    await Daypart.delete(
+        daypart._id,
+        async_test_client,
+    )
+
+    daypart = await Daypart.find(
+        AdType.SP,
+        '1',
+        '1',
+        PlatformType.AA,
+        RegionType.NA,
+        async_test_client,
+    )
+
+    assert daypart is None
+
+    daypart = await Daypart.update(
+        ObjectId(),
+        { '$set': { 'schedule': [] } },
+        async_test_client,
+    )
+
+    assert daypart is None
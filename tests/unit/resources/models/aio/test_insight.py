@@ -0,0 +1,150 @@
+from datetime import datetime
+
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.insight import Insight
+from server.resources.models.aio.tag import Tag
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_by_id_replaces_tag_ids_with_tags(async_test_client):
+    brand_id = ObjectId()
+    tag = await Tag.create(
+        { 'brand_id': brand_id, 'name': 'Brand', 'prefix': 'B' },
+        async_test_client,
+    )
+    insight = await Insight.create(
+        { 'brand_id': brand_id, 'date': datetime(2021, 9, 1) },
+        async_test_client,
+    )
+
+    await Insight.add_tags(
+        insight._id,
+        [str(tag._id), str(ObjectId())],
+        async_test_client,
+    )
+
+    insight = await Insight.find_by_id(
+        insight._id,
+        async_test_client,
+    )
+
+    # Tags that no longer exist are left out
+    expected = [{ 'id': str(tag._id), 'name': 'Brand' }]
+    actual = insight.tags
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_with_brand_sorts_insights_by_date(async_test_client):
+    brand_id = ObjectId()
+    tag = await Tag.create(
+        { 'brand_id': brand_id, 'name': 'Brand', 'prefix': 'B' },
+        async_test_client,
+    )
+    dates = [datetime(2021, 9, 1), datetime(2021, 9, 3), datetime(2021, 9, 2)]
+    for date in dates:
+        await Insight.create(
+            { 'brand_id': brand_id, 'date': date, 'tags': [tag._id] },
+            async_test_client,
+        )
+
+    insights = await Insight.with_brand(
+        brand_id,
+        async_test_client,
+    )
+
+    expected = sorted(dates, reverse=True)
+    actual = [insight.date for insight in insights]
+    assert expected == actual
+
+    expected = [[{ 'id': str(tag._id), 'name': 'Brand' }]] * len(dates)
+    actual = [insight.tags for insight in insights]
+    assert expected == actual
+
+    expected = dates[1:]
+    actual = [
+        insight.date
+        for insight in await Insight.find_between_dates(
+            datetime(2021, 9, 2),
+            datetime(2021, 9, 3),
+            brand_id,
+            async_test_client,
+        )
+    ]
+    assert sorted(expected) == sorted(actual)
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_add_report_and_remove_report_update_insights_of_brand(async_test_client):
+    brand_id = ObjectId()
+    report_id = ObjectId()
+    insight = await Insight.create(
+        { 'brand_id': brand_id },
+        async_test_client,
+    )
+    other_insight = await Insight.create(
+        { 'brand_id': ObjectId() },
+        async_test_client,
+    )
+
+    await Insight.add_report(
+        [insight._id, other_insight._id],
+        report_id,
+        brand_id,
+        async_test_client,
+    )
+
+    expected = [report_id]
+    actual = (await Insight.find_one(insight._id, async_test_client)).reports
+    assert expected == actual
+
+    expected = []
+    actual = (await Insight.find_one(other_insight._id, async_test_client)).reports
+    assert expected == actual
+
+    await Insight.remove_report(
+        insight._id,
+        report_id,
+        async_test_client,
+    )
+
+    expected = []
+    actual = (await Insight.find_one(insight._id, async_test_client)).reports
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_update_returns_updated_insight(async_test_client):
+    insight = await Insight.create(
+        { 'brand_id': ObjectId(), 'title': 'Title' },
+        async_test_client,
+    )
+
+    updated_insight = await Insight.update(
+        insight._id,
+        { '$set': { 'title': 'Updated' } },
+        async_test_client,
+    )
+
+    expected = 'Updated'
+    actual = updated_insight.title
+    assert expected == actual
+
+    await Insight.delete(
+        insight._id,
+        async_test_client,
+    )
+
+    insight = await Insight.find(
+        { '_id': insight._id },
+        async_test_client,
+    )
+
+    assert insight is None
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.report import Report
+
+
+# `Report.create` runs in a transaction, which the standalone Mongo test
+# container does not support, so reports are inserted directly
+async def _report(brand_id, start_date, client):
+    result = await client.visibly.reports.insert_one(
+        {
+            'brand_id': brand_id,
+            'insights': [],
+            'start_date': start_date,
+            'tags': [],
+        },
+    )
+
+    return result.inserted_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_add_insights_adds_each_insight_once(async_test_client):
+    report_id = await _report(
+        ObjectId(),
+        datetime(2021, 9, 1),
+        async_test_client,
+    )
+    insight_ids = [str(ObjectId()), str(ObjectId())]
+
+    await Report.add_insights(
+        report_id,
+        insight_ids,
+        async_test_client,
+    )
+    report = await Report.add_insights(
+        report_id,
+        insight_ids,
+        async_test_client,
+    )
+
+    expected = [ObjectId(insight_id) for insight_id in insight_ids]
+    actual = report.insights
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_with_brand_sorts_reports_by_start_date(async_test_client):
+    brand_id = ObjectId()
+    dates = [datetime(2021, 9, 1), datetime(2021, 9, 3), datetime(2021, 9, 2)]
+    for date in dates:
+        await _report(
+            brand_id,
+            date,
+            async_test_client,
+        )
+    await _report(
+        ObjectId(),
+        datetime(2021, 9, 4),
+        async_test_client,
+    )
+
+    expected = sorted(dates, reverse=True)
+    actual = [
+        report.start_date
+        for report in await Report.with_brand(brand_id, async_test_client)
+    ]
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_delete_deletes_report(async_test_client):
+    report_id = await _report(
+        ObjectId(),
+        datetime(2021, 9, 1),
+        async_test_client,
+    )
+
+    expected = report_id
+    actual = (await Report.find_by_id(report_id, async_test_client))._id
+    assert expected == actual
+
+    await Report.delete(
+        report_id,
+        async_test_client,
+    )
+
+    report = await Report.find_by_id(
+        report_id,
+        async_test_client,
+    )
+
+    assert report is None
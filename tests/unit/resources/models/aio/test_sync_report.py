@@ -0,0 +1,26 @@
+from datetime import datetime
+
+import pytest
+
+from server.resources.models.aio.sync_report import SyncReport
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_all_finds_latest_reports_of_command(async_test_client):
+    for day in range(1, 4):
+        await SyncReport.create(
+            { 'command': 'sync', 'started_at': datetime(2021, 9, day) },
+            async_test_client,
+        )
+    await SyncReport.create(
+        { 'command': 'sweep', 'started_at': datetime(2021, 9, 4) },
+        async_test_client,
+    )
+
+    expected = [datetime(2021, 9, 3), datetime(2021, 9, 2)]
+    actual = [
+        report.started_at
+        for report in await SyncReport.find_all('sync', async_test_client, limit=2)
+    ]
+    assert expected == actual
@@ -0,0 +1,122 @@
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.tag import Tag
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_create_creates_tag_with_empty_lists(async_test_client):
+    brand_id = ObjectId()
+
+    tag = await Tag.create(
+        {
+            'brand_id': brand_id,
+            'name': 'Brand',
+            'prefix': None,
+        },
+        async_test_client,
+    )
+
+    expected = ([], [], [],)
+    actual = (tag.campaigns, tag.insights, tag.orders,)
+    assert expected == actual
+
+    expected = tag
+    actual = await Tag.find_by_id(
+        str(tag._id),
+        async_test_client,
+    )
+    assert expected == actual
+
+    await Tag.delete(
+        tag._id,
+        async_test_client,
+    )
+
+    tag = await Tag.find_by_id(
+        tag._id,
+        async_test_client,
+    )
+
+    assert tag is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_update_keeps_fields_that_are_not_updated(async_test_client):
+    tag = await Tag.create(
+        {
+            'brand_id': ObjectId(),
+            'name': 'Brand',
+            'prefix': 'B',
+            'campaigns': ['1'],
+        },
+        async_test_client,
+    )
+
+    tag = await Tag.update(
+        tag,
+        { 'name': 'Category' },
+        async_test_client,
+    )
+
+    expected = ('Category', 'B', ['1'],)
+    actual = (tag.name, tag.prefix, tag.campaigns,)
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_add_insight_updates_tags_of_brand(async_test_client):
+    brand_id = ObjectId()
+    insight_id = ObjectId()
+    tag = await Tag.create(
+        { 'brand_id': brand_id, 'name': 'Brand', 'prefix': 'B' },
+        async_test_client,
+    )
+    other_tag = await Tag.create(
+        { 'brand_id': ObjectId(), 'name': 'Brand', 'prefix': 'B' },
+        async_test_client,
+    )
+
+    await Tag.add_insight(
+        [tag._id, other_tag._id],
+        insight_id,
+        brand_id,
+        async_test_client,
+    )
+
+    expected = [insight_id]
+    actual = (await Tag.find_by_id(tag._id, async_test_client)).insights
+    assert expected == actual
+
+    expected = []
+    actual = (await Tag.find_by_id(other_tag._id, async_test_client)).insights
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_with_brand_groups_finds_prefixed_tags(async_test_client):
+    brand_id = ObjectId()
+    tag = await Tag.create(
+        { 'brand_id': brand_id, 'name': 'Brand', 'prefix': 'B' },
+        async_test_client,
+    )
+    await Tag.create(
+        { 'brand_id': brand_id, 'name': 'Other', 'prefix': None },
+        async_test_client,
+    )
+
+    expected = 2
+    actual = len(await Tag.with_brand(brand_id, async_test_client))
+    assert expected == actual
+
+    expected = [{ '_id': tag._id, 'name': 'Brand', 'prefix': 'B' }]
+    actual = await Tag.with_brand_groups(
+        brand_id,
+        async_test_client,
+    )
+    assert expected == actual
@@ -0,0 +1,112 @@
+from bson.objectid import ObjectId
+
+import pytest
+
+from server.resources.models.aio.user import User
+from server.resources.types.data_types import UserStatusType
+
+from tests.test_constants import TestConstants
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_create_creates_pending_user(async_test_client):
+    await User.create(
+        {
+            'email': TestConstants.EMAIL,
+            'name': TestConstants.FULL_NAME,
+        },
+        async_test_client,
+    )
+
+    user = await User.find_by_email(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+
+    expected = (UserStatusType.PENDING, [], None,)
+    actual = (user.status, user.brands, user.refresh_token,)
+    assert expected == actual
+
+    expected = user
+    actual = await User.find_by_id(
+        user._id,
+        async_test_client,
+    )
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_find_by_email_ignores_disabled_users(async_test_client):
+    await User.create(
+        {
+            'email': TestConstants.EMAIL,
+            'name': TestConstants.FULL_NAME,
+        },
+        async_test_client,
+    )
+    user = await User.find_by_email(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+
+    user = await User.update(
+        user._id,
+        { '$set': { 'status': UserStatusType.DISABLED } },
+        async_test_client,
+    )
+
+    expected = UserStatusType.DISABLED
+    actual = user.status
+    assert expected == actual
+
+    user = await User.find_by_email(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+
+    assert user is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.models
+async def test_add_brand_and_remove_brands_update_user_brands(async_test_client):
+    await User.create(
+        {
+            'email': TestConstants.EMAIL,
+            'name': TestConstants.FULL_NAME,
+        },
+        async_test_client,
+    )
+    user = await User.find_by_email(
+        TestConstants.EMAIL,
+        async_test_client,
+    )
+    brand_ids = [ObjectId(), ObjectId()]
+
+    for brand_id in brand_ids:
+        user = await User.add_brand(
+            user._id,
+            brand_id,
+            async_test_client,
+        )
+
+    expected = brand_ids
+    actual = user.brands
+    assert expected == actual
+
+    await User.remove_brands(
+        user._id,
+        brand_ids[:1],
+        async_test_client,
+    )
+
+    user = await User.find_by_id(
+        user._id,
+        async_test_client,
+    )
+
+    expected = brand_ids[1:]
+    actual = user.brands
+    assert expected == actual
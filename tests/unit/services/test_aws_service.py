@@ -0,0 +1,295 @@
+import time
+
+import pytest
+
+from server.core.constants import Constants
+from server.services.aws_service import AWSService
+
+
+class _Tasks:
+
+    def __init__(self, responses):
+        self.cancelled = []
+        self._responses = list(responses)
+
+    def cancel(self, task_id):
+        self.cancelled.append(task_id)
+
+        return {}
+
+    def get(self, task_id):
+        return self._responses.pop(0)
+
+    def list(self, actions, detailed):
+        return {
+            'nodes': {
+                'node': {
+                    'tasks': {
+                        'node:1': { 'action': 'indices:data/write/reindex' },
+                        'node:2': { 'action': 'indices:data/write/reindex', 'parent_task_id': 'node:1' },
+                    },
+                },
+            },
+        }
+
+
+class _Client:
+
+    def __init__(self, responses=()):
+        self.requests = []
+        self.tasks = _Tasks(responses)
+
+    def delete_by_query(self, **kwargs):
+        self.requests.append(kwargs)
+
+        return { 'task': 'node:1' }
+
+    def reindex(self, **kwargs):
+        self.requests.append(kwargs)
+
+        return { 'task': 'node:2' }
+
+
+def _es_service(mocker, client):
+    mocker.patch.object(AWSService, 'log_service', new_callable=mocker.PropertyMock)
+    mocker.patch.object(AWSService, 'ssm_service', new_callable=mocker.PropertyMock)
+
+    es_service = AWSService.ESService(
+        region='us-west-2',
+        session=None,
+    )
+    es_service._es_service = client
+
+    return es_service
+
+
+@pytest.mark.aws
+def test_tasks_start_sliced_and_in_background(mocker):
+    client = _Client()
+    es_service = _es_service(mocker, client)
+
+    expected = ['node:1', 'node:2']
+    actual = [
+        es_service.delete_by_query({ 'query': { 'match_all': {} } }, 'sa_1', requests_per_second=100),
+        es_service.reindex({ 'source': { 'index': 'sa_1' } }, requests_per_second=100),
+    ]
+    assert expected == actual
+
+    expected = [
+        {
+            'body': { 'query': { 'match_all': {} } },
+            'conflicts': 'proceed',
+            'index': 'sa_1',
+            'requests_per_second': 100,
+            'slices': 'auto',
+            'wait_for_completion': False,
+        },
+        {
+            'body': { 'source': { 'index': 'sa_1' } },
+            'requests_per_second': 100,
+            'slices': 'auto',
+            'wait_for_completion': False,
+        },
+    ]
+    actual = client.requests
+    assert expected == actual
+
+
+@pytest.mark.aws
+def test_wait_for_task_polls_until_completed(mocker):
+    sleep = mocker.patch('server.services.aws_service.time.sleep')
+
+    completed = { 'completed': True, 'response': { 'created': 2, 'total': 2 } }
+    es_service = _es_service(
+        mocker,
+        _Client([
+            { 'completed': False, 'task': { 'status': { 'created': 0, 'total': 2 } } },
+            { 'completed': False, 'task': { 'status': { 'created': 1, 'total': 2 } } },
+            completed,
+        ]),
+    )
+
+    expected = completed
+    actual = es_service.wait_for_task('node:1', interval=5)
+    assert expected == actual
+
+    expected = [mocker.call(5), mocker.call(5)]
+    actual = sleep.call_args_list
+    assert expected == actual
+
+
+@pytest.mark.aws
+def test_tasks_lists_parent_tasks_and_cancel_task_cancels(mocker):
+    client = _Client()
+    es_service = _es_service(mocker, client)
+
+    # Slices are left out
+    expected = ['node:1']
+    actual = list(es_service.tasks())
+    assert expected == actual
+
+    es_service.cancel_task('node:1')
+
+    expected = ['node:1']
+    actual = client.tasks.cancelled
+    assert expected == actual
+
+
+@pytest.mark.aws
+def test_reset_discards_shared_clients(mocker):
+    ssm_service = AWSService.SSMService(
+        prefix='test',
+        region='us-west-2',
+    )
+    ssm_service._parameters = { 'test-ssm-visibly-server-api-prefix-parameter': '/api' }
+    ssm_service._refreshing = True
+    ssm_service._ssm = object()
+    lock = ssm_service._lock
+
+    mocker.patch.object(AWSService, '_AWSService__docdb_service', None)
+    mocker.patch.object(AWSService, '_AWSService__log_service', None)
+    mocker.patch.object(AWSService, '_AWSService__shared_ssm_service', None)
+    mocker.patch.object(AWSService, '_AWSService__ssm_service', ssm_service)
+
+    AWSService.reset()
+
+    # Loaded parameters are kept
+    expected = (None, False, { 'test-ssm-visibly-server-api-prefix-parameter': '/api' },)
+    actual = (ssm_service._ssm, ssm_service._refreshing, ssm_service._parameters,)
+    assert expected == actual
+
+    assert ssm_service._lock is not lock
+
+
+class _Paginator:
+
+    def __init__(self, names):
+        self._names = names
+
+    def paginate(self, ParameterFilters):
+        # One page per name, as describe_parameters pages are small
+        for name in self._names:
+            yield { 'Parameters': [{ 'Name': name }] }
+
+
+class _SSM:
+
+    def __init__(self, values):
+        self.requests = []
+        self.values = values
+
+    def get_paginator(self, operation):
+        self.requests.append(operation)
+
+        return _Paginator([name for name in self.values if name.startswith('test-ssm-visibly-server-')])
+
+    def get_parameter(self, Name, WithDecryption):
+        self.requests.append(('get_parameter', Name, WithDecryption,))
+
+        value = self.values[Name] if WithDecryption else f'encrypted-{self.values[Name]}'
+
+        return { 'Parameter': { 'Name': Name, 'Value': value } }
+
+    def get_parameters(self, Names, WithDecryption):
+        self.requests.append(('get_parameters', len(Names), WithDecryption,))
+
+        return {
+            'Parameters': [{ 'Name': name, 'Value': self.values[name] } for name in Names],
+        }
+
+
+def _ssm_service(values):
+    ssm_service = AWSService.SSMService(
+        prefix='test',
+        region='us-west-2',
+    )
+    ssm_service._ssm = _SSM(values)
+
+    return ssm_service
+
+
+@pytest.mark.aws
+def test_ssm_service_loads_every_parameter_in_one_pass():
+    values = {
+        f'test-ssm-visibly-server-{index}-parameter': str(index)
+        for index in range(12)
+    }
+    ssm_service = _ssm_service(values)
+
+    ssm_service.load()
+
+    expected = ['0', '11']
+    actual = [
+        ssm_service.get('test-ssm-visibly-server-0-parameter'),
+        ssm_service.get('test-ssm-visibly-server-11-parameter'),
+    ]
+    assert expected == actual
+
+    # Names are requested in batches of `Constants.SSM_GET_PARAMETERS_MAX_NAMES`
+    expected = [
+        'describe_parameters',
+        ('get_parameters', 10, True,),
+        ('get_parameters', 2, True,),
+    ]
+    actual = ssm_service.ssm.requests
+    assert expected == actual
+
+
+@pytest.mark.aws
+def test_ssm_service_reloads_stale_parameters_in_background(mocker):
+    values = { 'test-ssm-visibly-server-api-prefix-parameter': '/api' }
+    ssm_service = _ssm_service(values)
+
+    ssm_service.load()
+
+    values['test-ssm-visibly-server-api-prefix-parameter'] = '/api/v2'
+
+    # Fresh parameters are not loaded again
+    expected = '/api'
+    actual = ssm_service.get('test-ssm-visibly-server-api-prefix-parameter')
+    assert expected == actual
+
+    thread = mocker.patch('server.services.aws_service.threading.Thread')
+    mocker.patch(
+        'server.services.aws_service.time.monotonic',
+        return_value=time.monotonic() + Constants.SSM_PARAMETERS_TTL,
+    )
+
+    # Stale parameters are returned while they are loaded again
+    expected = '/api'
+    actual = ssm_service.get('test-ssm-visibly-server-api-prefix-parameter')
+    assert expected == actual
+
+    thread.call_args.kwargs['target']()
+
+    expected = '/api/v2'
+    actual = ssm_service.get('test-ssm-visibly-server-api-prefix-parameter')
+    assert expected == actual
+
+
+@pytest.mark.aws
+def test_ssm_service_requests_parameters_outside_of_prefix():
+    values = {
+        'test-ssm-visibly-server-api-prefix-parameter': '/api',
+        'shared-parameter': 'shared',
+    }
+    ssm_service = _ssm_service(values)
+
+    expected = ['shared', 'shared', 'encrypted-/api']
+    actual = [
+        ssm_service.get('shared-parameter'),
+        ssm_service.get('shared-parameter'),
+        ssm_service.get('test-ssm-visibly-server-api-prefix-parameter', with_decryption=False),
+    ]
+    assert expected == actual
+
+    # Parameters outside of the prefix are cached, but parameters requested
+    # without decryption are not
+    expected = [
+        'describe_parameters',
+        ('get_parameters', 1, True,),
+        ('get_parameter', 'shared-parameter', True,),
+        ('get_parameter', 'test-ssm-visibly-server-api-prefix-parameter', False,),
+    ]
+    actual = ssm_service.ssm.requests
+    assert expected == actual
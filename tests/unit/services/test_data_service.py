@@ -0,0 +1,197 @@
+import pytest
+
+from elasticsearch_dsl.utils import AttrDict
+
+from server.resources.schema.amazon_api import (
+    IndexSearchTermsRankingSchema,
+    IndexSearchTermsSchema,
+)
+from server.services.data_service import DataService
+
+
+def _search_term(search_term, rank):
+    source = {
+        'search_frequency_rank': rank,
+        'search_term': search_term,
+    }
+    for position in ['first', 'second', 'third']:
+        source.update({
+            f'{position}_clicked_asin': 'B000000000',
+            f'{position}_product_title': 'Product',
+            f'{position}_click_share': 0.1,
+            f'{position}_conversion_share': 0.1,
+        })
+
+    return source
+
+
+def _search_terms_response(buckets):
+    return AttrDict({
+        'aggregations': {
+            'search_terms': {
+                'buckets': buckets,
+            },
+        },
+    })
+
+
+@pytest.mark.service
+def test_search_terms_rank_ranks_every_search_term_per_week(mocker):
+    mocker.patch(
+        'server.services.data_service.search_terms_time_series',
+        return_value=_search_terms_response([
+            {
+                'key': 'camera',
+                'ranking_over_time': {
+                    'buckets': [
+                        { 'key': 1625486400000, 'rank': { 'value': 12.0 } },
+                        { 'key': 1626091200000, 'rank': { 'value': None } },
+                    ],
+                },
+            },
+            {
+                'key': 'printer',
+                'ranking_over_time': {
+                    'buckets': [
+                        { 'key': 1626091200000, 'rank': { 'value': 3.0 } },
+                    ],
+                },
+            },
+        ]),
+    )
+
+    data = IndexSearchTermsRankingSchema(
+        search_terms=['camera', 'printer', 'toner'],
+        start_date='2021-07-05',
+        end_date='2021-07-18',
+    )
+
+    data_service = DataService(None)
+    response = data_service.search_terms_rank(data)
+
+    expected = [
+        {
+            'end_date': '2021-07-12',
+            'search_terms': [
+                { 'search_term': 'camera', 'rank': 12 },
+                { 'search_term': 'printer', 'rank': -1 },
+                { 'search_term': 'toner', 'rank': -1 },
+            ],
+            'start_date': '2021-07-05',
+        },
+        {
+            'end_date': '2021-07-19',
+            'search_terms': [
+                { 'search_term': 'camera', 'rank': -1 },
+                { 'search_term': 'printer', 'rank': 3 },
+                { 'search_term': 'toner', 'rank': -1 },
+            ],
+            'start_date': '2021-07-12',
+        },
+    ]
+    actual = response
+
+    assert expected == actual
+
+
+@pytest.mark.service
+def test_search_terms_rank_skips_query_without_search_terms(mocker):
+    time_series = mocker.patch(
+        'server.services.data_service.search_terms_time_series',
+    )
+
+    data = IndexSearchTermsRankingSchema(
+        search_terms=[],
+        start_date='2021-07-05',
+        end_date='2021-07-18',
+    )
+
+    data_service = DataService(None)
+
+    expected = []
+    actual = data_service.search_terms_rank(data)
+
+    assert expected == actual
+
+    time_series.assert_not_called()
+
+
+@pytest.mark.service
+def test_search_terms_stream_pages_with_scroll(mocker):
+    class _Client:
+
+        def __init__(self, pages):
+            self.cleared = []
+            self.scrolls = []
+            self.searches = []
+            self._pages = pages
+
+        def clear_scroll(self, scroll_id):
+            self.cleared.append(scroll_id)
+
+        def scroll(self, scroll_id, scroll):
+            self.scrolls.append(scroll_id)
+
+            return self._pages.pop(0)
+
+        def search(self, index=None, body=None, **params):
+            self.searches.append((index, body, params,))
+
+            return self._pages.pop(0)
+
+    # Two documents of the same search term share a rank, which the scroll
+    # pages through without skipping or repeating either
+    client = _Client([
+        {
+            '_scroll_id': 'scroll-1',
+            'hits': {
+                'hits': [
+                    { '_source': _search_term('camera', 1) },
+                    { '_source': _search_term('camera', 1) },
+                ],
+            },
+        },
+        {
+            '_scroll_id': 'scroll-2',
+            'hits': {
+                'hits': [
+                    { '_source': _search_term('printer', 2) },
+                ],
+            },
+        },
+    ])
+
+    data = IndexSearchTermsSchema(
+        asins=[],
+        exclude=[],
+        product_titles=[],
+        report_range='07-2021',
+        search_terms=['camera'],
+    )
+
+    data_service = DataService(client)
+    search_terms = list(data_service.search_terms_stream(data, page_size=2))
+
+    expected = ['camera', 'camera', 'printer']
+    actual = [search_term.search_term for search_term in search_terms]
+
+    assert expected == actual
+
+    index, body, params = client.searches[0]
+
+    expected = (
+        ['search_terms'],
+        [
+            {'search_frequency_rank': 'asc'},
+            {'search_term_search.keyword': 'asc'},
+        ],
+        '2m',
+    )
+    actual = (index, body['sort'], params['scroll'],)
+
+    assert expected == actual
+
+    expected = (['scroll-1'], ['scroll-2'],)
+    actual = (client.scrolls, client.cleared,)
+
+    assert expected == actual
@@ -0,0 +1,222 @@
+import json
+
+import pytest
+
+from elasticsearch.exceptions import (
+    ConnectionError as ElasticsearchConnectionError,
+    ConnectionTimeout,
+    TransportError,
+)
+from elasticsearch.serializer import JSONSerializer
+
+from server.services.ingestion_service import IngestionService
+
+
+class _Transport:
+
+    serializer = JSONSerializer()
+
+
+class _Client:
+
+    def __init__(self, statuses):
+        self.bodies = []
+        self.transport = _Transport()
+
+        self._statuses = statuses
+
+    def bulk(self, body):
+        self.bodies.append(body)
+        statuses = self._statuses.pop(0)
+        if isinstance(statuses, Exception):
+            raise statuses
+
+        return {
+            'items': [
+                { 'index': { 'status': status, 'error': None if status < 300 else 'rejected' } }
+                for status in statuses
+            ],
+        }
+
+
+def _actions(count, has_id=True):
+    actions = [
+        { '_index': 'test', '_id': str(i), '_source': { 'value': i } }
+        for i in range(count)
+    ]
+
+    if not has_id:
+        for action in actions:
+            action.pop('_id')
+
+    return actions
+
+
+@pytest.mark.service
+def test_ingest_splits_actions_into_chunks_by_documents():
+    client = _Client([[201, 201], [201, 201], [201]])
+
+    ingestion_service = IngestionService(
+        client,
+        chunk_size=2,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(5))
+
+    expected = 3
+    actual = len(client.bodies)
+
+    assert expected == actual
+    assert 5 == metrics.documents
+
+
+@pytest.mark.service
+def test_ingest_splits_actions_into_chunks_by_bytes():
+    client = _Client([[201]] * 5)
+
+    ingestion_service = IngestionService(
+        client,
+        max_chunk_bytes=1,
+        thread_count=1,
+    )
+    ingestion_service.ingest(_actions(5))
+
+    expected = 5
+    actual = len(client.bodies)
+
+    assert expected == actual
+
+
+@pytest.mark.service
+def test_ingest_retries_rejected_documents(mocker):
+    mocker.patch('server.services.ingestion_service.time.sleep')
+    client = _Client([[201, 429], [201]])
+
+    ingestion_service = IngestionService(
+        client,
+        initial_backoff=0,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(2))
+
+    expected = '"_id":"1"'
+    actual = client.bodies[1]
+
+    assert expected in actual
+    assert 2 == metrics.documents
+    assert 1 == metrics.retries
+
+
+@pytest.mark.service
+def test_ingest_writes_failed_documents_to_dead_letter_file(tmp_path):
+    client = _Client([[201, 400]])
+    dead_letter_path = tmp_path / 'dead_letter.ndjson'
+
+    ingestion_service = IngestionService(
+        client,
+        dead_letter_path=dead_letter_path,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(2))
+
+    lines = dead_letter_path.read_text().splitlines()
+
+    expected = '1'
+    actual = json.loads(lines[0])['action']['_id']
+
+    assert expected == actual
+    assert 1 == len(lines)
+    assert 1 == metrics.failed
+
+
+@pytest.mark.service
+def test_ingest_retries_unavailable_and_unreachable_cluster(mocker):
+    mocker.patch('server.services.ingestion_service.time.sleep')
+    client = _Client([
+        ConnectionTimeout('TIMEOUT', 'Read timed out', None),
+        TransportError(503, 'unavailable'),
+        TransportError(502, 'bad gateway'),
+        [201],
+    ])
+
+    ingestion_service = IngestionService(
+        client,
+        initial_backoff=0,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(1))
+
+    expected = 4
+    actual = len(client.bodies)
+
+    assert expected == actual
+    assert 1 == metrics.documents
+    assert 3 == metrics.retries
+
+
+@pytest.mark.service
+def test_ingest_does_not_retry_invalid_requests(tmp_path):
+    client = _Client([TransportError(400, 'illegal_argument_exception')])
+    dead_letter_path = tmp_path / 'dead_letter.ndjson'
+
+    ingestion_service = IngestionService(
+        client,
+        dead_letter_path=dead_letter_path,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(1))
+
+    expected = 1
+    actual = len(client.bodies)
+
+    assert expected == actual
+    assert 1 == metrics.failed
+    assert 1 == len(dead_letter_path.read_text().splitlines())
+
+
+@pytest.mark.service
+def test_ingest_does_not_retry_timeouts_of_documents_without_ids(mocker, tmp_path):
+    mocker.patch('server.services.ingestion_service.time.sleep')
+    client = _Client([
+        ConnectionTimeout('TIMEOUT', 'Read timed out', None),
+    ])
+    dead_letter_path = tmp_path / 'dead_letter.ndjson'
+
+    ingestion_service = IngestionService(
+        client,
+        dead_letter_path=dead_letter_path,
+        initial_backoff=0,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(2, has_id=False))
+
+    # The timed-out request may have been indexed, so a retry could index
+    # its documents twice
+    expected = 1
+    actual = len(client.bodies)
+
+    assert expected == actual
+    assert 2 == metrics.failed
+
+
+@pytest.mark.service
+def test_ingest_retries_refused_and_rejected_documents_without_ids(mocker):
+    mocker.patch('server.services.ingestion_service.time.sleep')
+    client = _Client([
+        ElasticsearchConnectionError('N/A', 'Connection refused', ConnectionRefusedError(111, 'Connection refused')),
+        TransportError(429, 'es_rejected_execution_exception'),
+        [201, 201],
+    ])
+
+    ingestion_service = IngestionService(
+        client,
+        initial_backoff=0,
+        thread_count=1,
+    )
+    metrics = ingestion_service.ingest(_actions(2, has_id=False))
+
+    expected = 3
+    actual = len(client.bodies)
+
+    assert expected == actual
+    assert 2 == metrics.documents
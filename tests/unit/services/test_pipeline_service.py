@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from server.services.pipeline_service import PipelineService
+
+
+class _Result:
+
+    def __init__(self, operations):
+        self.modified_count = 0
+        self.upserted_count = len(operations)
+
+
+class _Collection:
+
+    def __init__(self, name):
+        self.full_name = name
+        self.writes = []
+
+    async def bulk_write(self, operations, ordered=True):
+        await asyncio.sleep(0.01)
+        self.writes.append(list(operations))
+        return _Result(operations)
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_pipeline_service_batches_queued_pages():
+    collection = _Collection('amazon.1')
+
+    async with PipelineService(writers=1, maxsize=10, batch_size=100) as pipeline:
+        assert PipelineService.current() is pipeline
+
+        for page in range(5):
+            await pipeline.put(collection, [page])
+
+        await pipeline.wait()
+
+        assert pipeline.written(5)
+
+    assert PipelineService.current() is None
+
+    expected = [0, 1, 2, 3, 4]
+    actual = [operation for write in collection.writes for operation in write]
+
+    assert expected == actual
+    assert len(collection.writes) < 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_pipeline_service_reports_unwritten_pages():
+    class _FailingCollection(_Collection):
+
+        async def bulk_write(self, operations, ordered=True):
+            raise ValueError('DocumentDB is unavailable')
+
+    collection = _FailingCollection('amazon.1')
+
+    async with PipelineService(writers=1, maxsize=10) as pipeline:
+        seq = await pipeline.put(collection, [0])
+
+        with pytest.raises(RuntimeError):
+            await pipeline.wait(seq)
+
+        assert not pipeline.written(seq)
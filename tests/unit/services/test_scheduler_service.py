@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from server.resources.types.data_types import TaskStateType
+from server.services.scheduler_service import SchedulerService
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_scheduler_service_runs_dependents_after_dependencies():
+    scheduler = SchedulerService(concurrency=4, profile_concurrency=4)
+    events = []
+
+    async def task(name):
+        events.append(f'{name} started')
+        await asyncio.sleep(0.01)
+        events.append(f'{name} finished')
+
+    orders = scheduler.add('orders', task, 'orders', profile='1')
+    scheduler.add('line_items', task, 'line_items', profile='1', dependencies=[orders])
+    scheduler.add('creatives', task, 'creatives', profile='1')
+
+    tasks = await scheduler.run()
+
+    assert events.index('orders finished') < events.index('line_items started')
+    assert events.index('creatives started') < events.index('orders finished')
+    assert all(task.state == TaskStateType.SUCCEEDED for task in tasks.values())
+    assert all(task.duration is not None for task in tasks.values())
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_scheduler_service_bounds_concurrency_per_profile():
+    scheduler = SchedulerService(concurrency=4, profile_concurrency=1)
+    running = {'1': 0, '2': 0}
+    peaks = {'1': 0, '2': 0}
+
+    async def task(profile):
+        running[profile] += 1
+        peaks[profile] = max(peaks[profile], running[profile])
+        await asyncio.sleep(0.01)
+        running[profile] -= 1
+
+    for i in range(3):
+        scheduler.add(f'1/{i}', task, '1', profile='1')
+        scheduler.add(f'2/{i}', task, '2', profile='2')
+
+    await scheduler.run()
+
+    expected = {'1': 1, '2': 1}
+    actual = peaks
+
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_scheduler_service_skips_dependents_of_failed_tasks():
+    scheduler = SchedulerService(concurrency=2, profile_concurrency=2)
+
+    async def fail():
+        raise ValueError('429')
+
+    async def succeed():
+        pass
+
+    orders = scheduler.add('orders', fail, profile='1')
+    scheduler.add('line_items', succeed, profile='1', dependencies=[orders])
+    scheduler.add('creatives', succeed, profile='1')
+
+    tasks = await scheduler.run()
+
+    expected = {
+        'creatives': TaskStateType.SUCCEEDED,
+        'line_items': TaskStateType.SKIPPED,
+        'orders': TaskStateType.FAILED,
+    }
+    actual = {name: task.state for name, task in tasks.items()}
+
+    assert expected == actual
@@ -0,0 +1,55 @@
+import pytest
+
+from server.services.sync_report_service import SyncReportService
+
+
+class _Result:
+
+    def __init__(self, matched_count, upserted_count):
+        self.matched_count = matched_count
+        self.upserted_count = upserted_count
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_sync_report_service_records_entity_type_metrics():
+    report = SyncReportService('dsp', {})
+    await report.__aenter__()
+
+    SyncReportService.start('1', 'dsp/orders')
+    for seconds in [0.1, 0.2, 0.3, 0.4, 1.0]:
+        SyncReportService.fetched(seconds, 10)
+    SyncReportService.count('throttled')
+    SyncReportService.count('backoff_seconds', 2.5)
+    # 2 inserted, 3 updated and 45 unchanged of 50 items
+    SyncReportService.wrote(_Result(51, 2), 50, SyncReportService.key())
+
+    entry = report.to_dict()['entries'][0]
+
+    expected = {
+        'advertiser_id': '1',
+        'entity_type': 'dsp/orders',
+        'api_calls': 5,
+        'items': 50,
+        'inserted': 2,
+        'updated': 3,
+        'unchanged': 45,
+        'throttled': 1,
+        'backoff_seconds': 2.5,
+        'swept': 0,
+        'p50_page_seconds': 0.3,
+        'p95_page_seconds': 1.0,
+    }
+    actual = entry
+    assert expected == actual
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+async def test_sync_report_service_ignores_metrics_outside_a_report():
+    SyncReportService.start('1', 'dsp/orders')
+    SyncReportService.fetched(0.1, 10)
+
+    expected = None
+    actual = SyncReportService.current()
+    assert expected == actual
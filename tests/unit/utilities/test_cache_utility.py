@@ -97,3 +97,51 @@ def test_stringify_ids_stringifies_ids_in_list():
                 assert expected == actual
 
                 assert isinstance(actual_item[key], str)
+
+
+@pytest.mark.utility
+def test_content_hash_ignores_cache_fields_and_key_order():
+    cache_utility = CacheUtility()
+
+    item = {
+        'campaignId': '1',
+        'name': 'Campaign',
+        'state': 'enabled',
+    }
+    cached_item = {
+        '_hash': '0',
+        '_path': '/api/v1/amazon/aa/sp/campaigns',
+        'state': 'enabled',
+        'name': 'Campaign',
+        'campaignId': '1',
+    }
+
+    expected = cache_utility.content_hash(item)
+    actual = cache_utility.content_hash(cached_item)
+
+    assert expected == actual
+
+    item['state'] = 'paused'
+
+    assert expected != cache_utility.content_hash(item)
+
+
+@pytest.mark.utility
+def test_operations_stamp_sync_generation():
+    cache_utility = CacheUtility()
+
+    query = { '$and': [ { 'campaignId': '1' }, { '_path': '/api/v1/amazon/aa/sp/campaigns' } ] }
+    item = { 'campaignId': '1', '_path': '/api/v1/amazon/aa/sp/campaigns' }
+
+    replace, update = cache_utility.operations([(query, item)], generation=1)
+
+    expected = 1
+    actual = replace._doc['_sync_generation']
+
+    assert expected == actual
+
+    expected = { '_sync_generation': 1 }
+    actual = update._doc['$set']
+
+    assert expected == actual
+    assert '_sync_generation' not in update._doc['$setOnInsert']
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from server.utilities.export_utility import ExportUtility
+
+
+@pytest.mark.utility
+def test_to_csv_yields_header_then_one_line_per_row():
+    export_utility = ExportUtility()
+
+    rows = iter([
+        { 'search_term': 'camera', 'search_frequency_rank': 1, 'ignored': True },
+        { 'search_term': 'printer, laser', 'search_frequency_rank': 2 },
+    ])
+
+    lines = list(
+        export_utility.to_csv(
+            rows,
+            ['search_term', 'search_frequency_rank'],
+        )
+    )
+
+    expected = [
+        'search_term,search_frequency_rank\r\n',
+        'camera,1\r\n',
+        '"printer, laser",2\r\n',
+    ]
+    actual = lines
+
+    assert expected == actual
+
+
+@pytest.mark.utility
+def test_to_ndjson_yields_one_json_document_per_line():
+    export_utility = ExportUtility()
+
+    rows = [
+        { 'search_term': 'camera', 'search_frequency_rank': 1 },
+        { 'search_term': 'printer', 'search_frequency_rank': 2 },
+    ]
+
+    lines = list(export_utility.to_ndjson(iter(rows)))
+
+    expected = 2
+    actual = len(lines)
+
+    assert expected == actual
+
+    for line, row in zip(lines, rows):
+        assert line.endswith('\n')
+
+        expected = row
+        actual = json.loads(line)
+
+        assert expected == actual
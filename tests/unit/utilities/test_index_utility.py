@@ -0,0 +1,64 @@
+from datetime import (
+    date,
+    datetime,
+)
+
+import pytest
+
+from server.utilities.index_utility import IndexUtility
+
+
+@pytest.mark.utility
+def test_monthly_index_names_month_of_report_date():
+    index_utility = IndexUtility()
+
+    expected = 'sa_1110250468092771-2021.07'
+    actual = index_utility.monthly_index(
+        'sa_1110250468092771',
+        date(2021, 7, 31),
+    )
+
+    assert expected == actual
+
+
+@pytest.mark.utility
+def test_monthly_indices_names_single_month_for_short_range():
+    index_utility = IndexUtility()
+
+    expected = ['sa_1-2021.07']
+    actual = index_utility.monthly_indices(
+        'sa_1',
+        '2021-07-12',
+        '2021-07-18',
+    )
+
+    assert expected == actual
+
+
+@pytest.mark.utility
+def test_monthly_indices_names_every_month_across_years():
+    index_utility = IndexUtility()
+
+    expected = ['dsp_1-2020.11', 'dsp_1-2020.12', 'dsp_1-2021.01', 'dsp_1-2021.02']
+    actual = index_utility.monthly_indices(
+        'dsp_1',
+        datetime(2020, 11, 30),
+        '20210201',
+    )
+
+    assert expected == actual
+
+
+@pytest.mark.utility
+def test_to_date_supports_server_date_formats():
+    index_utility = IndexUtility()
+
+    expected = date(2021, 7, 1)
+
+    for value in [date(2021, 7, 1), datetime(2021, 7, 1, 12), '2021-07-01', '20210701']:
+        actual = index_utility.to_date(value)
+
+        assert expected == actual
+
+    assert index_utility.to_date(None) is None
+    assert index_utility.to_date('July') is None
@@ -0,0 +1,25 @@
+import pytest
+
+from server.utilities.retry_utility import backoff
+
+
+@pytest.mark.utility
+def test_backoff_doubles_bound_up_to_max_backoff(mocker):
+    uniform = mocker.patch(
+        'server.utilities.retry_utility.random.uniform',
+        side_effect=lambda low, high: high,
+    )
+
+    expected = [1, 2, 4, 8, 10, 10]
+    actual = [backoff(attempt, 1, 10) for attempt in range(6)]
+
+    assert expected == actual
+
+    uniform.assert_called_with(0, 10)
+
+
+@pytest.mark.utility
+def test_backoff_is_within_bound():
+    delays = [backoff(3, 2, 60) for _ in range(100)]
+
+    assert all(0 <= delay <= 16 for delay in delays)